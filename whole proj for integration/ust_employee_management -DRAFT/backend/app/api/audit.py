@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.role_guard import require_role
+from app.core.constants import Role
+from app.services.audit_service import (
+    query_audit_logs,
+    summarize_audit_logs,
+)
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+router = APIRouter(
+    prefix="/audit",
+    tags=["Audit"],
+    responses={
+        400: {"description": "Bad Request - Invalid cursor or grouping"},
+        401: {"description": "Unauthorized - Invalid or missing token"},
+        403: {"description": "Forbidden - Insufficient permissions"},
+        422: {"description": "Validation Error - Invalid input data"},
+        500: {"description": "Internal Server Error - Something went wrong"}
+    }
+)
+
+
+def audit_filters(
+    performed_by: Optional[int] = Query(None, description="Employee ID who performed the action"),
+    entity_type: Optional[str] = Query(None, description="e.g. TASK, USER, EMPLOYEE, FILE"),
+    entity_id: Optional[int] = Query(None),
+    action: Optional[str] = Query(None, description="e.g. CREATE_TASK"),
+    start: Optional[datetime] = Query(None, description="Inclusive lower bound (UTC)"),
+    end: Optional[datetime] = Query(None, description="Exclusive upper bound (UTC)")
+) -> dict:
+    return {
+        "performed_by": performed_by,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "action": action,
+        "start": start,
+        "end": end
+    }
+
+
+@router.get(
+    "",
+    summary="Query Audit Log",
+    description="""
+    Search the audit trail, newest events first.
+
+    **Filters (all optional):** `performed_by`, `entity_type`, `entity_id`, `action`,
+    `start`, `end`.
+
+    **Pagination:** Pass `next_cursor` from the previous page as `cursor`.
+
+    **Archive:** Set `include_archive=true` to continue into events that the
+    rollover job has moved out of MongoDB into compressed segment files.
+
+    **Permissions:** Only Admins can read the audit log.
+
+    **Response:** `items` (action, entity, performer, timestamp) and `next_cursor`.
+    """
+)
+def get_audit_logs(
+    filters: dict = Depends(audit_filters),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    include_archive: bool = Query(False),
+    user: dict = Depends(require_role([Role.ADMIN]))
+):
+    return query_audit_logs(filters, cursor, limit, include_archive)
+
+
+@router.get(
+    "/summary",
+    summary="Summarize Audit Log",
+    description="""
+    Count live audit events matching the same filters as `GET /api/audit`, grouped
+    on the server. Archived segments are not included.
+
+    **Query Parameters:**
+    - `group_by`: `action`, `performed_by`, `entity_type`, `hour` or `day`
+    - `limit`: Maximum number of groups
+
+    **Permissions:** Only Admins can read the audit log.
+
+    **Response:** Array of `{key, count, first, last}`.
+    """
+)
+def get_audit_summary(
+    filters: dict = Depends(audit_filters),
+    group_by: str = Query("action"),
+    limit: int = Query(100, ge=1, le=1000),
+    user: dict = Depends(require_role([Role.ADMIN]))
+):
+    return summarize_audit_logs(filters, group_by, limit)
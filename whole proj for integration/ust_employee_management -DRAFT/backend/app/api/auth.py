@@ -77,14 +77,14 @@ def login(
             "role": user.role
         })
 
-        logger.info(f"User {e_id} logged in successfully")
+        logger.info("User %s logged in successfully", e_id)
         return AuthResponse(
             access_token=token,
             token_type="bearer",
             is_first_login=is_first_login
         )
     except HTTPException as e:
-        logger.warning(f"Failed login attempt for user {e_id}: {e.detail}")
+        logger.warning("Failed login attempt for user %s: %s", e_id, e.detail)
         raise e
 
 @router.post(
@@ -113,10 +113,10 @@ def change_user_password(
 ):
     try:
         result = change_password(db, current_user.e_id, request)
-        logger.info(f"Password changed for user {current_user.e_id}")
+        logger.info("Password changed for user %s", current_user.e_id)
         return result
     except HTTPException as e:
-        logger.warning(f"Password change failed for user {current_user.e_id}: {e.detail}")
+        logger.warning("Password change failed for user %s: %s", current_user.e_id, e.detail)
         raise e
 
 @router.post(
@@ -141,10 +141,10 @@ def change_user_password(
 def forgot_password(request: ResetPasswordRequest, db: Session = Depends(get_db)):
     try:
         result = request_password_reset(db, request)
-        logger.info(f"Password reset requested for user {request.e_id}")
+        logger.info("Password reset requested for user %s", request.e_id)
         return result
     except HTTPException as e:
-        logger.warning(f"Password reset request failed for user {request.e_id}: {e.detail}")
+        logger.warning("Password reset request failed for user %s: %s", request.e_id, e.detail)
         raise e
 
 @router.post(
@@ -172,5 +172,5 @@ def reset_password(request: ResetPasswordConfirm, db: Session = Depends(get_db))
         logger.info("Password reset completed successfully")
         return result
     except HTTPException as e:
-        logger.warning(f"Password reset failed: {e.detail}")
+        logger.warning("Password reset failed: %s", e.detail)
         raise e
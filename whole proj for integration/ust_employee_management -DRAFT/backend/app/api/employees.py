@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, BackgroundTasks, Query
 from sqlalchemy.orm import Session
 
+from typing import Literal, Optional
+
 from app.schemas.employee_schema import (
     EmployeeCreate,
     EmployeeUpdate,
@@ -21,12 +23,31 @@ from app.core.role_guard import require_role
 from app.core.constants import Role
 
 from fastapi import UploadFile, File
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, Response
 
 from app.services.employee_file_service import (
     save_profile_picture,
-    # get_profile_picture
+    generate_avatar_thumbnails,
+    pick_avatar,
+    read_avatar,
 )
+from app.core.config import settings
+from app.services.attachment_service import list_employee_attachments
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.import_stream import iter_records, resolve_format
+from app.services.import_service import import_employees
+from app.services.org_hierarchy import is_in_org, get_subtree, get_management_chain
+from app.services.org_rollup import get_rollup
+from app.schemas.import_schema import ImportReport
+
+
+def _require_org_access(db: Session, user: dict, e_id: int):
+    """Admins see everyone, managers their organisation, everyone themselves."""
+    if user.get("role") == Role.ADMIN.value or user.get("e_id") == e_id:
+        return
+    if user.get("role") == Role.MANAGER.value and is_in_org(db, user["e_id"], e_id):
+        return
+    raise HTTPException(status_code=403, detail="Access denied")
 
 
 router = APIRouter(
@@ -56,11 +77,15 @@ router = APIRouter(
 
     **Permissions:** Only Admins and Managers can upload profile pictures.
 
+    **Thumbnails:** Resized WebP/JPEG avatars are generated in the background and
+    replace the previous picture once all sizes are ready.
+
     **Response:** Success message with file ID for future reference.
     """
 )
 def upload_profile_picture(
     e_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER]))
 ):
@@ -69,20 +94,188 @@ def upload_profile_picture(
         raise HTTPException(status_code=400, detail="Only image files allowed")
 
     file_id = save_profile_picture(e_id, file)
+    background_tasks.add_task(generate_avatar_thumbnails, e_id, file_id)
 
     return {
         "message": "Profile picture uploaded successfully",
         "file_id": file_id
     }
     
-# @router.get("/profile-picture/{file_id}")
-# def fetch_profile_picture(file_id: str):
-#     grid_file = get_profile_picture(file_id)
 
-#     return StreamingResponse(
-#         grid_file,
-#         media_type=grid_file.content_type
-#     )
+@router.get(
+    "/{e_id}/avatar",
+    summary="Get Employee Avatar",
+    description="""
+    Serve an employee's profile picture resized to the nearest available size.
+
+    **Path Parameters:**
+    - `e_id`: Employee ID
+
+    **Query Parameters:**
+    - `size`: Desired edge length in pixels (default 40)
+    - `v`: Avatar version from a previous response's `X-Avatar-Version` header
+
+    **Permissions:** All authenticated users can view avatars.
+
+    **Caching:** Responses carry an ETag and honour `If-None-Match`. Requests that
+    pass the current `v` are cacheable for a year; others must revalidate.
+
+    **Response:** WebP image when the client accepts it, otherwise JPEG.
+    """
+)
+def get_avatar(
+    e_id: int,
+    size: int = Query(40, ge=1, le=2048),
+    v: str | None = Query(None),
+    accept: str | None = Header(None),
+    if_none_match: str | None = Header(None),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
+):
+    picked = pick_avatar(e_id, size, accept or "")
+    if not picked:
+        raise HTTPException(status_code=404, detail="Avatar not found")
+    avatar, file_id, content_type = picked
+
+    # Thumbnails are immutable, so the GridFS id is a strong validator
+    etag = f'"{file_id}"'
+    if v == avatar["version"]:
+        cache_control = f"private, max-age={settings.AVATAR_MAX_AGE_SECONDS}, immutable"
+    else:
+        cache_control = "private, no-cache"
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept",
+        "X-Avatar-Version": avatar["version"]
+    }
+
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=read_avatar(file_id), media_type=content_type, headers=headers)
+
+
+@router.get(
+    "/{e_id}/attachments",
+    summary="List Employee Attachments",
+    description="""
+    List files owned by an employee (remark attachments they uploaded and their
+    profile pictures), newest first, from the attachment catalog.
+
+    **Path Parameters:**
+    - `e_id`: Employee ID
+
+    **Query Parameters:**
+    - `limit`: Page size
+    - `cursor`: `next_cursor` from the previous page
+
+    **Permissions:** Admins for anyone, managers for anyone in their
+    organisation, and any user for themselves.
+
+    **Response:** `items` and `next_cursor` (null on the last page).
+    """
+)
+def list_attachments(
+    e_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
+):
+    _require_org_access(db, user, e_id)
+    log_action("LIST_EMPLOYEE_ATTACHMENTS", "EMPLOYEE", e_id, user["e_id"])
+    return list_employee_attachments(e_id, cursor, limit)
+
+
+@router.get(
+    "/{e_id}/subtree",
+    summary="List Employee's Organisation",
+    description="""
+    Everyone who reports to an employee, directly or through other managers.
+
+    **Path Parameters:**
+    - `e_id`: Employee ID at the top of the subtree (not included)
+
+    **Query Parameters:**
+    - `max_depth`: Only this many levels down (1 = direct reports)
+    - `limit`: Page size
+    - `cursor`: `next_cursor` from the previous page
+
+    **Permissions:** Admins for anyone, managers for anyone in their
+    organisation, and any user for themselves.
+
+    **Response:** `items` (employee fields plus `depth` below `e_id`), ordered by
+    employee ID, and `next_cursor` (null on the last page).
+    """
+)
+def get_subtree_api(
+    e_id: int,
+    max_depth: int | None = Query(None, ge=1),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
+):
+    _require_org_access(db, user, e_id)
+    log_action("GET_EMPLOYEE_SUBTREE", "EMPLOYEE", e_id, user["e_id"])
+    return get_subtree(db, e_id, cursor, limit, max_depth)
+
+
+@router.get(
+    "/{e_id}/managers",
+    summary="Get Employee's Management Chain",
+    description="""
+    The employee's manager, their manager, and so on up to the top.
+
+    **Permissions:** Admins for anyone, managers for anyone in their
+    organisation, and any user for themselves.
+
+    **Response:** Array of `e_id`, `name`, `designation` and `depth`
+    (1 = direct manager), nearest first.
+    """
+)
+def get_management_chain_api(
+    e_id: int,
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
+):
+    _require_org_access(db, user, e_id)
+    log_action("GET_EMPLOYEE_MANAGERS", "EMPLOYEE", e_id, user["e_id"])
+    return get_management_chain(db, e_id)
+
+
+@router.get(
+    "/{e_id}/rollup",
+    summary="Get Organisation Task Rollup",
+    description="""
+    Task counts for everyone under an employee, directly or through other
+    managers, in one response.
+
+    **Path Parameters:**
+    - `e_id`: Employee ID at the top of the organisation (their own tasks are not counted)
+
+    **Counts:** `total`, `open` (not done), `overdue` (open and past
+    `expected_closure`), `done`, `by_status` and `by_priority`, by assignee.
+
+    **Permissions:** Admins for anyone, managers for themselves and anyone in
+    their organisation, and any user for themselves.
+
+    **Caching:** Served from a cache that task and reporting-line changes
+    refresh for the managers they affect; `computed_at` tells when the counts
+    were taken.
+
+    **Response:** `headcount` and the counts for the whole organisation, and
+    `reports`: the same for each direct report's own organisation (them included).
+    """
+)
+def get_rollup_api(
+    e_id: int,
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
+):
+    _require_org_access(db, user, e_id)
+    log_action("GET_EMPLOYEE_ROLLUP", "EMPLOYEE", e_id, user["e_id"])
+    return get_rollup(db, e_id)
 
 
 # CREATE – ADMIN
@@ -117,6 +310,41 @@ def create(
     return emp
 
 
+@router.post(
+    "/import",
+    response_model=ImportReport,
+    summary="Import Employees",
+    description="""
+    Create many employees from an uploaded CSV (with header row) or JSON lines file.
+
+    **Columns:** `name`, `email`, `designation` and optionally either
+    `mgr_id` (an existing employee) or `mgr_email` (an existing employee or
+    another row of the same file).
+
+    **Query Parameters:**
+    - `format`: `csv` or `ndjson`; taken from the file extension when omitted
+
+    **Ordering:** Managers named by `mgr_email` are created before their
+    reports, whatever their order in the file. Rows in a reporting cycle are rejected.
+
+    **Permissions:** Only Admins can import employees.
+
+    **Response:** Row counts and a per-row error list. Valid rows are imported
+    even when others fail; they are committed in chunks of `IMPORT_CHUNK_SIZE`.
+    """
+)
+def import_employees_api(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None),
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_role([Role.ADMIN]))
+):
+    fmt = resolve_format(file.filename, format)
+    report = import_employees(db, iter_records(file.file, fmt))
+    log_action("IMPORT_EMPLOYEES", "EMPLOYEE", 0, user["e_id"])
+    return report
+
+
 @router.get(
     "/",
     response_model=list[EmployeeResponse],
@@ -191,8 +419,10 @@ def update(
     db: Session = Depends(get_db),
     user: dict = Depends(require_role([Role.ADMIN]))
 ):
-    emp = update_employee(db, e_id, payload)
-    log_action("UPDATE_EMPLOYEE", "EMPLOYEE", e_id, user["e_id"])
+    emp, changed = update_employee(db, e_id, payload)
+    # a PUT that matches the stored row changes nothing and is not audited
+    if changed:
+        log_action("UPDATE_EMPLOYEE", "EMPLOYEE", e_id, user["e_id"])
     return emp
 
 
@@ -233,7 +463,7 @@ def delete(
 
     **Permissions:**
     - Admins: may retrieve any employee
-    - Managers: may retrieve employees who report to them
+    - Managers: may retrieve anyone in their organisation (direct or indirect reports)
     - Any authenticated user: may retrieve their own record
     """
 )
@@ -253,12 +483,10 @@ def get_one(
         log_action("GET_EMPLOYEE_SELF", "EMPLOYEE", e_id, user["e_id"])
         return get_employee(db, e_id)
 
-    # Managers may access employees who report to them
-    if user.get("role") == Role.MANAGER.value:
-        team = get_employees_by_manager(db, user["e_id"])
-        if any(e.e_id == e_id for e in team):
-            log_action("GET_EMPLOYEE_UNDER_MANAGER", "EMPLOYEE", e_id, user["e_id"])
-            return get_employee(db, e_id)
+    # Managers may access anyone in their organisation
+    if user.get("role") == Role.MANAGER.value and is_in_org(db, user["e_id"], e_id):
+        log_action("GET_EMPLOYEE_UNDER_MANAGER", "EMPLOYEE", e_id, user["e_id"])
+        return get_employee(db, e_id)
 
     # Otherwise forbidden
     raise HTTPException(status_code=403, detail="Access denied")
@@ -0,0 +1,112 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.role_guard import require_role
+from app.core.constants import Role
+from app.middleware.logger import log_action
+from app.services.export_service import export_columns, export_statement, iter_export_rows
+from app.utils.export_stream import FORMATS, stream_rows
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"],
+    responses={
+        401: {"description": "Unauthorized - Invalid or missing token"},
+        403: {"description": "Forbidden - Insufficient permissions"},
+        422: {"description": "Validation Error - Invalid input data"},
+        500: {"description": "Internal Server Error - Something went wrong"}
+    }
+)
+
+ExportFormat = Literal["csv", "ndjson"]
+
+
+def _export_response(entity: str, user: dict, fmt: str, gzip: bool) -> StreamingResponse:
+    # built before streaming starts, so a 403 is still a normal error response
+    stmt = export_statement(entity, user["role"], user["e_id"])
+    filename = f"{entity}.{fmt}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_rows(export_columns(entity), iter_export_rows(stmt), fmt, compress=gzip),
+        media_type="application/gzip" if gzip else FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+@router.get(
+    "/tasks",
+    summary="Export Tasks",
+    description="""
+    Stream every task the user can see as CSV or NDJSON.
+
+    **Query Parameters:**
+    - `format`: `csv` (default, with a header row) or `ndjson` (one JSON object per line)
+    - `gzip`: Compress the download (`.gz`)
+
+    **Permissions:** Same scoping as `GET /api/tasks/`: admins get all tasks,
+    managers the tasks they created or review, developers their assigned tasks.
+
+    **Streaming:** Rows are read from a server-side cursor and encoded as they
+    arrive, so memory use stays flat however many rows are exported.
+
+    **Response:** `text/csv`, `application/x-ndjson` or `application/gzip` stream.
+    """
+)
+def export_tasks(
+    format: ExportFormat = Query("csv"),
+    gzip: bool = Query(False),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
+):
+    log_action("EXPORT_TASKS", "TASK", 0, user["e_id"])
+    return _export_response("tasks", user, format, gzip)
+
+
+@router.get(
+    "/employees",
+    summary="Export Employees",
+    description="""
+    Stream employees as CSV or NDJSON.
+
+    **Query Parameters:**
+    - `format`: `csv` (default) or `ndjson`
+    - `gzip`: Compress the download (`.gz`)
+
+    **Permissions:** Admins export all employees, managers everyone in their
+    organisation (direct and indirect reports).
+
+    **Response:** `text/csv`, `application/x-ndjson` or `application/gzip` stream.
+    """
+)
+def export_employees(
+    format: ExportFormat = Query("csv"),
+    gzip: bool = Query(False),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER]))
+):
+    log_action("EXPORT_EMPLOYEES", "EMPLOYEE", 0, user["e_id"])
+    return _export_response("employees", user, format, gzip)
+
+
+@router.get(
+    "/users",
+    summary="Export Users",
+    description="""
+    Stream user accounts (role, status, timestamps) as CSV or NDJSON.
+    Password hashes and reset tokens are never exported.
+
+    **Query Parameters:**
+    - `format`: `csv` (default) or `ndjson`
+    - `gzip`: Compress the download (`.gz`)
+
+    **Permissions:** Admin only.
+
+    **Response:** `text/csv`, `application/x-ndjson` or `application/gzip` stream.
+    """
+)
+def export_users(
+    format: ExportFormat = Query("csv"),
+    gzip: bool = Query(False),
+    user: dict = Depends(require_role([Role.ADMIN]))
+):
+    log_action("EXPORT_USERS", "USER", 0, user["e_id"])
+    return _export_response("users", user, format, gzip)
@@ -1,10 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse
-from bson import ObjectId
-from app.database.mongodb import fs
+from fastapi.responses import StreamingResponse, Response
+from gridfs.errors import NoFile
 from app.core.role_guard import require_role
 from app.core.constants import Role
 from app.middleware.logger import log_action
+from app.utils.gridfs_cache import fetch_file, file_cache, CachedFile
 
 router = APIRouter(
     prefix="/api/files",
@@ -33,19 +33,47 @@ router = APIRouter(
     **Response:** File content as streaming response with appropriate headers.
 
     **Headers:** Content-Disposition set for browser download with original filename.
+
+    **Streaming:** Chunks are prefetched from GridFS in batches and sent as larger buffers.
+    Small files are served from an in-memory cache.
     """
 )
 def download_file(file_id: str, user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))):
     log_action("DOWNLOAD_FILE", "FILE", 0, user["e_id"])  # entity_id as file_id string, but use 0
     try:
-        grid_file = fs.get(ObjectId(file_id))
-    except Exception:
+        grid_file = fetch_file(file_id)
+    except NoFile:
         raise HTTPException(status_code=404, detail="File not found")
 
+    headers = {
+        "Content-Disposition": f"attachment; filename={grid_file.filename}"
+    }
+    if isinstance(grid_file, CachedFile):
+        return Response(
+            content=grid_file.data,
+            media_type="application/octet-stream",
+            headers=headers
+        )
+
+    headers["Content-Length"] = str(grid_file.length)
     return StreamingResponse(
         grid_file,
         media_type="application/octet-stream",
-        headers={
-            "Content-Disposition": f"attachment; filename={grid_file.filename}"
-        }
+        headers=headers
     )
+
+
+@router.get(
+    "/cache/stats",
+    summary="File Cache Statistics",
+    description="""
+    Report usage of the in-memory cache for small GridFS files.
+
+    **Permissions:** Only Admins can view cache statistics.
+
+    **Response:** Entry count, bytes used, hits, misses, hit ratio, bypasses
+    (files too large to cache), evictions and invalidations.
+    """
+)
+def file_cache_stats(user: dict = Depends(require_role([Role.ADMIN]))):
+    return file_cache.stats()
@@ -5,7 +5,9 @@ from app.services.remark_service import (
     get_remarks_by_task,
     delete_remark_by_id,
     update_remark,
+    summarize_remarks,
 )
+from app.schemas.remark_schema import RemarkSummaryRequest
 from app.core.role_guard import require_role
 from app.core.constants import Role
 from app.middleware.logger import log_action
@@ -69,6 +71,33 @@ def list_remarks(task_id: int, user: dict = Depends(require_role([Role.ADMIN, Ro
     return get_remarks_by_task(task_id)
 
 
+@router.post(
+    "/summary",
+    summary="Remark Summary for Many Tasks",
+    description="""
+    Get the remark count, latest remark and attachment flag for a batch of tasks
+    in one request (e.g. every card on the task board).
+
+    **Request Body:**
+    - `task_ids`: IDs of the tasks to summarise (1-200)
+
+    **Permissions:** All authenticated users can view remark summaries.
+
+    **Response:** One entry per requested task, in request order:
+    - `task_id`
+    - `remark_count`: 0 for tasks without remarks
+    - `latest_remark`: newest remark (`_id`, `comment`, `e_id`, `file_name`, `created_at`) or null
+    - `has_attachment`: whether any remark on the task has a file
+    """
+)
+def remark_summary(
+    request: RemarkSummaryRequest,
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
+):
+    log_action("LIST_REMARK_SUMMARY", "TASK", 0, user["e_id"])
+    return summarize_remarks(request.task_ids)
+
+
 @router.post(
     "/with-file",
     summary="Add Remark with File Attachment",
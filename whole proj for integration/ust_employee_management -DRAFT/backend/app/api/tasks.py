@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.models.employee import Employee 
 from app.database.mysql import get_db
 from app.schemas.task_schema import (
     TaskCreate,
@@ -8,6 +8,10 @@ from app.schemas.task_schema import (
     UpdateTaskStatusSchema,
     TaskUpdate,
     TaskResponse,
+    BulkTaskCreateRequest,
+    BulkAssignRequest,
+    BulkStatusRequest,
+    BulkResult,
 )
 from app.services.task_service import (
     create_task,
@@ -21,7 +25,20 @@ from app.core.role_guard import require_role
 from app.core.constants import Role, TaskStatus
 from app.middleware.logger import log_action
 from app.models.task import Task
-from typing import Optional
+from app.services.remark_service import iter_task_attachments
+from app.services.attachment_service import list_task_attachments
+from app.services.timeline_service import get_task_timeline
+from app.services.task_bulk_service import create_tasks_bulk, assign_tasks_bulk, update_tasks_status_bulk
+from app.services.import_service import import_tasks
+from app.schemas.import_schema import ImportReport
+from app.utils.import_stream import iter_records, resolve_format
+from app.services.outbox import enqueue_audit
+from app.services.employee_service import existing_employee_ids
+from app.services.org_rollup import invalidate_rollups
+from app.utils.model_updates import apply_changes
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.zip_stream import stream_zip
+from typing import Literal, Optional
 from app.core.constants import Priority, TaskStatus, Role
 
 router = APIRouter(
@@ -102,6 +119,103 @@ def get_task(
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
+@router.get(
+    "/{task_id}/attachments",
+    summary="List Task Attachments",
+    description="""
+    List files attached to a task's remarks, newest first, from the attachment catalog.
+
+    **Path Parameters:**
+    - `task_id`: Unique identifier of the task
+
+    **Query Parameters:**
+    - `limit`: Page size
+    - `cursor`: `next_cursor` from the previous page
+
+    **Permissions:** All authenticated users can list task attachments.
+
+    **Response:** `items` (file id, remark, uploader, name, size, content type, SHA-256)
+    and `next_cursor` (null on the last page).
+    """
+)
+def list_task_attachments_api(
+    task_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
+):
+    log_action("LIST_TASK_ATTACHMENTS", "TASK", task_id, user["e_id"])
+    return list_task_attachments(task_id, cursor, limit)
+
+
+@router.get(
+    "/{task_id}/attachments.zip",
+    summary="Download All Task Attachments",
+    description="""
+    Download every file attached to a task's remarks as a single ZIP archive.
+
+    **Path Parameters:**
+    - `task_id`: Unique identifier of the task
+
+    **Permissions:** All authenticated users can download task attachments.
+
+    **Streaming:** The archive is assembled on the fly from GridFS in stored mode,
+    so the download starts immediately and nothing is staged on disk. Files
+    attached to several remarks are included once.
+
+    **Response:** `application/zip` stream.
+    """
+)
+def download_task_attachments(
+    task_id: int,
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
+):
+    log_action("DOWNLOAD_TASK_ATTACHMENTS", "TASK", task_id, user["e_id"])
+    task = db.query(Task.t_id).filter(Task.t_id == task_id).first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return StreamingResponse(
+        stream_zip(iter_task_attachments(task_id)),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename=task_{task_id}_attachments.zip"
+        }
+    )
+
+
+@router.get(
+    "/{task_id}/timeline",
+    summary="Task Activity Timeline",
+    description="""
+    Get a task's full history, newest first: remarks (including status-change
+    remarks) merged with audit events such as assignment and status updates.
+
+    **Path Parameters:**
+    - `task_id`: Unique identifier of the task
+
+    **Query Parameters:**
+    - `limit`: Page size
+    - `cursor`: `next_cursor` from the previous page
+
+    **Permissions:** All authenticated users can view task timelines.
+
+    **Response:** `items` with a common shape (`id`, `type` = remark/event,
+    `timestamp`, `actor`, `action`, `comment`, `file_id`, `file_name`) and
+    `next_cursor` (null on the last page). Events already moved to the audit
+    archive are not included.
+    """
+)
+def task_timeline(
+    task_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
+):
+    log_action("GET_TASK_TIMELINE", "TASK", task_id, user["e_id"])
+    return get_task_timeline(task_id, cursor, limit)
+
 @router.post(
     "/",
     response_model=TaskResponse,
@@ -134,9 +248,119 @@ def create_task_api(
     Create a new task.
     Requires ADMIN or MANAGER role.
     """
-    task = create_task(db, payload, user["e_id"])
-    log_action("CREATE_TASK", "TASK", task.t_id, user["e_id"])
-    return task
+    return create_task(db, payload, user["e_id"])
+
+
+# Bulk routes are declared before the /{task_id}/... routes they would
+# otherwise be matched as.
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    summary="Create Many Tasks",
+    description="""
+    Create up to `BULK_MAX_ITEMS` tasks in one request and one transaction.
+
+    **Request Body:** `{"items": [...]}` where each item has the fields of
+    `POST /api/tasks/`.
+
+    **Validation:** All referenced employees are checked with a single query.
+    Items with an unknown assignee, reviewer or creator are reported as failed;
+    the rest are created.
+
+    **Permissions:** Only Admins and Managers can create tasks.
+
+    **Response:** `succeeded`/`failed` counts and one result per item (in
+    request order) with its `index`, new `t_id`, `status_code` and `error`.
+    """
+)
+def create_tasks_bulk_api(
+    payload: BulkTaskCreateRequest,
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER]))
+):
+    return create_tasks_bulk(db, payload.items, user["e_id"])
+
+
+@router.put(
+    "/bulk/assign",
+    response_model=BulkResult,
+    summary="Assign Many Tasks",
+    description="""
+    Assign up to `BULK_MAX_ITEMS` tasks in one request and one transaction.
+
+    **Request Body:** `{"items": [{"t_id": 1, "assigned_to": 5, "reviewer": 2}, ...]}`
+
+    **Validation:** Tasks and employees are each looked up with one query.
+    Unknown tasks or employees and repeated `t_id`s are reported as failed.
+    Items that would not change the task succeed without a write.
+
+    **Permissions:** Only Admins and Managers can assign tasks.
+
+    **Response:** `succeeded`/`failed` counts and one result per item.
+    """
+)
+def assign_tasks_bulk_api(
+    payload: BulkAssignRequest,
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER]))
+):
+    return assign_tasks_bulk(db, payload.items, user["e_id"])
+
+
+@router.put(
+    "/bulk/status",
+    response_model=BulkResult,
+    summary="Move Many Tasks to Another Status",
+    description="""
+    Apply up to `BULK_MAX_ITEMS` status transitions in one request and one
+    transaction, under the same rules as `PUT /api/tasks/{task_id}/status`.
+
+    **Request Body:** `{"items": [{"t_id": 1, "status": "REVIEW", "remark": null}, ...]}`
+
+    **Concurrency:** The tasks are locked while they are checked, so no
+    transition in the batch can overwrite a concurrent change.
+
+    **Response:** `succeeded`/`failed` counts and one result per item, with the
+    status code and message the single-task endpoint would have returned.
+    """
+)
+def update_tasks_status_bulk_api(
+    payload: BulkStatusRequest,
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
+):
+    return update_tasks_status_bulk(db, payload.items, user["e_id"], user["role"])
+
+
+@router.post(
+    "/import",
+    response_model=ImportReport,
+    summary="Import Tasks",
+    description="""
+    Create many tasks from an uploaded CSV (with header row) or JSON lines file.
+
+    **Columns:** the fields of `POST /api/tasks/` (`title`, `description`,
+    `priority`, `expected_closure`, `assigned_to`, `reviewer`, optional `created_by`).
+
+    **Query Parameters:**
+    - `format`: `csv` or `ndjson`; taken from the file extension when omitted
+
+    **Permissions:** Only Admins and Managers can import tasks.
+
+    **Response:** Row counts and a per-row error list. Valid rows are imported
+    even when others fail; they are committed in chunks of `IMPORT_CHUNK_SIZE`.
+    """
+)
+def import_tasks_api(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None),
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER]))
+):
+    fmt = resolve_format(file.filename, format)
+    report = import_tasks(db, iter_records(file.file, fmt), user["e_id"])
+    log_action("IMPORT_TASKS", "TASK", 0, user["e_id"])
+    return report
 
 
 @router.put(
@@ -164,18 +388,37 @@ def assign_task_api(
     db: Session = Depends(get_db),
     user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER]))
 ):
-    log_action("ASSIGN_TASK", "TASK", task_id, user["e_id"])
+    # committed together with the assignment
+    enqueue_audit(db, "ASSIGN_TASK", "TASK", task_id, user["e_id"])
     return assign_task(db, task_id, payload, user["e_id"])
 
 
-# @router.put("/{task_id}/status")
-# def update_task_status_api(
-#     task_id: int,
-#     payload: UpdateTaskStatusSchema,
-#     db: Session = Depends(get_db),
-#     user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
-# ):
-#     return update_task_status(db, task_id, payload, user["e_id"], user["role"])
+@router.put(
+    "/{task_id}/status",
+    response_model=TaskResponse,
+    summary="Move Task to Another Status",
+    description="""
+    Move a task along its workflow.
+
+    **Allowed Transitions:**
+    - **Developer** (assignee): `TO_DO` → `IN_PROGRESS`, `IN_PROGRESS` → `REVIEW`
+    - **Manager** (reviewer): `REVIEW` → `DONE`, `REVIEW` → `IN_PROGRESS` (requires `remark`)
+
+    **Concurrency:** The check and the update are one conditional statement, so
+    if the task changed in the meantime the request fails instead of
+    overwriting the other change.
+
+    **Response:** Updated task object. 400 for a transition that is not allowed
+    from the current status, 403 if the user is not the assignee/reviewer.
+    """
+)
+def update_task_status_api(
+    task_id: int,
+    payload: UpdateTaskStatusSchema,
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER, Role.DEVELOPER]))
+):
+    return update_task_status(db, task_id, payload, user["e_id"], user["role"])
 
 
 @router.patch(
@@ -206,7 +449,6 @@ def patch_task(
     db: Session = Depends(get_db),
     user: dict = Depends(require_role([Role.MANAGER, Role.DEVELOPER]))
 ):
-    log_action("PATCH_TASK", "TASK", task_id, user["e_id"])
     task = db.query(Task).filter(Task.t_id == task_id).first()
 
     if not task:
@@ -214,24 +456,19 @@ def patch_task(
 
     update_data = payload.dict(exclude_unset=True)
 
-    # Ensure 'assigned_to' is a valid 'e_id' or set it to None if no assignee
-    if update_data.get('assigned_to') is not None:
-        assigned_employee = db.query(Employee).filter(Employee.e_id == update_data['assigned_to']).first()
-        if not assigned_employee:
-            raise HTTPException(status_code=400, detail="Assigned employee does not exist")
-
-    # Ensure 'reviewer' is a valid 'e_id' or set it to None if no reviewer
-    if update_data.get('reviewer') is not None:
-        reviewer_employee = db.query(Employee).filter(Employee.e_id == update_data['reviewer']).first()
-        if not reviewer_employee:
-            raise HTTPException(status_code=400, detail="Reviewer does not exist")
-
-    # Update task fields
-    for key, value in update_data.items():
-        setattr(task, key, value)
-
-    db.commit()
-    db.refresh(task)
+    # Ensure 'assigned_to' and 'reviewer' are valid 'e_id's (one query for both)
+    existing = existing_employee_ids(db, [update_data.get('assigned_to'), update_data.get('reviewer')])
+    if update_data.get('assigned_to') is not None and update_data['assigned_to'] not in existing:
+        raise HTTPException(status_code=400, detail="Assigned employee does not exist")
+    if update_data.get('reviewer') is not None and update_data['reviewer'] not in existing:
+        raise HTTPException(status_code=400, detail="Reviewer does not exist")
+
+    # Update task fields; a patch that changes nothing is neither written nor audited
+    previous_assignee = task.assigned_to
+    if apply_changes(task, update_data):
+        enqueue_audit(db, "PATCH_TASK", "TASK", task_id, user["e_id"])
+        db.commit()
+        invalidate_rollups(db, [previous_assignee, task.assigned_to])
     return task
 
 
@@ -258,5 +495,5 @@ def delete_task_api(
     db: Session = Depends(get_db),
     user: dict = Depends(require_role([Role.ADMIN, Role.MANAGER]))
 ):
-    log_action("DELETE_TASK", "TASK", task_id, user["e_id"])
+    enqueue_audit(db, "DELETE_TASK", "TASK", task_id, user["e_id"])
     return delete_task_by_id(db, task_id)
\ No newline at end of file
@@ -4,10 +4,13 @@ from sqlalchemy.orm import Session
 from app.schemas.user_schema import (
     UserCreate,
     UserUpdate,
-    UserResponse
+    UserResponse,
+    BulkUserCreateRequest,
+    BulkUserResponse
 )
 from app.services.user_service import (
     create_user,
+    create_users_bulk,
     get_all_users,
     update_user,
     delete_user,
@@ -111,6 +114,38 @@ def create_user_api(
     return user_obj
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkUserResponse,
+    summary="Create Many User Accounts",
+    description="""
+    Provision accounts for up to `BULK_MAX_ITEMS` employees in one request.
+
+    **Request Body:** `{"items": [{"e_id": 10, "role": "DEVELOPER", "password": null}, ...]}`;
+    items without a password get the default one.
+
+    **Validation:** Employees and existing accounts for the whole batch are
+    checked with one query. Unknown employees, employees that already have an
+    account and repeated `e_id`s are reported as failed.
+
+    **Performance:** Passwords are hashed across a pool of worker processes
+    (`PASSWORD_HASH_WORKERS`, default one per CPU).
+
+    **Permissions:** Only Admins can create user accounts.
+
+    **Response:** `succeeded`/`failed` counts and one result per item. The
+    valid accounts are created in one transaction; 409 if another request
+    created one of them in the meantime (nothing is created then).
+    """
+)
+def create_users_bulk_api(
+    payload: BulkUserCreateRequest,
+    db: Session = Depends(get_db),
+    user: dict = Depends(require_role([Role.ADMIN]))
+):
+    return create_users_bulk(db, payload.items, user["e_id"])
+
+
 @router.put(
     "/{e_id}",
     response_model=UserResponse,
@@ -135,10 +170,12 @@ def update_user_api(
     e_id: int,
     payload: UserUpdate,
     db: Session = Depends(get_db),
-    _: dict = Depends(require_role([Role.ADMIN]))
+    user: dict = Depends(require_role([Role.ADMIN]))
 ):
-    user_obj = update_user(db, e_id, payload)
-    log_action("UPDATE_USER", "USER", e_id, user["e_id"])
+    user_obj, changed = update_user(db, e_id, payload)
+    # a PUT that matches the stored row changes nothing and is not audited
+    if changed:
+        log_action("UPDATE_USER", "USER", e_id, user["e_id"])
     return user_obj
 
 
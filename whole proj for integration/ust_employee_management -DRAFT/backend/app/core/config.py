@@ -13,6 +13,98 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = Field(default="HS256", env="JWT_ALGORITHM")
     JWT_EXPIRE_MINUTES: int = Field(default=60, env="JWT_EXPIRE_MINUTES")
 
+    # create missing MongoDB indexes from the registry when the app starts
+    MONGO_ENSURE_INDEXES_ON_STARTUP: bool = Field(default=True, env="MONGO_ENSURE_INDEXES_ON_STARTUP")
+
+    # ---------- USERS ----------
+    # password given to new accounts created without one
+    DEFAULT_USER_PASSWORD: str = Field(default="welcome123", env="DEFAULT_USER_PASSWORD")
+    # processes hashing passwords for bulk provisioning (0 = one per CPU)
+    PASSWORD_HASH_WORKERS: int = Field(default=0, env="PASSWORD_HASH_WORKERS")
+
+    # ---------- LOGGING ----------
+    LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
+    # per-logger levels, e.g. {"sqlalchemy.engine": "INFO", "app.api.auth": "DEBUG"}
+    LOG_LEVELS: dict[str, str] = Field(default={}, env="LOG_LEVELS")
+    # records waiting for the writer thread; further records are dropped
+    LOG_QUEUE_SIZE: int = Field(default=10000, env="LOG_QUEUE_SIZE")
+
+    # ---------- AUDIT LOGS ----------
+    # time-series collection that log_action writes to
+    AUDIT_COLLECTION: str = Field(default="audit_logs", env="AUDIT_COLLECTION")
+    # documents older than this are expired by MongoDB (0 keeps them forever)
+    AUDIT_RETENTION_DAYS: int = Field(default=365, env="AUDIT_RETENTION_DAYS")
+    # days kept in MongoDB before the rollover job moves them to segment files
+    AUDIT_HOT_DAYS: int = Field(default=30, env="AUDIT_HOT_DAYS")
+    AUDIT_ARCHIVE_DIR: str = Field(default="audit_archive", env="AUDIT_ARCHIVE_DIR")
+    # how read actions (GET_/LIST_/DOWNLOAD_) are recorded: always, sample, aggregate or off
+    AUDIT_READ_POLICY: str = Field(default="aggregate", env="AUDIT_READ_POLICY")
+    AUDIT_READ_SAMPLE_RATE: float = Field(default=0.05, env="AUDIT_READ_SAMPLE_RATE")
+    # per-action overrides, e.g. {"DOWNLOAD_FILE": "always", "GET_TASK": "sample:0.1"}
+    AUDIT_ACTION_POLICIES: dict[str, str] = Field(default={}, env="AUDIT_ACTION_POLICIES")
+    # how often aggregated read counters are written
+    AUDIT_AGGREGATE_FLUSH_SECONDS: int = Field(default=60, env="AUDIT_AGGREGATE_FLUSH_SECONDS")
+
+    # ---------- ERROR AGGREGATION ----------
+    # unhandled exceptions are counted per fingerprint and flushed this often
+    ERROR_FLUSH_SECONDS: int = Field(default=10, env="ERROR_FLUSH_SECONDS")
+    # hard ceiling on error documents written per second, however many errors occur
+    ERROR_MAX_WRITES_PER_SECOND: int = Field(default=5, env="ERROR_MAX_WRITES_PER_SECOND")
+    # distinct fingerprints held in memory before new ones share an overflow entry
+    ERROR_MAX_FINGERPRINTS: int = Field(default=1000, env="ERROR_MAX_FINGERPRINTS")
+    ERROR_SAMPLES_PER_FINGERPRINT: int = Field(default=5, env="ERROR_SAMPLES_PER_FINGERPRINT")
+
+    # ---------- FILES (GridFS) ----------
+    # chunks requested per cursor batch while streaming a download
+    GRIDFS_PREFETCH_CHUNKS: int = Field(default=16, env="GRIDFS_PREFETCH_CHUNKS")
+    # size of the coalesced buffers handed to the response
+    GRIDFS_STREAM_BUFFER_BYTES: int = Field(default=1024 * 1024, env="GRIDFS_STREAM_BUFFER_BYTES")
+    # buffers kept ready ahead of the client (bounds memory per download)
+    GRIDFS_PREFETCH_DEPTH: int = Field(default=4, env="GRIDFS_PREFETCH_DEPTH")
+    # in-memory cache for small files: total budget and per-file ceiling
+    GRIDFS_CACHE_MAX_BYTES: int = Field(default=64 * 1024 * 1024, env="GRIDFS_CACHE_MAX_BYTES")
+    GRIDFS_CACHE_MAX_OBJECT_BYTES: int = Field(default=512 * 1024, env="GRIDFS_CACHE_MAX_OBJECT_BYTES")
+
+    # ---------- OUTBOX ----------
+    # deliver outbox events to MongoDB from a thread inside the API process
+    OUTBOX_RELAY_ENABLED: bool = Field(default=True, env="OUTBOX_RELAY_ENABLED")
+    OUTBOX_BATCH_SIZE: int = Field(default=100, env="OUTBOX_BATCH_SIZE")
+    OUTBOX_POLL_SECONDS: float = Field(default=1.0, env="OUTBOX_POLL_SECONDS")
+    # failed deliveries are retried with backoff up to this many times
+    OUTBOX_MAX_ATTEMPTS: int = Field(default=10, env="OUTBOX_MAX_ATTEMPTS")
+    # delivered events are kept this long before being purged
+    OUTBOX_RETENTION_HOURS: int = Field(default=24, env="OUTBOX_RETENTION_HOURS")
+
+    # ---------- BULK OPERATIONS ----------
+    # most items accepted by one bulk request
+    BULK_MAX_ITEMS: int = Field(default=500, env="BULK_MAX_ITEMS")
+
+    # ---------- EXPORTS ----------
+    # rows fetched per round trip from the server-side cursor
+    EXPORT_BATCH_SIZE: int = Field(default=1000, env="EXPORT_BATCH_SIZE")
+
+    # ---------- IMPORTS ----------
+    # rows validated per lookup query and inserted per transaction
+    IMPORT_CHUNK_SIZE: int = Field(default=1000, env="IMPORT_CHUNK_SIZE")
+    # row errors listed in an import report (the counts are always complete)
+    IMPORT_MAX_REPORTED_ERRORS: int = Field(default=1000, env="IMPORT_MAX_REPORTED_ERRORS")
+
+    # ---------- ORG ROLLUPS ----------
+    # how long a cached rollup may be served; writes in this process invalidate
+    # it at once, this bounds staleness from other workers and overdue counts
+    ROLLUP_CACHE_SECONDS: int = Field(default=300, env="ROLLUP_CACHE_SECONDS")
+    ROLLUP_CACHE_MAX_ENTRIES: int = Field(default=10000, env="ROLLUP_CACHE_MAX_ENTRIES")
+
+    # ---------- ORPHAN CLEANUP ----------
+    # files younger than this are never treated as orphans (uploads in flight)
+    ORPHAN_GRACE_HOURS: int = Field(default=24, env="ORPHAN_GRACE_HOURS")
+
+    # ---------- AVATARS ----------
+    # square thumbnail edge lengths (px) generated for every profile picture
+    AVATAR_SIZES: list[int] = Field(default=[40, 80, 160, 320], env="AVATAR_SIZES")
+    # cache lifetime for avatar responses requested with the current version
+    AVATAR_MAX_AGE_SECONDS: int = Field(default=31536000, env="AVATAR_MAX_AGE_SECONDS")
+
     class Config:
         env_file = ".env"
         extra = "ignore"   # VERY IMPORTANT 🔥
@@ -0,0 +1,143 @@
+# Application Logging
+# Every log record goes through a QueueHandler into a bounded in-memory queue;
+# a QueueListener thread formats it as one JSON line and writes it to stdout.
+# Request threads therefore never block on log I/O. When the queue is full,
+# records are dropped and counted instead of stalling the request.
+#
+# Each record carries the current request id and user id (see
+# request_context), and levels can be set per logger via LOG_LEVELS.
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import queue
+import sys
+import threading
+import traceback
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.config import settings
+
+# SQLAlchemy logs every statement at INFO once its logger is enabled, so keep
+# it quiet unless LOG_LEVELS asks for it (this replaces engine echo=True)
+DEFAULT_LEVELS = {
+    "sqlalchemy.engine": "WARNING",
+    "pymongo": "WARNING",
+}
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id", "user_id"}
+
+# Mutable per-request dict, so ids bound inside dependencies (which run in a
+# copied context on the threadpool) are visible to the whole request
+request_context: contextvars.ContextVar[dict | None] = contextvars.ContextVar("request_context", default=None)
+
+
+def bind_request(request_id: str) -> dict:
+    context = {"request_id": request_id, "user_id": None}
+    request_context.set(context)
+    return context
+
+
+def bind_user(user_id):
+    context = request_context.get()
+    if context is not None:
+        context["user_id"] = user_id
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as a single JSON line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "user_id": getattr(record, "user_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    QueueHandler that stamps request/user ids and drops records when full.
+
+    Formatting is left to the listener thread: prepare() only resolves the
+    message and traceback, which must happen while the arguments are still
+    valid.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        context = request_context.get() or {}
+        record.request_id = context.get("request_id")
+        record.user_id = context.get("user_id")
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info))
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+_listener: QueueListener | None = None
+
+
+def configure_logging() -> QueueListener:
+    """
+    Route the root logger through the queue and start the listener.
+
+    Safe to call more than once; later calls only re-apply the levels.
+    """
+    global _listener
+
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name, level in {**DEFAULT_LEVELS, **settings.LOG_LEVELS}.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    if _listener is not None:
+        return _listener
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter())
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(ContextQueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
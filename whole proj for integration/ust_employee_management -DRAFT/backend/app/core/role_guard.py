@@ -4,6 +4,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.security import decode_token
+from app.core.logging_config import bind_user
 
 security = HTTPBearer()
 
@@ -49,6 +50,7 @@ def require_role(allowed_roles: Iterable[Any]):
                 detail="Access denied"
             )
 
+        bind_user(payload.get("e_id"))
         return payload  # contains e_id, role
 
     return role_checker
@@ -0,0 +1,215 @@
+# MongoDB Index Registry
+# Declares every index the application relies on, per collection, and applies
+# them idempotently (on startup or from app/init_mongo.py). Also reports build
+# progress and compares the live indexes against the registry.
+
+import logging
+import threading
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import CollectionInvalid, OperationFailure, PyMongoError
+
+from app.core.config import settings
+from app.database.mongodb import mongo_db
+
+logger = logging.getLogger(__name__)
+
+INDEX_REGISTRY: dict[str, list[IndexModel]] = {
+    "remarks": [
+        # get_remarks_by_task / attachment lookups by task
+        IndexModel([("task_id", ASCENDING), ("created_at", ASCENDING)], name="task_id_1_created_at_1"),
+        # remarks that reference a GridFS file
+        IndexModel([("file_id", ASCENDING)], name="file_id_1", sparse=True),
+        # remarks by author; see scripts/normalize_remark_authors.py for older documents
+        IndexModel([("e_id", ASCENDING), ("created_at", DESCENDING)], name="e_id_1_created_at_-1"),
+    ],
+    settings.AUDIT_COLLECTION: [
+        # time-series collection: metadata fields live under `meta`
+        IndexModel([("timestamp", DESCENDING)], name="timestamp_-1"),
+        IndexModel([("meta.performed_by", ASCENDING), ("timestamp", DESCENDING)], name="meta.performed_by_1_timestamp_-1"),
+        IndexModel(
+            [("meta.entity_type", ASCENDING), ("meta.entity_id", ASCENDING), ("timestamp", DESCENDING)],
+            name="meta.entity_type_1_meta.entity_id_1_timestamp_-1"
+        ),
+        IndexModel([("action", ASCENDING), ("timestamp", DESCENDING)], name="action_1_timestamp_-1"),
+    ],
+    "fs.files": [
+        # GridFS' own indexes, registered so they are built up front
+        IndexModel([("filename", ASCENDING), ("uploadDate", ASCENDING)], name="filename_1_uploadDate_1"),
+        IndexModel(
+            [("metadata.employee_id", ASCENDING), ("metadata.type", ASCENDING)],
+            name="metadata.employee_id_1_metadata.type_1",
+            sparse=True
+        ),
+    ],
+    "fs.chunks": [
+        IndexModel([("files_id", ASCENDING), ("n", ASCENDING)], name="files_id_1_n_1", unique=True),
+    ],
+    "attachments": [
+        # catalog documents are keyed by GridFS file id, so `_id` order is upload order
+        IndexModel([("task_id", ASCENDING), ("_id", DESCENDING)], name="task_id_1__id_-1"),
+        IndexModel([("employee_id", ASCENDING), ("_id", DESCENDING)], name="employee_id_1__id_-1"),
+        IndexModel([("remark_id", ASCENDING)], name="remark_id_1", sparse=True),
+        IndexModel([("sha256", ASCENDING)], name="sha256_1"),
+    ],
+    "avatars": [
+        # makes the atomic avatar swap reject a stale upload instead of duplicating
+        IndexModel([("e_id", ASCENDING)], name="e_id_1", unique=True),
+    ],
+    "errors": [
+        # documents are keyed by fingerprint; recent and noisiest errors first
+        IndexModel([("last_seen", DESCENDING)], name="last_seen_-1"),
+        IndexModel([("route", ASCENDING), ("count", DESCENDING)], name="route_1_count_-1"),
+    ],
+}
+
+
+def ensure_audit_collection():
+    """
+    Create the audit time-series collection and keep its retention in sync
+    with AUDIT_RETENTION_DAYS.
+
+    Must run before the first log_action, otherwise the insert would create the
+    collection as a regular one.
+    """
+    name = settings.AUDIT_COLLECTION
+    expire_after = settings.AUDIT_RETENTION_DAYS * 86400 or None
+
+    try:
+        options = {
+            "timeseries": {"timeField": "timestamp", "metaField": "meta", "granularity": "seconds"}
+        }
+        if expire_after:
+            options["expireAfterSeconds"] = expire_after
+        mongo_db.create_collection(name, **options)
+        logger.info("Created time-series collection %s", name)
+    except CollectionInvalid:
+        # Already exists: only the retention can change on a time-series collection
+        try:
+            mongo_db.command("collMod", name, expireAfterSeconds=expire_after or "off")
+        except PyMongoError as e:
+            logger.error("MongoDB error updating retention of %s: %s", name, e)
+    except PyMongoError as e:
+        logger.error("MongoDB error creating %s: %s", name, e)
+
+
+def apply_indexes(collections: list[str] | None = None) -> dict:
+    """
+    Create every registered index that does not exist yet.
+
+    Creating an index that already exists with the same spec is a no-op, so this
+    is safe to call on every startup. An index whose name is taken by a
+    different spec is reported rather than dropped.
+
+    Returns:
+        {"created": [...], "existing": [...], "failed": [{"index", "error"}]}
+    """
+    report = {"created": [], "existing": [], "failed": []}
+
+    for name, models in INDEX_REGISTRY.items():
+        if collections and name not in collections:
+            continue
+
+        collection = mongo_db[name]
+        try:
+            existing = set(collection.index_information())
+        except PyMongoError:
+            existing = set()
+
+        for model in models:
+            index_name = f"{name}.{model.document['name']}"
+            try:
+                # Still issued for existing names so a changed spec is reported
+                collection.create_indexes([model])
+                if model.document["name"] in existing:
+                    report["existing"].append(index_name)
+                else:
+                    report["created"].append(index_name)
+                    logger.info("Created index %s", index_name)
+            except (OperationFailure, PyMongoError) as e:
+                report["failed"].append({"index": index_name, "error": str(e)})
+                logger.error("MongoDB error creating index %s: %s", index_name, e)
+
+    return report
+
+
+# indexes that correctness depends on, not just speed: built before the API
+# serves requests, whatever MONGO_ENSURE_INDEXES_ON_STARTUP says
+REQUIRED_INDEX_COLLECTIONS = ["avatars"]
+
+
+def apply_required_indexes() -> dict:
+    """Synchronously apply the registry for REQUIRED_INDEX_COLLECTIONS (small collections)."""
+    return apply_indexes(REQUIRED_INDEX_COLLECTIONS)
+
+
+def apply_indexes_in_background():
+    """Apply the registry on a daemon thread so long builds do not delay startup."""
+    thread = threading.Thread(target=apply_indexes, name="mongo-index-bootstrap", daemon=True)
+    thread.start()
+    return thread
+
+
+def index_build_progress() -> list[dict]:
+    """
+    List index builds currently running on the server with their progress.
+
+    Requires the inprog / $currentOp privilege; returns an empty list without it.
+    """
+    try:
+        ops = mongo_db.client.admin.aggregate([
+            {"$currentOp": {"allUsers": True}},
+            {"$match": {"$or": [
+                {"command.createIndexes": {"$exists": True}},
+                {"msg": {"$regex": "^Index Build"}}
+            ]}}
+        ])
+    except PyMongoError as e:
+        logger.error("MongoDB error reading index build progress: %s", e)
+        return []
+
+    builds = []
+    for op in ops:
+        progress = op.get("progress") or {}
+        done, total = progress.get("done"), progress.get("total")
+        builds.append({
+            "namespace": op.get("ns"),
+            "indexes": [i.get("name") for i in op.get("command", {}).get("indexes", [])],
+            "message": op.get("msg"),
+            "done": done,
+            "total": total,
+            "percent": round(100 * done / total, 1) if done is not None and total else None,
+            "running_secs": op.get("secs_running")
+        })
+    return builds
+
+
+def index_report() -> dict:
+    """
+    Compare live indexes with the registry.
+
+    - missing: registered but not present
+    - unregistered: present but not in the registry (excluding `_id_`)
+    - unused: present with zero recorded accesses since the server last started
+    """
+    report = {"missing": [], "unregistered": [], "unused": []}
+
+    for name, models in INDEX_REGISTRY.items():
+        collection = mongo_db[name]
+        registered = {m.document["name"] for m in models}
+        try:
+            live = set(collection.index_information())
+            stats = list(collection.aggregate([{"$indexStats": {}}]))
+        except PyMongoError as e:
+            logger.error("MongoDB error inspecting indexes on %s: %s", name, e)
+            continue
+
+        report["missing"] += [f"{name}.{i}" for i in sorted(registered - live)]
+        report["unregistered"] += [f"{name}.{i}" for i in sorted(live - registered - {"_id_"})]
+        report["unused"] += [
+            f"{name}.{s['name']}"
+            for s in stats
+            if s["name"] != "_id_" and s.get("accesses", {}).get("ops", 0) == 0
+        ]
+
+    return report
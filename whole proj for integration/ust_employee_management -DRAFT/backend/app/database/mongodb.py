@@ -10,7 +10,12 @@ mongo_db = client[settings.MONGO_DB]
 
 # Collections
 remarks_collection = mongo_db["remarks"]
-logs_collection = mongo_db["logs"]
+# Audit trail written by log_action (a time-series collection, see mongo_indexes)
+logs_collection = mongo_db[settings.AUDIT_COLLECTION]
+avatars_collection = mongo_db["avatars"]
+attachments_collection = mongo_db["attachments"]
+# Aggregated unhandled exceptions, one document per fingerprint
+errors_collection = mongo_db["errors"]
 
 # GridFS for file upload / download
 fs = GridFS(mongo_db)
@@ -4,13 +4,17 @@ from app.core.config import settings
 
 engine = create_engine(
     settings.MYSQL_URL,
-    echo=True,           # shows SQL logs
+    # SQL logging goes through the app's log pipeline: set
+    # LOG_LEVELS={"sqlalchemy.engine": "INFO"} to see statements
     pool_pre_ping=True
 )
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    # write paths return the objects they just saved; keep their state after
+    # commit instead of reloading it with a SELECT
+    expire_on_commit=False,
     bind=engine
 )
 from sqlalchemy.orm import Session
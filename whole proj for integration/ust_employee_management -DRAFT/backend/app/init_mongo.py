@@ -1,25 +1,61 @@
+import argparse
 from datetime import datetime
+from app.core.logging_config import configure_logging
 from app.database.mongodb import mongo_db
+from app.middleware.logger import log_action
+from app.database.mongo_indexes import (
+    apply_indexes_in_background,
+    ensure_audit_collection,
+    index_build_progress,
+    index_report,
+)
 
 def init_mongo():
+    ensure_audit_collection()
+
     # Insert a dummy remark
     mongo_db.remarks.insert_one({
         "task_id": 0,
         "comment": "MongoDB initialization",
-        "commented_by": 0,
+        "e_id": 0,
         "created_at": datetime.utcnow()
     })
 
     # Insert a dummy log
-    mongo_db.logs.insert_one({
-        "action": "INIT",
-        "entity_type": "SYSTEM",
-        "entity_id": 0,
-        "performed_by": 0,
-        "timestamp": datetime.utcnow()
-    })
+    log_action("INIT", "SYSTEM", 0, 0)
 
     print("✅ MongoDB database and collections created")
 
+
+def ensure_indexes(poll_seconds: float = 2.0):
+    """Apply the index registry, printing build progress until it finishes."""
+    ensure_audit_collection()
+    worker = apply_indexes_in_background()
+    while worker.is_alive():
+        worker.join(poll_seconds)
+        for build in index_build_progress():
+            percent = f"{build['percent']}%" if build["percent"] is not None else "starting"
+            print(f"  building {build['namespace']} {build['indexes'] or ''}: {percent}")
+
+    print("✅ MongoDB indexes in place")
+
+
+def print_index_report():
+    report = index_report()
+    for key in ("missing", "unregistered", "unused"):
+        print(f"{key}: {', '.join(report[key]) or 'none'}")
+
+
 if __name__ == "__main__":
-    init_mongo()
+    parser = argparse.ArgumentParser(description="Initialise MongoDB collections and indexes")
+    parser.add_argument("--indexes-only", action="store_true", help="skip the dummy documents")
+    parser.add_argument("--report", action="store_true", help="only report missing/unused indexes")
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.report:
+        print_index_report()
+    else:
+        if not args.indexes_only:
+            init_mongo()
+        ensure_indexes()
@@ -1,4 +1,6 @@
-from fastapi import FastAPI
+import uuid
+
+from fastapi import FastAPI, Request
 from fastapi.security import HTTPBearer
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
@@ -9,8 +11,20 @@ from app.api.users import router as users_router
 from app.api.tasks import router as tasks_router
 from app.api.employees import router as employees_router
 from app.api.remarks import router as remarks_router
+from app.api.audit import router as audit_router
+from app.api.exports import router as exports_router
 from app.api import files
 from app.middleware.error_handler import global_exception_handler
+from app.database.mongo_indexes import apply_indexes_in_background, apply_required_indexes, ensure_audit_collection
+from app.core.config import settings
+from app.core.logging_config import configure_logging, bind_request, shutdown_logging
+from app.middleware.logger import audit_counters
+from app.middleware.error_aggregator import error_aggregator
+from app.services.outbox import outbox_relay, ensure_outbox_table
+from app.services.org_hierarchy import ensure_closure_table
+from app.utils.password import shutdown_hash_pool
+
+configure_logging()
 
 
 app = FastAPI(
@@ -40,6 +54,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def request_context_middleware(request: Request, call_next):
+    """Tag every log record of this request with its id (echoed back as X-Request-ID)."""
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    bind_request(request_id)
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
 # Global exception handler for unhandled errors
 app.add_exception_handler(Exception, global_exception_handler)
 
@@ -58,9 +83,34 @@ app.include_router(users_router, prefix="/api", tags=["Users"])
 app.include_router(employees_router, prefix="/api", tags=["Employees"])
 app.include_router(tasks_router, prefix="/api", tags=["Tasks"])
 app.include_router(remarks_router, prefix="/api", tags=["Remarks"])
+app.include_router(audit_router, prefix="/api", tags=["Audit"])
+app.include_router(exports_router, prefix="/api", tags=["Export"])
 app.include_router(files.router)
 
 
+@app.on_event("startup")
+def ensure_mongo_indexes():
+    ensure_audit_collection()
+    # the avatar swap relies on its unique index to reject a stale upload
+    apply_required_indexes()
+    # Other index builds run off the startup path; see app/init_mongo.py for reports
+    if settings.MONGO_ENSURE_INDEXES_ON_STARTUP:
+        apply_indexes_in_background()
+    ensure_outbox_table()
+    ensure_closure_table()
+    if settings.OUTBOX_RELAY_ENABLED:
+        outbox_relay.start()
+
+
+@app.on_event("shutdown")
+def flush_buffered_events():
+    outbox_relay.stop()
+    shutdown_hash_pool()
+    audit_counters.flush()
+    error_aggregator.flush(drain=True)
+    shutdown_logging()
+
+
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
@@ -2,6 +2,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 from app.core.security import decode_token
+from app.core.logging_config import bind_user
 from app.database.mysql import get_db
 from app.models.user import User
 
@@ -23,6 +24,7 @@ def role_required(allowed_roles: list):
                 detail="Access denied"
             )
 
+        bind_user(payload.get("e_id"))
         return payload
 
     return wrapper
@@ -50,4 +52,5 @@ def get_current_user(
             detail="User not found"
         )
 
+    bind_user(user.e_id)
     return user
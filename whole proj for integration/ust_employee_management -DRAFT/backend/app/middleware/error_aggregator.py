@@ -0,0 +1,159 @@
+# Error Aggregation
+# Unhandled exceptions are fingerprinted by exception type, route and stack,
+# counted in memory and flushed periodically to the `errors` collection as one
+# upsert per fingerprint, with a few sample tracebacks. Recording never touches
+# the database, and flushes are capped at ERROR_MAX_WRITES_PER_SECOND, so a
+# burst of failures (e.g. during a database outage) cannot become a write storm.
+
+import hashlib
+import logging
+import os
+import threading
+import time
+import traceback
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.database.mongodb import errors_collection
+
+logger = logging.getLogger(__name__)
+
+MAX_SAMPLE_CHARS = 8000
+OVERFLOW_FINGERPRINT = "overflow"
+
+
+def fingerprint_error(exc: Exception, route: str) -> str:
+    """
+    Stable id for "the same error": exception type, route template and the
+    file/function of every frame. Line numbers are left out so the grouping
+    survives unrelated edits.
+    """
+    frames = traceback.extract_tb(exc.__traceback__)
+    stack = "|".join(f"{os.path.basename(f.filename)}:{f.name}" for f in frames)
+    key = f"{type(exc).__module__}.{type(exc).__qualname__}|{route}|{stack}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+class ErrorAggregator:
+    """
+    In-memory error counters with a rate-limited background flush.
+
+    Args:
+        flush_seconds (int): Interval between flushes
+        max_writes_per_second (int): Ceiling on fingerprints written per second
+        max_fingerprints (int): Distinct fingerprints held before new ones are
+            folded into a single overflow entry
+        samples_per_fingerprint (int): Tracebacks kept per fingerprint
+    """
+
+    def __init__(self, flush_seconds: int, max_writes_per_second: int, max_fingerprints: int, samples_per_fingerprint: int):
+        self.flush_seconds = flush_seconds
+        self.max_writes_per_second = max_writes_per_second
+        self.max_fingerprints = max_fingerprints
+        self.samples_per_fingerprint = samples_per_fingerprint
+        self._pending: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._flusher: threading.Thread | None = None
+        self._last_flush = time.monotonic()
+
+    def record(self, exc: Exception, route: str, method: str):
+        fingerprint = fingerprint_error(exc, route)
+        now = datetime.now(timezone.utc)
+
+        with self._lock:
+            entry = self._pending.get(fingerprint)
+            if entry is None and len(self._pending) >= self.max_fingerprints:
+                fingerprint = OVERFLOW_FINGERPRINT
+                entry = self._pending.get(fingerprint)
+
+            if entry is None:
+                entry = self._pending[fingerprint] = {
+                    "exc_type": type(exc).__qualname__,
+                    "route": route if fingerprint != OVERFLOW_FINGERPRINT else None,
+                    "method": method,
+                    "message": str(exc)[:500],
+                    "count": 0,
+                    "first_seen": now,
+                    "samples": []
+                }
+            entry["count"] += 1
+            entry["last_seen"] = now
+            if len(entry["samples"]) < self.samples_per_fingerprint:
+                sample = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+                entry["samples"].append(sample[-MAX_SAMPLE_CHARS:])
+
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run, name="error-aggregator-flush", daemon=True)
+                self._flusher.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def flush(self, drain: bool = False):
+        """
+        Write pending fingerprints, most frequent first, within the rate budget.
+        Whatever does not fit stays pending for the next flush; `drain` (used on
+        shutdown) writes everything.
+        """
+        now = time.monotonic()
+        elapsed = min(now - self._last_flush, self.flush_seconds)
+        self._last_flush = now
+        budget = None if drain else max(1, int(self.max_writes_per_second * elapsed))
+
+        with self._lock:
+            ordered = sorted(self._pending.items(), key=lambda item: item[1]["count"], reverse=True)
+            batch = dict(ordered[:budget])
+            for fingerprint in batch:
+                del self._pending[fingerprint]
+        if not batch:
+            return
+
+        ops = [
+            UpdateOne(
+                {"_id": fingerprint},
+                {
+                    "$inc": {"count": entry["count"]},
+                    "$min": {"first_seen": entry["first_seen"]},
+                    "$max": {"last_seen": entry["last_seen"]},
+                    "$set": {
+                        "exc_type": entry["exc_type"],
+                        "route": entry["route"],
+                        "method": entry["method"],
+                        "message": entry["message"]
+                    },
+                    "$push": {"samples": {
+                        "$each": entry["samples"],
+                        "$slice": -self.samples_per_fingerprint
+                    }}
+                },
+                upsert=True
+            )
+            for fingerprint, entry in batch.items()
+        ]
+
+        try:
+            errors_collection.bulk_write(ops, ordered=False)
+        except PyMongoError as e:
+            # Database is likely what is failing; keep the counts for next time
+            logger.error("MongoDB error flushing error aggregates: %s", e)
+            with self._lock:
+                for fingerprint, entry in batch.items():
+                    current = self._pending.get(fingerprint)
+                    if current is None:
+                        self._pending[fingerprint] = entry
+                    else:
+                        current["count"] += entry["count"]
+                        current["first_seen"] = min(current["first_seen"], entry["first_seen"])
+
+
+error_aggregator = ErrorAggregator(
+    flush_seconds=settings.ERROR_FLUSH_SECONDS,
+    max_writes_per_second=settings.ERROR_MAX_WRITES_PER_SECOND,
+    max_fingerprints=settings.ERROR_MAX_FINGERPRINTS,
+    samples_per_fingerprint=settings.ERROR_SAMPLES_PER_FINGERPRINT
+)
@@ -6,7 +6,15 @@ from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 from pymongo.errors import PyMongoError
-from app.middleware.logger import log_action
+from app.middleware.error_aggregator import error_aggregator
+
+
+def _record_error(request: Request, exc: Exception):
+    """Count the error under its fingerprint; written to MongoDB in batches."""
+    route = request.scope.get("route")
+    path = getattr(route, "path", None) or request.url.path
+    error_aggregator.record(exc, path, request.method)
+
 
 async def global_exception_handler(request: Request, exc: Exception):
     """
@@ -25,6 +33,10 @@ async def global_exception_handler(request: Request, exc: Exception):
 
     Returns:
         JSONResponse with appropriate error details
+
+    Server errors are fingerprinted and aggregated (see error_aggregator)
+    instead of being written one by one, so an outage that fails every request
+    does not also flood MongoDB.
     """
     if isinstance(exc, HTTPException):
         # Handle HTTP exceptions with their specific status codes
@@ -34,14 +46,14 @@ async def global_exception_handler(request: Request, exc: Exception):
         )
     elif isinstance(exc, SQLAlchemyError):
         # Handle database errors - log and return generic message
-        log_action("DATABASE_ERROR", "SYSTEM", 0, 0)  # Log error
+        _record_error(request, exc)
         return JSONResponse(
             status_code=500,
             content={"detail": "Database error occurred"}
         )
     elif isinstance(exc, PyMongoError):
         # Handle MongoDB errors - log and return generic message
-        log_action("MONGODB_ERROR", "SYSTEM", 0, 0)
+        _record_error(request, exc)
         return JSONResponse(
             status_code=500,
             content={"detail": "Database error occurred"}
@@ -54,7 +66,7 @@ async def global_exception_handler(request: Request, exc: Exception):
         )
     else:
         # Handle unexpected errors - log and return generic message
-        log_action("UNEXPECTED_ERROR", "SYSTEM", 0, 0)
+        _record_error(request, exc)
         return JSONResponse(
             status_code=500,
             content={"detail": "Internal server error"}
@@ -1,5 +1,6 @@
 from fastapi import Header, HTTPException, status
 from app.core.security import decode_access_token
+from app.core.logging_config import bind_user
 from app.database.mysql import SessionLocal
 from app.models.user import User
 
@@ -32,6 +33,7 @@ def jwt_required(authorization: str = Header(...)):
             detail="User not found"
         )
 
+    bind_user(user.e_id)
     return {
         "e_id": user.e_id,
         "role": user.role.value
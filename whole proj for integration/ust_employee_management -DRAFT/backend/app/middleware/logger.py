@@ -1,11 +1,104 @@
 # Logging Middleware
 # This module handles all application logging to MongoDB
 # It provides a centralized way to log user actions and system events
+#
+# Each action is written according to an audit policy:
+# - always:    one document per event (default for mutations)
+# - sample:    one document for a random fraction of events, tagged with the rate
+# - aggregate: counted in memory and flushed as one document per minute,
+#              user and action (default for reads)
+# - off:       not recorded
 
+import logging
+import random
+import threading
+import time
+import atexit
 from datetime import datetime, timezone
+from app.core.config import settings
 from app.database.mongodb import logs_collection
 from pymongo.errors import PyMongoError
 
+logger = logging.getLogger(__name__)
+
+# Actions with these prefixes only read data
+READ_ACTION_PREFIXES = ("GET_", "LIST_", "DOWNLOAD_")
+
+POLICIES = ("always", "sample", "aggregate", "off")
+
+
+def resolve_policy(action: str) -> tuple[str, float]:
+    """
+    Return (policy, sample rate) for an action.
+
+    Per-action overrides in AUDIT_ACTION_POLICIES win ("sample:0.2" sets the
+    rate inline); otherwise reads use AUDIT_READ_POLICY and everything else is
+    always logged.
+    """
+    policy = settings.AUDIT_ACTION_POLICIES.get(action)
+    if policy is None:
+        policy = settings.AUDIT_READ_POLICY if action.startswith(READ_ACTION_PREFIXES) else "always"
+
+    rate = settings.AUDIT_READ_SAMPLE_RATE
+    if policy.startswith("sample:"):
+        policy, rate = "sample", float(policy.split(":", 1)[1])
+
+    if policy not in POLICIES:
+        policy = "always"
+    return policy, rate
+
+
+class AuditCounters:
+    """Per-minute read counters, flushed to the audit collection in batches."""
+
+    def __init__(self, flush_seconds: int):
+        self.flush_seconds = flush_seconds
+        self._counts: dict[tuple, int] = {}
+        self._lock = threading.Lock()
+        self._flusher: threading.Thread | None = None
+
+    def add(self, action: str, entity_type: str, performed_by: int):
+        minute = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        key = (minute, performed_by, entity_type, action)
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run, name="audit-counter-flush", daemon=True)
+                self._flusher.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if not counts:
+            return
+
+        docs = [{
+            "timestamp": minute,
+            "meta": {
+                "performed_by": performed_by,
+                "entity_type": entity_type,
+                "entity_id": 0
+            },
+            "action": action,
+            "count": count,
+            "aggregated": True
+        } for (minute, performed_by, entity_type, action), count in counts.items()]
+
+        try:
+            logs_collection.insert_many(docs, ordered=False)
+        except PyMongoError as e:
+            logger.error("MongoDB error flushing audit counters: %s", e)
+
+
+audit_counters = AuditCounters(settings.AUDIT_AGGREGATE_FLUSH_SECONDS)
+atexit.register(audit_counters.flush)
+
+
 def log_action(
     action: str,
     entity_type: str,
@@ -25,12 +118,17 @@ def log_action(
         performed_by (int): The employee ID of the user who performed the action (0 for system)
 
     The log entry includes:
-    - Timestamp in UTC
+    - Timestamp in UTC (the time field of the time-series collection)
     - Action details
-    - Entity information
-    - User who performed the action
+    - Entity information and the user who performed the action, grouped under
+      `meta` so MongoDB buckets events per user and entity
 
-    Errors in logging are printed to console but don't interrupt the main flow.
+    Reads are sampled or aggregated according to the audit policy (see
+    resolve_policy); sampled entries carry `sample_rate` and aggregated ones
+    a `count`.
+
+    Errors in logging are reported through the application logger but don't
+    interrupt the main flow.
     """
     try:
         # Validate inputs to ensure data integrity
@@ -43,29 +141,42 @@ def log_action(
         if not isinstance(performed_by, int):
             raise ValueError("Performed by must be an integer")
 
+        policy, rate = resolve_policy(action)
+        if policy == "off":
+            return
+        if policy == "aggregate":
+            audit_counters.add(action, entity_type, performed_by)
+            return
+        if policy == "sample" and random.random() >= rate:
+            return
+
         # Create log entry with timestamp
         log_entry = {
-            "action": action,
-            "entity_type": entity_type,
-            "entity_id": entity_id,
-            "performed_by": performed_by,
-            "timestamp": datetime.now(timezone.utc)
+            "timestamp": datetime.now(timezone.utc),
+            "meta": {
+                "performed_by": performed_by,
+                "entity_type": entity_type,
+                "entity_id": entity_id
+            },
+            "action": action
         }
+        if policy == "sample":
+            log_entry["sample_rate"] = rate
 
         # Insert into MongoDB logs collection
         logs_collection.insert_one(log_entry)
 
     except ValueError as e:
         # Handle validation errors (wrong data types)
-        print(f"Error in log_action: {e}")
+        logger.warning("Error in log_action: %s", e)
         # Could also log to a file or send to error monitoring system
 
     except PyMongoError as e:
         # Handle MongoDB connection or insertion errors
-        print(f"MongoDB error in log_action: {e}")
+        logger.error("MongoDB error in log_action: %s", e)
         # Log the error or send alert as needed
 
     except Exception as e:
         # Catch any unexpected errors
-        print(f"Unexpected error in log_action: {e}")
+        logger.exception("Unexpected error in log_action: %s", e)
         # Log the error as needed
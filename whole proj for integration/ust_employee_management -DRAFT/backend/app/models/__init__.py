@@ -3,3 +3,5 @@
 from app.models.employee import Employee
 from app.models.user import User
 from app.models.task import Task
+from app.models.outbox import OutboxEvent
+from app.models.employee_closure import EmployeeClosure
@@ -20,6 +20,7 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from datetime import datetime
 from app.database.base import Base
 
 
@@ -40,5 +41,6 @@ class Employee(Base):
     # (Optional but good practice)
     manager = relationship("Employee", remote_side=[e_id])
 
-    created_at = Column(DateTime, server_default=func.now())
+    # set in Python too, so a new employee is complete without reading it back
+    created_at = Column(DateTime, server_default=func.now(), default=datetime.utcnow)
     updated_at = Column(DateTime, onupdate=func.now())
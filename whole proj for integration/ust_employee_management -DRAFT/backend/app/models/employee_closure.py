@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from app.database.base import Base
+
+
+class EmployeeClosure(Base):
+    """
+    Transitive closure of the reporting hierarchy (Employee.mgr_id): one row
+    per (ancestor, descendant) pair, including each employee with itself at
+    depth 0. Maintained by app/services/org_hierarchy.py.
+    """
+    __tablename__ = "employee_closure"
+
+    # primary key order serves subtree scans and "is X under Y" checks
+    ancestor_id = Column(Integer, ForeignKey("employees.e_id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("employees.e_id", ondelete="CASCADE"), primary_key=True)
+    # 1 = direct report
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # management chain and depth of one employee
+        Index("ix_employee_closure_descendant_depth", "descendant_id", "depth"),
+    )
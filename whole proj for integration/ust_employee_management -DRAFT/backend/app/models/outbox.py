@@ -0,0 +1,32 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Text, DateTime, JSON, Index
+from datetime import datetime
+from app.database.base import Base
+
+
+class OutboxEvent(Base):
+    """
+    Side effect for another store (MongoDB), written in the same MySQL
+    transaction as the change that caused it and delivered later by the
+    outbox relay (app/services/outbox.py).
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    # subscriber key, e.g. "audit_log" or "remark"
+    event_type = Column(String(50), nullable=False)
+    # lets subscribers drop a redelivered event
+    idempotency_key = Column(String(64), nullable=False, unique=True)
+    payload = Column(JSON, nullable=False)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    delivered_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # the relay's "pending and due" scan
+        Index("ix_outbox_pending", "delivered_at", "available_at", "id"),
+    )
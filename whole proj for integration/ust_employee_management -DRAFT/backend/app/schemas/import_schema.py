@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class ImportRowError(BaseModel):
+    # 1-based position of the record in the file (header not counted)
+    row: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    total: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+    # more rows failed than IMPORT_MAX_REPORTED_ERRORS lists
+    errors_truncated: bool
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 class RemarkCreate(BaseModel):
     task_id: int
@@ -9,8 +9,13 @@ class RemarkCreate(BaseModel):
 class RemarkResponse(BaseModel):
     task_id: int
     comment: str
-    commented_by: int
+    e_id: int
     created_at: datetime
     
 class RemarkUpdateSchema(BaseModel):
-    comment: Optional[str] = None
\ No newline at end of file
+    comment: Optional[str] = None
+
+
+class RemarkSummaryRequest(BaseModel):
+    # one board page of tasks per request
+    task_ids: List[int] = Field(..., min_length=1, max_length=200)
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
+from app.core.config import settings
 from app.core.constants import TaskStatus, Priority
 
 
@@ -17,6 +18,11 @@ class TaskCreate(BaseModel):
     created_by: Optional[int] = None
 
 
+class TaskImportRow(TaskCreate):
+    # matches tasks.title, so a long title is a row error rather than a database error
+    title: str = Field(max_length=150)
+
+
 # =========================
 # ASSIGN TASK (ADMIN / MANAGER)
 # =========================
@@ -71,3 +77,41 @@ class TaskResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# =========================
+# BULK OPERATIONS
+# =========================
+class BulkTaskCreateRequest(BaseModel):
+    items: List[TaskCreate] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+class BulkAssignItem(AssignTaskSchema):
+    t_id: int
+
+
+class BulkAssignRequest(BaseModel):
+    items: List[BulkAssignItem] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+class BulkStatusItem(UpdateTaskStatusSchema):
+    t_id: int
+
+
+class BulkStatusRequest(BaseModel):
+    items: List[BulkStatusItem] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    # position of the item in the request
+    index: int
+    t_id: Optional[int] = None
+    ok: bool
+    status_code: int
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
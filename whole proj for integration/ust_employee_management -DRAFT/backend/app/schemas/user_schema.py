@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
+from app.core.config import settings
 from app.models.user import UserRole, UserStatus
 
 # -------------------------
@@ -16,7 +17,7 @@ class LoginRequest(BaseModel):
 class UserCreate(BaseModel):
     e_id: int
     role: UserRole
-    password: Optional[str] = None  # Optional - defaults to "welcome123" if not provided
+    password: Optional[str] = None  # Optional - defaults to DEFAULT_USER_PASSWORD ("welcome123") if not provided
 
 # =========================
 # USER UPDATE (ADMIN)
@@ -64,3 +65,25 @@ class AuthResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     is_first_login: bool
+
+
+# =========================
+# BULK PROVISIONING
+# =========================
+class BulkUserCreateRequest(BaseModel):
+    items: List[UserCreate] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+
+class BulkUserResult(BaseModel):
+    # position of the item in the request
+    index: int
+    e_id: int
+    ok: bool
+    status_code: int
+    error: Optional[str] = None
+
+
+class BulkUserResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkUserResult]
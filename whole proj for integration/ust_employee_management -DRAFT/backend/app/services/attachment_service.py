@@ -0,0 +1,10 @@
+from app.database.mongodb import attachments_collection
+from app.utils.pagination import paginate_by_id
+
+
+def list_task_attachments(task_id: int, cursor: str | None, limit: int) -> dict:
+    return paginate_by_id(attachments_collection, {"task_id": task_id}, cursor, limit)
+
+
+def list_employee_attachments(e_id: int, cursor: str | None, limit: int) -> dict:
+    return paginate_by_id(attachments_collection, {"employee_id": e_id}, cursor, limit)
@@ -0,0 +1,283 @@
+# Audit Log Cold Storage
+# Moves audit events older than AUDIT_HOT_DAYS out of MongoDB into one
+# gzip-compressed NDJSON segment per UTC day, and reads them back for the
+# audit query API.
+#
+# Each segment holds one gzip member per user (records newest first), so a
+# query for one user seeks straight to that member. A JSON sidecar next to the
+# segment records the day's min/max timestamp and each user's byte offset,
+# length and count, which lets queries skip whole segments by time range.
+
+import gzip
+import heapq
+import json
+import os
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.database.mongodb import logs_collection
+
+# fixed-width so archived timestamps compare correctly as strings
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+SEGMENT_SUFFIX = ".ndjson.gz"
+SIDECAR_SUFFIX = ".idx.json"
+READ_BLOCK = 64 * 1024
+
+
+def _segment_paths(day: datetime) -> tuple[str, str]:
+    base = os.path.join(settings.AUDIT_ARCHIVE_DIR, f"audit-{day:%Y-%m-%d}")
+    return base + SEGMENT_SUFFIX, base + SIDECAR_SUFFIX
+
+
+def _to_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def format_timestamp(value: datetime) -> str:
+    return _to_utc(value).strftime(TIMESTAMP_FORMAT)
+
+
+def parse_timestamp(value: str) -> datetime:
+    return datetime.strptime(value, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def _record(doc: dict) -> dict:
+    meta = doc.get("meta") or {}
+    return {
+        "id": str(doc["_id"]),
+        "action": doc.get("action"),
+        "entity_type": meta.get("entity_type"),
+        "entity_id": meta.get("entity_id"),
+        "performed_by": meta.get("performed_by"),
+        "timestamp": format_timestamp(doc["timestamp"]),
+        "count": doc.get("count", 1),
+        "sample_rate": doc.get("sample_rate")
+    }
+
+
+def _sort_key(record: dict) -> tuple:
+    return (record["timestamp"], record["id"])
+
+
+def _user_key(performed_by) -> str:
+    return "null" if performed_by is None else str(performed_by)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def _iter_member(f, offset: int, length: int):
+    """
+    Decompress one gzip member from an open segment and yield its records.
+    Members of one segment share the file, so every read seeks first.
+    """
+    decompressor = zlib.decompressobj(wbits=31)
+    pending = b""
+    position, end = offset, offset + length
+
+    while position < end:
+        f.seek(position)
+        block = f.read(min(READ_BLOCK, end - position))
+        if not block:
+            break
+        position += len(block)
+        pending += decompressor.decompress(block)
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line:
+                yield json.loads(line)
+
+    pending += decompressor.flush()
+    for line in pending.split(b"\n"):
+        if line:
+            yield json.loads(line)
+
+
+def read_sidecar(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_segments() -> list[dict]:
+    """Sidecars of all archived days, newest day first."""
+    if not os.path.isdir(settings.AUDIT_ARCHIVE_DIR):
+        return []
+    sidecars = sorted(
+        (name for name in os.listdir(settings.AUDIT_ARCHIVE_DIR) if name.endswith(SIDECAR_SUFFIX)),
+        reverse=True
+    )
+    return [read_sidecar(os.path.join(settings.AUDIT_ARCHIVE_DIR, name)) for name in sidecars]
+
+
+def _iter_segment(sidecar: dict, performed_by: int | None):
+    """Records of one archived day, newest first, optionally for a single user."""
+    segment_path, _ = _segment_paths(datetime.fromisoformat(sidecar["date"]))
+    users = sidecar["users"]
+    if performed_by is not None:
+        members = [users[str(performed_by)]] if str(performed_by) in users else []
+    else:
+        members = list(users.values())
+    if not members:
+        return
+
+    with open(segment_path, "rb") as f:
+        streams = [_iter_member(f, m["offset"], m["length"]) for m in members]
+        yield from heapq.merge(*streams, key=_sort_key, reverse=True)
+
+
+def _matches(record: dict, params: dict) -> bool:
+    for field in ("performed_by", "entity_type", "entity_id", "action"):
+        if params.get(field) is not None and record[field] != params[field]:
+            return False
+    return True
+
+
+def iter_archived(params: dict, before: tuple[datetime, str] | None = None):
+    """
+    Stream archived records matching `params`, newest first.
+
+    Args:
+        params: performed_by / entity_type / entity_id / action / start / end
+        before: (timestamp, id) of the last record already returned, if any
+    """
+    start = format_timestamp(params["start"]) if params.get("start") else None
+    end = format_timestamp(params["end"]) if params.get("end") else None
+    before_key = (format_timestamp(before[0]), str(before[1])) if before else None
+
+    for sidecar in list_segments():
+        if start and sidecar["max_timestamp"] < start:
+            # segments are newest first, so nothing older can match either
+            return
+        if end and sidecar["min_timestamp"] >= end:
+            continue
+        if before_key and sidecar["min_timestamp"] > before_key[0]:
+            continue
+
+        for record in _iter_segment(sidecar, params.get("performed_by")):
+            if before_key and _sort_key(record) >= before_key:
+                continue
+            if end and record["timestamp"] >= end:
+                continue
+            if start and record["timestamp"] < start:
+                break
+            if _matches(record, params):
+                yield record
+
+
+# ---------------------------------------------------------------------------
+# Rollover
+# ---------------------------------------------------------------------------
+
+def _write_segment(day: datetime, records_by_user: dict) -> dict:
+    """Write one day's segment and sidecar atomically; returns the sidecar."""
+    segment_path, sidecar_path = _segment_paths(day)
+    os.makedirs(settings.AUDIT_ARCHIVE_DIR, exist_ok=True)
+
+    sidecar = {
+        "date": f"{day:%Y-%m-%d}",
+        "compression": "gzip",
+        "count": 0,
+        "min_timestamp": None,
+        "max_timestamp": None,
+        "users": {}
+    }
+
+    tmp_path = segment_path + ".tmp"
+    with open(tmp_path, "wb") as raw:
+        for user, records in records_by_user.items():
+            records.sort(key=_sort_key, reverse=True)
+            offset = raw.tell()
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as member:
+                for record in records:
+                    member.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+            sidecar["users"][user] = {
+                "offset": offset,
+                "length": raw.tell() - offset,
+                "count": len(records),
+                "min_timestamp": records[-1]["timestamp"],
+                "max_timestamp": records[0]["timestamp"]
+            }
+            sidecar["count"] += len(records)
+        raw.flush()
+        os.fsync(raw.fileno())
+
+    if sidecar["users"]:
+        sidecar["min_timestamp"] = min(u["min_timestamp"] for u in sidecar["users"].values())
+        sidecar["max_timestamp"] = max(u["max_timestamp"] for u in sidecar["users"].values())
+
+    os.replace(tmp_path, segment_path)
+    with open(sidecar_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(sidecar, f)
+    os.replace(sidecar_path + ".tmp", sidecar_path)
+    return sidecar
+
+
+def rollover_day(day: datetime) -> int:
+    """
+    Archive all live audit events of one UTC day, then delete them from MongoDB.
+
+    If the day was partially archived before (e.g. a crash between writing and
+    deleting), the existing segment is merged with what is still live. Deleting
+    by time range on a time-series collection needs MongoDB 7.0+.
+
+    Returns:
+        Number of live events moved
+    """
+    day_start = day.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
+    day_end = day_start + timedelta(days=1)
+    time_range = {"timestamp": {"$gte": day_start, "$lt": day_end}}
+
+    records_by_user: dict[str, list] = {}
+    seen = set()
+
+    segment_path, sidecar_path = _segment_paths(day_start)
+    if os.path.exists(segment_path) and os.path.exists(sidecar_path):
+        for record in _iter_segment(read_sidecar(sidecar_path), None):
+            seen.add(record["id"])
+            records_by_user.setdefault(_user_key(record["performed_by"]), []).append(record)
+
+    # One day is held in memory while its per-user members are written
+    moved = 0
+    cursor = logs_collection.find(time_range).sort([("meta.performed_by", 1), ("timestamp", -1)])
+    for doc in cursor:
+        record = _record(doc)
+        moved += 1
+        if record["id"] in seen:
+            continue
+        records_by_user.setdefault(_user_key(record["performed_by"]), []).append(record)
+
+    if not moved:
+        return 0
+
+    _write_segment(day_start, records_by_user)
+    logs_collection.delete_many(time_range)
+    return moved
+
+
+def rollover(older_than_days: int = settings.AUDIT_HOT_DAYS) -> dict:
+    """
+    Archive every full UTC day older than `older_than_days`.
+
+    Returns:
+        {"YYYY-MM-DD": events moved} for each day that had live events
+    """
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    cutoff = today - timedelta(days=older_than_days)
+
+    oldest = logs_collection.find_one({"timestamp": {"$lt": cutoff}}, sort=[("timestamp", 1)])
+    if not oldest:
+        return {}
+
+    moved = {}
+    day = _to_utc(oldest["timestamp"]).replace(hour=0, minute=0, second=0, microsecond=0)
+    while day < cutoff:
+        count = rollover_day(day)
+        if count:
+            moved[f"{day:%Y-%m-%d}"] = count
+            print(f"Archived {count} audit events for {day:%Y-%m-%d}")
+        day += timedelta(days=1)
+    return moved
@@ -0,0 +1,122 @@
+from datetime import datetime
+
+from fastapi import HTTPException
+
+from app.database.mongodb import logs_collection
+from app.services.audit_archive import iter_archived, parse_timestamp
+from app.utils.pagination import decode_time_cursor, encode_time_cursor, time_cursor_filter
+
+# group_by value -> expression used as the $group key
+SUMMARY_GROUPS = {
+    "action": "$action",
+    "performed_by": "$meta.performed_by",
+    "entity_type": "$meta.entity_type",
+    "hour": {"$dateTrunc": {"date": "$timestamp", "unit": "hour"}},
+    "day": {"$dateTrunc": {"date": "$timestamp", "unit": "day"}},
+}
+
+
+def build_audit_filter(
+    performed_by: int | None = None,
+    entity_type: str | None = None,
+    entity_id: int | None = None,
+    action: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None
+) -> dict:
+    query = {}
+    if performed_by is not None:
+        query["meta.performed_by"] = performed_by
+    if entity_type:
+        query["meta.entity_type"] = entity_type
+    if entity_id is not None:
+        query["meta.entity_id"] = entity_id
+    if action:
+        query["action"] = action
+    if start or end:
+        query["timestamp"] = {}
+        if start:
+            query["timestamp"]["$gte"] = start
+        if end:
+            query["timestamp"]["$lt"] = end
+    return query
+
+
+def serialize_audit(doc: dict) -> dict:
+    meta = doc.get("meta") or {}
+    return {
+        "id": str(doc["_id"]),
+        "action": doc.get("action"),
+        "entity_type": meta.get("entity_type"),
+        "entity_id": meta.get("entity_id"),
+        "performed_by": meta.get("performed_by"),
+        "timestamp": doc.get("timestamp"),
+        # set for aggregated read counters / sampled reads (see audit policy)
+        "count": doc.get("count", 1),
+        "sample_rate": doc.get("sample_rate")
+    }
+
+
+def query_audit_logs(params: dict, cursor: str | None, limit: int, include_archive: bool = False) -> dict:
+    """
+    One page of audit events, newest first, using (timestamp, _id) keyset cursors.
+
+    With `include_archive`, a page that runs out of live events continues into
+    the rolled-over segment files (which only hold older events), so one cursor
+    walks both.
+
+    Returns:
+        {"items": [...], "next_cursor": str | None}
+    """
+    filters = build_audit_filter(**params)
+    after = time_cursor_filter(cursor)
+    query = {"$and": [filters, after]} if after else filters
+
+    docs = logs_collection.find(query).sort([("timestamp", -1), ("_id", -1)]).limit(limit + 1)
+    items = [serialize_audit(d) for d in docs]
+
+    if include_archive and len(items) <= limit:
+        before = (items[-1]["timestamp"], items[-1]["id"]) if items else decode_time_cursor(cursor)
+        for record in iter_archived(params, before):
+            items.append({**record, "timestamp": parse_timestamp(record["timestamp"])})
+            if len(items) > limit:
+                break
+
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    return {
+        "items": items,
+        "next_cursor": encode_time_cursor(items[-1]["timestamp"], items[-1]["id"]) if has_more and items else None
+    }
+
+
+def summarize_audit_logs(params: dict, group_by: str, limit: int) -> list[dict]:
+    """
+    Count matching events per group on the server, largest groups first.
+
+    Aggregated entries contribute their `count` and sampled entries 1/rate, so
+    `count` estimates the true number of events.
+    """
+    if group_by not in SUMMARY_GROUPS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of {', '.join(SUMMARY_GROUPS)}")
+
+    sort = {"_id": 1} if group_by in ("hour", "day") else {"count": -1}
+    pipeline = [
+        {"$match": build_audit_filter(**params)},
+        {"$group": {
+            "_id": SUMMARY_GROUPS[group_by],
+            "count": {"$sum": {"$ifNull": [
+                "$count",
+                {"$divide": [1, {"$ifNull": ["$sample_rate", 1]}]}
+            ]}},
+            "first": {"$min": "$timestamp"},
+            "last": {"$max": "$timestamp"}
+        }},
+        {"$sort": sort},
+        {"$limit": limit}
+    ]
+    return [
+        {"key": row["_id"], "count": round(row["count"]), "first": row["first"], "last": row["last"]}
+        for row in logs_collection.aggregate(pipeline)
+    ]
@@ -1,21 +1,147 @@
-from app.database.mongodb import fs
+import logging
+from io import BytesIO
+from datetime import datetime
+
+from app.database.mongodb import fs, avatars_collection
+from app.core.config import settings
 from fastapi import UploadFile
 from bson import ObjectId
+from PIL import Image, ImageOps
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.utils.file_upload import save_file, delete_file
+from app.utils.gridfs_cache import fetch_file, CachedFile
+
+logger = logging.getLogger(__name__)
+
+# (format, content type) pairs generated for every thumbnail size
+AVATAR_FORMATS = (
+    ("WEBP", "image/webp"),
+    ("JPEG", "image/jpeg"),
+)
+
 
 def save_profile_picture(e_id: int, file: UploadFile) -> str:
-    content = file.file.read()
-
-    file_id = fs.put(
-        content,
-        filename=file.filename,
-        content_type=file.content_type,
-        metadata={
-            "employee_id": e_id,
-            "type": "profile_picture"
-        }
-    )
-    return str(file_id)
-
-
-# def get_profile_picture(file_id: str):
-#     return fs.get(ObjectId(file_id))
+    return save_file(file, {
+        "employee_id": e_id,
+        "type": "profile_picture"
+    })
+
+
+def _render_thumbnail(image: Image.Image, size: int, fmt: str) -> bytes:
+    thumb = ImageOps.fit(image, (size, size), Image.LANCZOS)
+    if fmt == "JPEG" and thumb.mode != "RGB":
+        thumb = thumb.convert("RGB")
+
+    out = BytesIO()
+    if fmt == "JPEG":
+        thumb.save(out, fmt, quality=85, optimize=True, progressive=True)
+    else:
+        thumb.save(out, fmt, quality=80, method=4)
+    return out.getvalue()
+
+
+def _delete_avatar_files(doc: dict):
+    file_ids = [doc.get("original_id")]
+    for variants in doc.get("thumbnails", {}).values():
+        file_ids.extend(variants.values())
+
+    for file_id in file_ids:
+        if file_id:
+            delete_file(file_id)  # also drops it from the file cache
+
+
+def generate_avatar_thumbnails(e_id: int, original_id: str):
+    """
+    Build the thumbnail pyramid for an uploaded profile picture and publish it.
+
+    Runs as a background task after the upload response is sent. Every size in
+    AVATAR_SIZES is stored in each of AVATAR_FORMATS, then the employee's avatar
+    document is switched to the new set in a single update so readers never see
+    a half-built pyramid. The previous version's files are deleted afterwards.
+    An upload that finishes after a newer one is discarded.
+    """
+    thumbnails: dict = {}
+    try:
+        original = fs.get(ObjectId(original_id))
+        image = Image.open(BytesIO(original.read()))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+
+        for size in sorted(set(settings.AVATAR_SIZES)):
+            variants = {}
+            for fmt, content_type in AVATAR_FORMATS:
+                file_id = fs.put(
+                    _render_thumbnail(image, size, fmt),
+                    filename=f"avatar_{e_id}_{size}.{fmt.lower()}",
+                    content_type=content_type,
+                    metadata={
+                        "employee_id": e_id,
+                        "type": "avatar_thumbnail",
+                        "size": size,
+                        "source_id": original_id
+                    }
+                )
+                variants[content_type] = str(file_id)
+            thumbnails[str(size)] = variants
+
+    except Exception as e:
+        logger.exception("Error generating avatar thumbnails for employee %s: %s", e_id, e)
+        _delete_avatar_files({"thumbnails": thumbnails})
+        return
+
+    # Only replace a version that is older than this upload; the unique e_id
+    # index (built at startup, see mongo_indexes.REQUIRED_INDEX_COLLECTIONS)
+    # turns a lost race into a DuplicateKeyError
+    try:
+        previous = avatars_collection.find_one_and_update(
+            {"e_id": e_id, "original_id": {"$not": {"$gt": original_id}}},
+            {"$set": {
+                "original_id": original_id,
+                "version": original_id,
+                "thumbnails": thumbnails,
+                "updated_at": datetime.utcnow()
+            }},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
+        # A newer upload was published first
+        _delete_avatar_files({"original_id": original_id, "thumbnails": thumbnails})
+        return
+
+    if previous and previous.get("original_id") != original_id:
+        _delete_avatar_files(previous)
+
+
+def pick_avatar(e_id: int, size: int, accept: str = ""):
+    """
+    Choose the stored thumbnail closest to the requested edge length.
+
+    Prefers the smallest size that is at least `size` (falling back to the
+    largest available) and WebP when the client accepts it.
+
+    Returns:
+        (avatar document, file id, content type), or None if no avatar exists
+    """
+    avatar = avatars_collection.find_one({"e_id": e_id})
+    if not avatar or not avatar.get("thumbnails"):
+        return None
+
+    sizes = sorted(int(s) for s in avatar["thumbnails"])
+    chosen = next((s for s in sizes if s >= size), sizes[-1])
+    variants = avatar["thumbnails"][str(chosen)]
+
+    content_type = "image/webp" if "image/webp" in (accept or "") else "image/jpeg"
+    if content_type not in variants:
+        content_type = next(iter(variants))
+
+    return avatar, variants[content_type], content_type
+
+
+def read_avatar(file_id: str) -> bytes:
+    avatar = fetch_file(file_id)
+    if isinstance(avatar, CachedFile):
+        return avatar.data
+    return avatar.read()
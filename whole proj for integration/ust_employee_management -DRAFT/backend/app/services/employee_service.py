@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.models.employee import Employee
+from app.utils.model_updates import apply_changes
+from app.services.org_hierarchy import add_employee_nodes, move_subtree, remove_employee_node
+from app.services.org_rollup import invalidate_rollups, manager_ids, rollup_cache
 
 def create_employee(db: Session, data):
     payload = data.dict()
@@ -9,8 +12,11 @@ def create_employee(db: Session, data):
 
     employee = Employee(**payload)
     db.add(employee)
+    # the id is needed to link the employee into the org hierarchy
+    db.flush()
+    add_employee_nodes(db, [employee.e_id])
     db.commit()
-    db.refresh(employee)
+    invalidate_rollups(db, [employee.e_id])
     return employee
 
 
@@ -20,6 +26,13 @@ def get_all_employees(db: Session):
 def get_employees_by_manager(db: Session, mgr_id: int):
     return db.query(Employee).filter(Employee.mgr_id == mgr_id).all()
 
+def existing_employee_ids(db: Session, ids) -> set:
+    """Which of `ids` exist, checked with one IN query."""
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return set()
+    return {row[0] for row in db.query(Employee.e_id).filter(Employee.e_id.in_(ids)).all()}
+
 def get_employee(db: Session, e_id: int):
     emp = db.query(Employee).filter(Employee.e_id == e_id).first()
     if not emp:
@@ -27,14 +40,30 @@ def get_employee(db: Session, e_id: int):
     return emp
 
 def update_employee(db: Session, e_id: int, data):
+    """Returns (employee, {field: new value} for what changed)."""
     emp = get_employee(db, e_id)
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(emp, key, value)
-    db.commit()
-    db.refresh(emp)
-    return emp
+    values = data.dict(exclude_unset=True)
+    old_managers = set()
+    if "mgr_id" in values and values["mgr_id"] != emp.mgr_id:
+        old_managers = manager_ids(db, [e_id])
+        # rejects a reporting cycle before anything is written
+        move_subtree(db, e_id, values["mgr_id"])
+    # nothing to write when the payload matches the stored row
+    changed = apply_changes(emp, values)
+    if changed:
+        db.commit()
+        if "mgr_id" in changed:
+            rollup_cache.invalidate(old_managers)
+            invalidate_rollups(db, [e_id])
+        elif "name" in changed or "designation" in changed:
+            # the manager's rollup lists this employee among its reports
+            rollup_cache.invalidate({emp.mgr_id})
+    return emp, changed
 
 def delete_employee(db: Session, e_id: int):
     emp = get_employee(db, e_id)
+    old_managers = manager_ids(db, [e_id])
+    remove_employee_node(db, e_id)
     db.delete(emp)
     db.commit()
+    rollup_cache.invalidate(old_managers | {e_id})
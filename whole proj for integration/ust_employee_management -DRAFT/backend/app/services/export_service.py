@@ -0,0 +1,75 @@
+# Streaming Exports
+# Reads export rows through a server-side cursor (stream_results/yield_per),
+# selecting plain columns rather than ORM objects, so rows are fetched in
+# EXPORT_BATCH_SIZE batches and dropped once encoded. Each export uses its own
+# session, which lives exactly as long as the response body is being sent.
+
+from typing import Iterator
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.database.mysql import SessionLocal
+from app.models.employee import Employee
+from app.models.task import Task
+from app.models.user import User
+from app.services.task_service import task_scope
+from app.services.org_hierarchy import org_member_ids
+
+EXPORT_COLUMNS = {
+    "tasks": [
+        Task.t_id, Task.title, Task.description, Task.priority, Task.status,
+        Task.created_by, Task.assigned_to, Task.assigned_by, Task.assigned_at, Task.reviewer,
+        Task.expected_closure, Task.actual_closure, Task.created_at, Task.updated_by, Task.updated_at
+    ],
+    "employees": [
+        Employee.e_id, Employee.name, Employee.email, Employee.designation, Employee.mgr_id,
+        Employee.created_at, Employee.updated_at
+    ],
+    # never the password hash or reset token
+    "users": [
+        User.e_id, User.role, User.status, User.password_changed_at, User.created_at, User.updated_at
+    ],
+}
+
+
+def export_columns(entity: str) -> list[str]:
+    return [column.key for column in EXPORT_COLUMNS[entity]]
+
+
+def export_statement(entity: str, role: str, user_id: int):
+    """
+    SELECT for an export, limited to what `role` may see:
+    tasks as in GET /api/tasks, employees for admins (all) and managers (their
+    organisation), users for admins only.
+    """
+    stmt = select(*EXPORT_COLUMNS[entity])
+
+    if entity == "tasks":
+        scope = task_scope(role, user_id)
+        if scope is not None:
+            stmt = stmt.where(scope)
+        return stmt.order_by(Task.t_id)
+
+    if entity == "employees":
+        if role == "MANAGER":
+            stmt = stmt.where(Employee.e_id.in_(org_member_ids(user_id)))
+        elif role != "ADMIN":
+            raise HTTPException(status_code=403, detail="Not allowed to export employees")
+        return stmt.order_by(Employee.e_id)
+
+    if role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Not allowed to export users")
+    return stmt.order_by(User.e_id)
+
+
+def iter_export_rows(stmt, batch_size: int = settings.EXPORT_BATCH_SIZE) -> Iterator[tuple]:
+    """Yield the rows of `stmt` from a server-side cursor, `batch_size` at a time."""
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        db.close()
@@ -0,0 +1,277 @@
+# Bulk Import
+# Loads employees or tasks from a stream of records (see utils/import_stream).
+#
+# Records are validated in chunks of IMPORT_CHUNK_SIZE: each chunk is checked
+# against its pydantic schema row by row, then against the database with one
+# IN query per kind of reference. Valid rows are inserted a chunk at a time
+# with an executemany INSERT, one transaction per chunk, so a bad row costs
+# itself rather than the file. Every rejected row is listed in the report.
+#
+# Employees may name their manager by `mgr_email` instead of `mgr_id`, which
+# lets a file create a whole reporting line at once. A row is inserted with its
+# chunk when its manager already exists; otherwise only that row is held back
+# until its manager has been inserted, so a file in any order imports in one
+# pass without being read into memory.
+
+from itertools import islice
+from typing import Iterable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.constants import TaskStatus
+from app.models.employee import Employee
+from app.models.task import Task
+from app.schemas.employee_schema import EmployeeImportRow
+from app.schemas.task_schema import TaskImportRow
+from app.services.employee_service import existing_employee_ids
+from app.services.org_hierarchy import add_employee_nodes
+from app.services.org_rollup import rollup_cache
+
+
+class ImportReport:
+    def __init__(self, max_errors: int = settings.IMPORT_MAX_REPORTED_ERRORS):
+        self.max_errors = max_errors
+        self.total = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+
+    def fail(self, row: int, error: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "error": error})
+
+    def as_dict(self) -> dict:
+        self.errors.sort(key=lambda e: e["row"])
+        return {
+            "total": self.total,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors)
+        }
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+def _parse(chunk: list, schema, report: ImportReport) -> list[tuple[int, object]]:
+    """Validate decoded records against `schema`; return the (row, model) pairs that pass."""
+    parsed = []
+    for row, record, error in chunk:
+        report.total += 1
+        if error:
+            report.fail(row, error)
+            continue
+        try:
+            parsed.append((row, schema.model_validate(record)))
+        except ValidationError as e:
+            report.fail(row, _validation_message(e))
+    return parsed
+
+
+def _insert_chunk(db: Session, model, rows: list[tuple[int, dict]], report: ImportReport,
+                  after_insert=None) -> list[int]:
+    """
+    Insert one chunk in its own transaction and return the rows that made it.
+    If the executemany fails (e.g. a duplicate inserted concurrently, or a
+    value the column rejects) the chunk is retried row by row so only the
+    offending rows are rejected.
+    `after_insert(values list)` runs inside the transaction before it commits.
+    """
+    try:
+        db.execute(insert(model), [values for _, values in rows])
+        if after_insert:
+            after_insert([values for _, values in rows])
+        db.commit()
+        return [row for row, _ in rows]
+    except (IntegrityError, DataError):
+        db.rollback()
+
+    inserted = []
+    for row, values in rows:
+        try:
+            db.execute(insert(model), [values])
+            if after_insert:
+                after_insert([values])
+            db.commit()
+            inserted.append(row)
+        except (IntegrityError, DataError) as e:
+            db.rollback()
+            report.fail(row, f"Rejected by database: {e.orig}")
+    return inserted
+
+
+# ---------------------------------------------------------------------------
+# Employees
+# ---------------------------------------------------------------------------
+
+def _emails_in_db(db: Session, emails) -> dict[str, int]:
+    emails = list(emails)
+    if not emails:
+        return {}
+    return dict(db.execute(select(Employee.email, Employee.e_id).where(Employee.email.in_(emails))).all())
+
+
+def import_employees(db: Session, records: Iterable, chunk_size: int = settings.IMPORT_CHUNK_SIZE) -> dict:
+    """
+    Import employees from (row, record, error) tuples.
+
+    Rows are rejected for schema errors, an email that already exists (in the
+    database or earlier in the file), a manager that cannot be found, a
+    manager row that was itself rejected, or a cycle of mgr_email references.
+    """
+    report = ImportReport()
+    # rows whose mgr_email is not inserted yet: email -> entry, and the same
+    # entries grouped by the manager they wait for
+    held: dict[str, dict] = {}
+    waiting: dict[str, list[dict]] = {}
+    # email -> row, for rows the database refused
+    rejected: dict[str, int] = {}
+
+    def insert_ready(ready: list[dict]):
+        # each pass inserts rows whose manager exists, then releases the rows
+        # that were waiting for the employees it just created
+        while ready:
+            new_ids: dict[str, int] = {}
+
+            def link(values: list[dict]):
+                # ids of the new rows, for the org hierarchy and their waiting reports
+                ids = _emails_in_db(db, [v["email"] for v in values])
+                add_employee_nodes(db, list(ids.values()))
+                new_ids.update(ids)
+
+            for chunk in _chunks(ready, chunk_size):
+                inserted = set(_insert_chunk(db, Employee, [(e["row"], e["values"]) for e in chunk], report, link))
+                report.imported += len(inserted)
+                rejected.update((e["values"]["email"], e["row"]) for e in chunk if e["row"] not in inserted)
+
+            ready = []
+            for email, e_id in new_ids.items():
+                for entry in waiting.pop(email, []):
+                    entry["values"]["mgr_id"] = e_id
+                    del held[entry["values"]["email"]]
+                    ready.append(entry)
+
+    for chunk in _chunks(records, chunk_size):
+        parsed = _parse(chunk, EmployeeImportRow, report)
+
+        taken = _emails_in_db(db, {item.email for _, item in parsed})
+        mgr_ids = existing_employee_ids(db, [item.mgr_id for _, item in parsed if item.mgr_id])
+        # managers by email that exist, including rows imported by earlier chunks
+        managers = _emails_in_db(db, {item.mgr_email for _, item in parsed if item.mgr_email})
+        ready, seen = [], {}
+        for row, item in parsed:
+            if item.email in taken:
+                report.fail(row, "Email already exists")
+            elif item.email in seen or item.email in held:
+                report.fail(row, f"Duplicate email (row {seen.get(item.email) or held[item.email]['row']})")
+            elif item.mgr_id and item.mgr_email:
+                report.fail(row, "Give either mgr_id or mgr_email, not both")
+            elif item.mgr_id and item.mgr_id not in mgr_ids:
+                report.fail(row, "Manager not found")
+            else:
+                seen[item.email] = row
+                entry = {
+                    "row": row,
+                    "mgr_email": item.mgr_email,
+                    "values": {
+                        "name": item.name,
+                        "email": item.email,
+                        "designation": item.designation,
+                        "mgr_id": item.mgr_id or managers.get(item.mgr_email)
+                    }
+                }
+                if item.mgr_email and item.mgr_email not in managers:
+                    held[item.email] = entry
+                    waiting.setdefault(item.mgr_email, []).append(entry)
+                else:
+                    ready.append(entry)
+        insert_ready(ready)
+
+    # rows still held: their manager never appeared, was rejected, or is
+    # above them in a cycle. Reject the first two, then everyone below them.
+    failed = []
+    for entry in held.values():
+        mgr_email = entry["mgr_email"]
+        if mgr_email in held:
+            continue
+        if mgr_email in rejected:
+            report.fail(entry["row"], f"Manager row {rejected[mgr_email]} was not imported")
+        else:
+            report.fail(entry["row"], "Manager not found")
+        failed.append(entry)
+    for entry in failed:
+        for below in waiting.pop(entry["values"]["email"], []):
+            report.fail(below["row"], f"Manager row {entry['row']} was not imported")
+            failed.append(below)
+    failed_rows = {entry["row"] for entry in failed}
+    for entry in held.values():
+        if entry["row"] not in failed_rows:
+            report.fail(entry["row"], "Manager reference cycle")
+
+    if report.imported:
+        # headcounts changed all over; cheaper than looking up every manager
+        rollup_cache.clear()
+    return report.as_dict()
+
+
+# ---------------------------------------------------------------------------
+# Tasks
+# ---------------------------------------------------------------------------
+
+def import_tasks(db: Session, records: Iterable, created_by: int,
+                 chunk_size: int = settings.IMPORT_CHUNK_SIZE) -> dict:
+    """
+    Import tasks from (row, record, error) tuples. Each row has the fields of
+    TaskCreate (see TaskImportRow); assignee, reviewer and creator must be existing employees.
+    """
+    report = ImportReport()
+
+    for chunk in _chunks(records, chunk_size):
+        parsed = _parse(chunk, TaskImportRow, report)
+
+        referenced = set()
+        for _, item in parsed:
+            referenced.update((item.assigned_to, item.reviewer, item.created_by))
+        existing = existing_employee_ids(db, referenced)
+
+        rows = []
+        for row, item in parsed:
+            if item.assigned_to not in existing:
+                report.fail(row, "Employee not found")
+            elif item.reviewer not in existing:
+                report.fail(row, "Reviewer not found")
+            elif item.created_by is not None and item.created_by not in existing:
+                report.fail(row, "Creator not found")
+            else:
+                rows.append((row, {
+                    "title": item.title,
+                    "description": item.description,
+                    "priority": item.priority,
+                    "expected_closure": item.expected_closure,
+                    "created_by": item.created_by or created_by,
+                    "status": TaskStatus.TO_DO,
+                    "assigned_to": item.assigned_to,
+                    "reviewer": item.reviewer
+                }))
+
+        if rows:
+            report.imported += len(_insert_chunk(db, Task, rows, report))
+
+    if report.imported:
+        rollup_cache.clear()
+    return report.as_dict()
@@ -0,0 +1,241 @@
+# Org Hierarchy
+# Keeps the employee_closure table in step with Employee.mgr_id so that
+# "everyone under X", "X's management chain" and "is Y in X's organisation"
+# are single index lookups instead of walks up or down the mgr_id links.
+#
+# All changes run in the caller's transaction and are set-based:
+# - a new employee gets its own row plus one row per ancestor of its manager
+# - moving an employee removes the links between its subtree and its old
+#   ancestors, then links the subtree to every ancestor of the new manager
+# - deleting an employee drops every row that mentions it
+#
+# The table is created, and rebuilt if it is out of step with employees, on
+# startup (ensure_closure_table). Access checks also accept a direct mgr_id
+# link, so managers keep seeing their own reports if that rebuild failed.
+
+import logging
+
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, exists, func, insert, literal, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, aliased
+
+from app.database.mysql import SessionLocal, engine
+from app.models.employee import Employee
+from app.models.employee_closure import EmployeeClosure
+
+logger = logging.getLogger(__name__)
+
+
+def add_employee_nodes(db: Session, e_ids: list[int]):
+    """
+    Link newly inserted employees into the hierarchy. Their managers must
+    already be linked, e.g. inserted in an earlier call (managers first).
+    """
+    if not e_ids:
+        return
+    db.execute(insert(EmployeeClosure), [
+        {"ancestor_id": e_id, "descendant_id": e_id, "depth": 0} for e_id in e_ids
+    ])
+    db.execute(insert(EmployeeClosure).from_select(
+        ["ancestor_id", "descendant_id", "depth"],
+        select(EmployeeClosure.ancestor_id, Employee.e_id, EmployeeClosure.depth + 1)
+        .join(Employee, Employee.mgr_id == EmployeeClosure.descendant_id)
+        .where(Employee.e_id.in_(e_ids))
+    ))
+
+
+def is_in_org(db: Session, manager_id: int, e_id: int) -> bool:
+    """Whether `e_id` reports to `manager_id`, directly or through other managers."""
+    return db.scalar(select(exists().where(
+        EmployeeClosure.ancestor_id == manager_id,
+        EmployeeClosure.descendant_id == e_id,
+        EmployeeClosure.depth > 0
+    ) | exists().where(
+        Employee.e_id == e_id,
+        Employee.mgr_id == manager_id
+    )))
+
+
+def org_member_ids(manager_id: int):
+    """Subquery of everyone in `manager_id`'s organisation, for use in filters."""
+    return select(EmployeeClosure.descendant_id).where(
+        EmployeeClosure.ancestor_id == manager_id,
+        EmployeeClosure.depth > 0
+    ).union(select(Employee.e_id).where(Employee.mgr_id == manager_id))
+
+
+def ensure_no_cycle(db: Session, e_id: int, new_mgr_id: int | None):
+    """Reject making an employee report to itself or to someone in its own subtree."""
+    if new_mgr_id is None:
+        return
+    if new_mgr_id == e_id or is_in_org(db, e_id, new_mgr_id):
+        raise HTTPException(status_code=400, detail="Manager change would create a reporting cycle")
+
+
+def move_subtree(db: Session, e_id: int, new_mgr_id: int | None):
+    """Re-link `e_id` and everyone under it below `new_mgr_id` (None = top level)."""
+    ensure_no_cycle(db, e_id, new_mgr_id)
+
+    # MySQL cannot DELETE from a table it reads in a subquery, so the subtree
+    # is fetched first
+    subtree = db.scalars(
+        select(EmployeeClosure.descendant_id).where(EmployeeClosure.ancestor_id == e_id)
+    ).all()
+    db.execute(delete(EmployeeClosure).where(
+        EmployeeClosure.descendant_id.in_(subtree),
+        EmployeeClosure.ancestor_id.notin_(subtree)
+    ))
+
+    if new_mgr_id is None:
+        return
+    above = aliased(EmployeeClosure)
+    below = aliased(EmployeeClosure)
+    db.execute(insert(EmployeeClosure).from_select(
+        ["ancestor_id", "descendant_id", "depth"],
+        select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+        .join(below, and_(above.descendant_id == new_mgr_id, below.ancestor_id == e_id))
+    ))
+
+
+def remove_employee_node(db: Session, e_id: int):
+    db.execute(delete(EmployeeClosure).where(
+        (EmployeeClosure.ancestor_id == e_id) | (EmployeeClosure.descendant_id == e_id)
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def get_subtree(db: Session, e_id: int, cursor: str | None, limit: int, max_depth: int | None = None) -> dict:
+    """
+    Everyone under `e_id`, ordered by e_id, one page at a time. The cursor is
+    the last e_id of the previous page, so each page is a primary key range scan.
+
+    Returns:
+        {"items": [...], "next_cursor": str | None}
+    """
+    try:
+        after = int(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    stmt = (
+        select(Employee, EmployeeClosure.depth)
+        .join(Employee, Employee.e_id == EmployeeClosure.descendant_id)
+        .where(EmployeeClosure.ancestor_id == e_id, EmployeeClosure.depth > 0)
+    )
+    if max_depth is not None:
+        stmt = stmt.where(EmployeeClosure.depth <= max_depth)
+    if after is not None:
+        stmt = stmt.where(EmployeeClosure.descendant_id > after)
+    rows = db.execute(stmt.order_by(EmployeeClosure.descendant_id).limit(limit + 1)).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = [{
+        "e_id": emp.e_id,
+        "name": emp.name,
+        "email": emp.email,
+        "designation": emp.designation,
+        "mgr_id": emp.mgr_id,
+        "depth": depth
+    } for emp, depth in rows]
+    return {"items": items, "next_cursor": str(items[-1]["e_id"]) if has_more and items else None}
+
+
+def get_management_chain(db: Session, e_id: int) -> list[dict]:
+    """`e_id`'s managers, nearest first."""
+    rows = db.execute(
+        select(Employee, EmployeeClosure.depth)
+        .join(Employee, Employee.e_id == EmployeeClosure.ancestor_id)
+        .where(EmployeeClosure.descendant_id == e_id, EmployeeClosure.depth > 0)
+        .order_by(EmployeeClosure.depth)
+    ).all()
+    return [{"e_id": emp.e_id, "name": emp.name, "designation": emp.designation, "depth": depth}
+            for emp, depth in rows]
+
+
+def get_depth(db: Session, e_id: int) -> int | None:
+    """Levels between `e_id` and the top of its hierarchy (0 = no manager; None = unknown)."""
+    return db.scalar(
+        select(func.max(EmployeeClosure.depth)).where(EmployeeClosure.descendant_id == e_id)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Rebuild
+# ---------------------------------------------------------------------------
+
+def find_cycles(db: Session) -> list[list[int]]:
+    """mgr_id cycles already present in the employees table (written before this check existed)."""
+    managers = dict(db.execute(select(Employee.e_id, Employee.mgr_id)).all())
+    cycles, done = [], set()
+    for start in managers:
+        path, e_id = [], start
+        while e_id is not None and e_id not in done and e_id not in path:
+            path.append(e_id)
+            e_id = managers.get(e_id)
+        if e_id in path:
+            cycles.append(path[path.index(e_id):])
+        done.update(path)
+    return cycles
+
+
+def rebuild_closure(db: Session) -> int:
+    """
+    Recompute the whole table from Employee.mgr_id, one INSERT ... SELECT per
+    level. Fails if mgr_id contains a cycle (see find_cycles).
+
+    Returns:
+        Number of rows written
+    """
+    cycles = find_cycles(db)
+    if cycles:
+        raise ValueError(f"Reporting cycles must be fixed first: {cycles}")
+
+    db.execute(delete(EmployeeClosure))
+    total = db.execute(insert(EmployeeClosure).from_select(
+        ["ancestor_id", "descendant_id", "depth"],
+        select(Employee.e_id, Employee.e_id, literal(0))
+    )).rowcount
+
+    # extend every path one level down per pass, until no path gets longer
+    depth = 0
+    while True:
+        added = db.execute(insert(EmployeeClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(EmployeeClosure.ancestor_id, Employee.e_id, literal(depth + 1))
+            .join(Employee, Employee.mgr_id == EmployeeClosure.descendant_id)
+            .where(EmployeeClosure.depth == depth)
+        )).rowcount
+        if not added:
+            break
+        total += added
+        depth += 1
+    return total
+
+
+def ensure_closure_table():
+    """
+    Create `employee_closure` if it is missing and rebuild it when it does not
+    cover every employee (new table, or rows written before it existed).
+    Runs at startup; safe to repeat.
+    """
+    try:
+        EmployeeClosure.__table__.create(engine, checkfirst=True)
+        db = SessionLocal()
+        try:
+            employees = db.scalar(select(func.count()).select_from(Employee))
+            linked = db.scalar(
+                select(func.count()).select_from(EmployeeClosure).where(EmployeeClosure.depth == 0)
+            )
+            if employees != linked:
+                rows = rebuild_closure(db)
+                db.commit()
+                logger.info("Rebuilt employee_closure (%s rows)", rows)
+        finally:
+            db.close()
+    except (SQLAlchemyError, ValueError) as e:
+        logger.error("Could not build employee_closure: %s", e)
@@ -0,0 +1,207 @@
+# Org Rollups
+# Task counts (by status and priority, plus open/overdue/done) for everyone
+# under a manager, split by direct report. A rollup is one GROUP BY over
+# employee_closure joined to tasks (plus one for headcounts), so a skip-level
+# view costs the same two queries however deep the organisation is.
+#
+# Rollups are cached per manager for ROLLUP_CACHE_SECONDS. Writes invalidate
+# only what they touch, after they commit: a task change drops the entries of
+# its assignee's managers (old and new assignee on reassignment), a reporting
+# line change those of the employee's old and new managers. Everyone else's
+# rollup stays cached.
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.models.employee import Employee
+from app.models.employee_closure import EmployeeClosure
+from app.models.task import Task, TaskPriority, TaskStatus
+
+
+class RollupCache:
+    """
+    Thread-safe LRU cache of rollups keyed by manager e_id, with a TTL.
+
+    Every invalidation bumps a generation number; a rollup computed while an
+    invalidation happened is not stored, so a read that raced a write cannot
+    put the old numbers back.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, e_id: int) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(e_id)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(e_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(e_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, e_id: int, rollup: dict, generation: int):
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[e_id] = (time.monotonic() + self.ttl_seconds, rollup)
+            self._entries.move_to_end(e_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, e_ids):
+        with self._lock:
+            self.generation += 1
+            for e_id in e_ids:
+                if self._entries.pop(e_id, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+
+rollup_cache = RollupCache(
+    ttl_seconds=settings.ROLLUP_CACHE_SECONDS,
+    max_entries=settings.ROLLUP_CACHE_MAX_ENTRIES
+)
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+# ---------------------------------------------------------------------------
+
+def manager_ids(db: Session, e_ids) -> set[int]:
+    """
+    Everyone above any of `e_ids`, i.e. the rollups their tasks count towards.
+    Use it before a write to remember whose rollups the write will change.
+    """
+    e_ids = {i for i in e_ids if i is not None}
+    if not e_ids:
+        return set()
+    return set(db.scalars(
+        select(EmployeeClosure.ancestor_id).distinct()
+        .where(EmployeeClosure.descendant_id.in_(e_ids), EmployeeClosure.depth > 0)
+    ))
+
+
+def invalidate_rollups(db: Session, e_ids):
+    """Drop the cached rollups that include `e_ids`. Call after the write commits."""
+    # with nothing cached there is nothing to look up: anything computed from
+    # here on sees the commit, and the generation bump stops anything computed
+    # before it from being stored
+    managers = manager_ids(db, e_ids) if len(rollup_cache) else set()
+    rollup_cache.invalidate(managers)
+
+
+# ---------------------------------------------------------------------------
+# Rollups
+# ---------------------------------------------------------------------------
+
+def _empty_counts() -> dict:
+    return {
+        "total": 0,
+        "open": 0,
+        "overdue": 0,
+        "done": 0,
+        "by_status": {s.value: 0 for s in TaskStatus},
+        "by_priority": {p.value: 0 for p in TaskPriority}
+    }
+
+
+def _add(counts: dict, status: TaskStatus, priority: TaskPriority, tasks: int, overdue: int):
+    counts["total"] += tasks
+    counts["by_status"][status.value] += tasks
+    counts["by_priority"][priority.value] += tasks
+    if status == TaskStatus.DONE:
+        counts["done"] += tasks
+    else:
+        counts["open"] += tasks
+        counts["overdue"] += overdue
+
+
+def compute_rollup(db: Session, e_id: int) -> dict:
+    """
+    Task counts for everyone under `e_id` (not `e_id` itself), in total and
+    per direct report (that report's own tasks plus their whole organisation).
+    Tasks are counted by assignee.
+
+    Raises:
+        HTTPException(404): If the employee does not exist
+    """
+    if db.get(Employee, e_id) is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    now = datetime.utcnow()
+    report = aliased(EmployeeClosure)
+    member = aliased(EmployeeClosure)
+
+    # direct reports with the size of their organisation (themselves included)
+    reports = db.execute(
+        select(Employee.e_id, Employee.name, Employee.designation, func.count(member.descendant_id))
+        .select_from(report)
+        .join(Employee, Employee.e_id == report.descendant_id)
+        .join(member, member.ancestor_id == report.descendant_id)
+        .where(report.ancestor_id == e_id, report.depth == 1)
+        .group_by(Employee.e_id, Employee.name, Employee.designation)
+        .order_by(Employee.e_id)
+    ).all()
+
+    counts = db.execute(
+        select(
+            report.descendant_id, Task.status, Task.priority,
+            func.count(Task.t_id),
+            func.sum(case((Task.expected_closure < now, 1), else_=0))
+        )
+        .select_from(report)
+        .join(member, member.ancestor_id == report.descendant_id)
+        .join(Task, Task.assigned_to == member.descendant_id)
+        .where(report.ancestor_id == e_id, report.depth == 1)
+        .group_by(report.descendant_id, Task.status, Task.priority)
+    ).all()
+
+    totals = {"headcount": 0, **_empty_counts()}
+    by_report = {}
+    for r_id, name, designation, headcount in reports:
+        by_report[r_id] = {"e_id": r_id, "name": name, "designation": designation,
+                           "headcount": headcount, **_empty_counts()}
+        totals["headcount"] += headcount
+    for r_id, status, priority, tasks, overdue in counts:
+        _add(totals, status, priority, tasks, int(overdue or 0))
+        _add(by_report[r_id], status, priority, tasks, int(overdue or 0))
+
+    return {
+        "e_id": e_id,
+        **totals,
+        "reports": list(by_report.values()),
+        "computed_at": now
+    }
+
+
+def get_rollup(db: Session, e_id: int) -> dict:
+    """compute_rollup through the cache."""
+    rollup = rollup_cache.get(e_id)
+    if rollup is None:
+        generation = rollup_cache.generation
+        rollup = compute_rollup(db, e_id)
+        rollup_cache.put(e_id, rollup, generation)
+    return rollup
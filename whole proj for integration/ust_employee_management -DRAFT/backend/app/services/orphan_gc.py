@@ -0,0 +1,253 @@
+# Orphan Cleanup
+# Finds data whose owner no longer exists and removes it in batches:
+# - remarks of tasks deleted from MySQL (and their attachments); remarks whose
+#   task_id is not a task id at all (a string, or the init_mongo placeholder 0)
+#   are only reported unless delete_invalid_task_ids is set
+# - avatar documents and files of deleted employees
+# - GridFS files no remark or avatar refers to (e.g. a failed add_remark)
+# - attachment catalog entries whose GridFS file is gone
+#
+# Each pass walks one collection in `_id` order and diffs a chunk of ids
+# against the owning store with a single IN query. Files younger than
+# ORPHAN_GRACE_HOURS are skipped so in-flight uploads are never collected.
+
+import logging
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.database.mongodb import mongo_db, remarks_collection, avatars_collection, attachments_collection
+from app.database.mysql import SessionLocal
+from app.models.employee import Employee
+from app.models.task import Task
+from app.utils.file_upload import delete_files
+
+logger = logging.getLogger(__name__)
+
+files_collection = mongo_db["fs.files"]
+
+# GridFS file types owned by an employee rather than a remark
+EMPLOYEE_FILE_TYPES = ("profile_picture", "avatar_thumbnail")
+# Ids listed per category in the report
+SAMPLE_SIZE = 20
+
+
+class Throttle:
+    """Spaces out deletes so a sweep stays under `per_second` (0 = unlimited)."""
+
+    def __init__(self, per_second: float):
+        self.per_second = per_second
+        self._started = time.monotonic()
+        self._done = 0
+
+    def wait(self, count: int):
+        if not self.per_second:
+            return
+        self._done += count
+        ahead = self._done / self.per_second - (time.monotonic() - self._started)
+        if ahead > 0:
+            time.sleep(ahead)
+
+
+class OrphanSweeper:
+    """
+    Args:
+        dry_run (bool): Only report what would be deleted
+        batch_size (int): Ids diffed per query
+        max_deletes_per_second (float): Delete rate ceiling (0 = unlimited)
+        grace_hours (int): Minimum age of a GridFS file before it can be collected
+        delete_invalid_task_ids (bool): Also delete remarks whose task_id is not a positive int
+    """
+
+    def __init__(self, dry_run: bool = True, batch_size: int = 500, max_deletes_per_second: float = 0,
+                 grace_hours: int = settings.ORPHAN_GRACE_HOURS, delete_invalid_task_ids: bool = False):
+        self.dry_run = dry_run
+        self.delete_invalid_task_ids = delete_invalid_task_ids
+        # categories that are reported but never deleted
+        self.report_only: set[str] = set()
+        self.batch_size = batch_size
+        self.throttle = Throttle(max_deletes_per_second)
+        self.cutoff = datetime.utcnow() - timedelta(hours=grace_hours)
+        self.report: dict[str, dict] = {}
+
+    def _record(self, category: str, ids: list):
+        entry = self.report.setdefault(category, {"count": 0, "sample": []})
+        entry["count"] += len(ids)
+        room = SAMPLE_SIZE - len(entry["sample"])
+        if room > 0:
+            entry["sample"].extend(str(i) for i in ids[:room])
+
+    def _existing(self, column, ids) -> set:
+        ids = list(ids)
+        if not ids:
+            return set()
+        db = SessionLocal()
+        try:
+            return {row[0] for row in db.query(column).filter(column.in_(ids)).all()}
+        finally:
+            db.close()
+
+    def _delete_files(self, file_ids: list):
+        if file_ids and not self.dry_run:
+            delete_files(file_ids)
+            self.throttle.wait(len(file_ids))
+
+    # -------------------------------------------------------------------
+    # Passes
+    # -------------------------------------------------------------------
+
+    def sweep_task_remarks(self):
+        """Remarks (and their files) whose task no longer exists in MySQL."""
+        # walks the task_id index, one entry per distinct task
+        task_ids = [g["_id"] for g in remarks_collection.aggregate([
+            {"$sort": {"task_id": 1}},
+            {"$group": {"_id": "$task_id"}}
+        ])]
+
+        for start in range(0, len(task_ids), self.batch_size):
+            chunk = task_ids[start:start + self.batch_size]
+            valid = [t for t in chunk if isinstance(t, int) and not isinstance(t, bool) and t > 0]
+            existing = self._existing(Task.t_id, valid)
+            self._sweep_remarks("task_remarks", "task_remark_files",
+                                [t for t in valid if t not in existing], delete=True)
+            # not a reference MySQL can confirm or deny: only removed on request
+            invalid = [t for t in chunk if t not in valid]
+            self._sweep_remarks("invalid_task_id_remarks", "invalid_task_id_remark_files",
+                                invalid, delete=self.delete_invalid_task_ids)
+
+    def _sweep_remarks(self, category: str, files_category: str, task_ids: list, delete: bool):
+        if not task_ids:
+            return
+        if not delete:
+            self.report_only.update((category, files_category))
+
+        query = {"task_id": {"$in": task_ids}}
+        last_id = None
+        while True:
+            page_query = {**query, "_id": {"$gt": last_id}} if last_id else query
+            remarks = list(remarks_collection.find(page_query, {"file_id": 1}).sort("_id", 1).limit(self.batch_size))
+            if not remarks:
+                break
+            last_id = remarks[-1]["_id"]
+
+            remark_ids = [r["_id"] for r in remarks]
+            file_ids = [r["file_id"] for r in remarks if r.get("file_id")]
+            self._record(category, remark_ids)
+            self._record(files_category, file_ids)
+            if delete and not self.dry_run:
+                remarks_collection.delete_many({"_id": {"$in": remark_ids}})
+                self.throttle.wait(len(remark_ids))
+            if delete:
+                self._delete_files(file_ids)
+
+    def sweep_employee_avatars(self):
+        """Avatar documents (and their thumbnails) of deleted employees."""
+        last_id = None
+        while True:
+            query = {"_id": {"$gt": last_id}} if last_id else {}
+            avatars = list(avatars_collection.find(query).sort("_id", 1).limit(self.batch_size))
+            if not avatars:
+                break
+            last_id = avatars[-1]["_id"]
+
+            existing = self._existing(Employee.e_id, {a["e_id"] for a in avatars})
+            orphans = [a for a in avatars if a["e_id"] not in existing]
+            if not orphans:
+                continue
+
+            file_ids = []
+            for avatar in orphans:
+                file_ids.extend(_avatar_file_ids(avatar))
+            self._record("employee_avatars", [a["_id"] for a in orphans])
+            self._record("employee_avatar_files", file_ids)
+            if not self.dry_run:
+                avatars_collection.delete_many({"_id": {"$in": [a["_id"] for a in orphans]}})
+            self._delete_files(file_ids)
+
+    def sweep_files(self):
+        """GridFS files older than the grace period that nothing refers to."""
+        last_id = None
+        while True:
+            query = {"uploadDate": {"$lt": self.cutoff}}
+            if last_id:
+                query["_id"] = {"$gt": last_id}
+            files = list(files_collection.find(query, {"metadata": 1}).sort("_id", 1).limit(self.batch_size))
+            if not files:
+                break
+            last_id = files[-1]["_id"]
+
+            employee_files, other_files = [], []
+            for f in files:
+                is_employee_file = (f.get("metadata") or {}).get("type") in EMPLOYEE_FILE_TYPES
+                (employee_files if is_employee_file else other_files).append(f)
+
+            orphans = self._unreferenced_remark_files(other_files) + self._unreferenced_employee_files(employee_files)
+            self._record("unreferenced_files", orphans)
+            self._delete_files(orphans)
+
+    def _unreferenced_remark_files(self, files: list) -> list:
+        if not files:
+            return []
+        ids = [str(f["_id"]) for f in files]
+        # remarks store the file id as a string
+        referenced = {
+            str(r["file_id"])
+            for r in remarks_collection.find(
+                {"file_id": {"$in": ids + [f["_id"] for f in files]}}, {"file_id": 1}
+            )
+        }
+        return [file_id for file_id in ids if file_id not in referenced]
+
+    def _unreferenced_employee_files(self, files: list) -> list:
+        if not files:
+            return []
+        employee_ids = {f["metadata"].get("employee_id") for f in files}
+        existing = self._existing(Employee.e_id, {e for e in employee_ids if isinstance(e, int)})
+
+        referenced = set()
+        for avatar in avatars_collection.find({"e_id": {"$in": list(existing)}}):
+            referenced.update(_avatar_file_ids(avatar))
+
+        orphans = []
+        for f in files:
+            metadata = f["metadata"]
+            file_id = str(f["_id"])
+            if metadata.get("employee_id") not in existing:
+                orphans.append(file_id)
+            elif metadata.get("type") == "avatar_thumbnail" and file_id not in referenced:
+                # left behind by an avatar swap that did not finish
+                orphans.append(file_id)
+        return orphans
+
+    def sweep_catalog(self):
+        """Attachment catalog entries whose GridFS file no longer exists."""
+        last_id = None
+        while True:
+            query = {"_id": {"$gt": last_id}} if last_id else {}
+            entries = [e["_id"] for e in attachments_collection.find(query, {"_id": 1}).sort("_id", 1).limit(self.batch_size)]
+            if not entries:
+                break
+            last_id = entries[-1]
+
+            present = {f["_id"] for f in files_collection.find({"_id": {"$in": entries}}, {"_id": 1})}
+            missing = [e for e in entries if e not in present]
+            self._record("catalog_entries", missing)
+            if missing and not self.dry_run:
+                attachments_collection.delete_many({"_id": {"$in": missing}})
+                self.throttle.wait(len(missing))
+
+    def run(self) -> dict:
+        """Run every pass in dependency order and return the report."""
+        for sweep in (self.sweep_task_remarks, self.sweep_employee_avatars, self.sweep_files, self.sweep_catalog):
+            sweep()
+            logger.info("Orphan sweep %s done (dry_run=%s)", sweep.__name__, self.dry_run)
+        return self.report
+
+
+def _avatar_file_ids(avatar: dict) -> list[str]:
+    file_ids = [avatar.get("original_id")]
+    for variants in (avatar.get("thumbnails") or {}).values():
+        file_ids.extend(variants.values())
+    return [str(ObjectId(f)) for f in file_ids if f]
@@ -0,0 +1,309 @@
+# Transactional Outbox
+# Writes that must reach MongoDB (remarks, audit log entries) are recorded as
+# rows in the MySQL `outbox_events` table inside the caller's transaction, so
+# they are committed or rolled back together with the change itself. A relay
+# thread later delivers pending rows in batches to the subscribers registered
+# for their event type, retrying failures with exponential backoff.
+#
+# Every event carries an idempotency key; subscribers use it so a redelivery
+# (e.g. the relay crashing after Mongo accepted a batch) has no effect.
+
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.mongodb import remarks_collection, logs_collection
+from app.database.mysql import SessionLocal, engine
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+AUDIT_LOG = "audit_log"
+REMARK = "remark"
+
+# event type -> handlers, each called with a list of (idempotency key, payload)
+SUBSCRIBERS: dict[str, list] = {}
+
+
+def subscribe(event_type: str):
+    """Register a batch handler for an event type."""
+    def register(handler):
+        SUBSCRIBERS.setdefault(event_type, []).append(handler)
+        return handler
+    return register
+
+
+def ensure_outbox_table():
+    """
+    Create `outbox_events` if it is missing. Runs at startup: every task
+    write inserts into it, so it must exist before the first request.
+    """
+    try:
+        OutboxEvent.__table__.create(engine, checkfirst=True)
+    except SQLAlchemyError as e:
+        logger.error("MySQL error creating outbox_events: %s", e)
+
+
+# ---------------------------------------------------------------------------
+# Producing
+# ---------------------------------------------------------------------------
+
+def enqueue(db: Session, event_type: str, payload: dict, idempotency_key: str | None = None) -> OutboxEvent:
+    """Add an event to the session; it is stored when the caller commits."""
+    event = OutboxEvent(
+        event_type=event_type,
+        idempotency_key=idempotency_key or uuid.uuid4().hex,
+        payload=payload
+    )
+    db.add(event)
+    return event
+
+
+def enqueue_many(db: Session, events: list[tuple[str, dict, str]]):
+    """
+    Add many (event type, payload, idempotency key) events with one
+    executemany INSERT, for bulk write paths. Unlike enqueue() no ORM
+    objects are created, so their ids are never read back.
+    """
+    if events:
+        db.execute(insert(OutboxEvent), [
+            {"event_type": event_type, "payload": payload, "idempotency_key": key}
+            for event_type, payload, key in events
+        ])
+
+
+def _audit_payload(action: str, entity_type: str, entity_id: int, performed_by: int) -> dict:
+    return {
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "performed_by": performed_by,
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
+def _remark_event(task_id: int, comment: str, e_id: int) -> tuple[str, dict, str]:
+    # the Mongo `_id` is fixed now so delivery is an idempotent upsert
+    remark_id = str(ObjectId())
+    return REMARK, {
+        "_id": remark_id,
+        "task_id": task_id,
+        "comment": comment,
+        "e_id": e_id,
+        "created_at": datetime.utcnow().isoformat()
+    }, remark_id
+
+
+def enqueue_audit(db: Session, action: str, entity_type: str, entity_id: int, performed_by: int) -> OutboxEvent:
+    """Transactional counterpart of log_action for write paths."""
+    return enqueue(db, AUDIT_LOG, _audit_payload(action, entity_type, entity_id, performed_by))
+
+
+def enqueue_audits(db: Session, action: str, entity_type: str, entity_ids: list[int], performed_by: int):
+    """One audit entry per entity of a bulk operation, written in a single INSERT."""
+    enqueue_many(db, [
+        (AUDIT_LOG, _audit_payload(action, entity_type, entity_id, performed_by), uuid.uuid4().hex)
+        for entity_id in entity_ids
+    ])
+
+
+def enqueue_remark(db: Session, task_id: int, comment: str, e_id: int) -> OutboxEvent:
+    """Queue a text remark for delivery to Mongo."""
+    event_type, payload, key = _remark_event(task_id, comment, e_id)
+    return enqueue(db, event_type, payload, idempotency_key=key)
+
+
+def enqueue_remarks(db: Session, remarks: list[tuple[int, str, int]]):
+    """Queue many (task id, comment, e_id) remarks in a single INSERT."""
+    enqueue_many(db, [_remark_event(task_id, comment, e_id) for task_id, comment, e_id in remarks])
+
+
+# ---------------------------------------------------------------------------
+# Built-in subscribers
+# ---------------------------------------------------------------------------
+
+@subscribe(REMARK)
+def deliver_remarks(events: list[tuple[str, dict]]):
+    ops = []
+    for _, payload in events:
+        remark = {
+            **payload,
+            "_id": ObjectId(payload["_id"]),
+            "file_id": None,
+            "file_name": None,
+            "created_at": datetime.fromisoformat(payload["created_at"])
+        }
+        ops.append(UpdateOne({"_id": remark["_id"]}, {"$setOnInsert": remark}, upsert=True))
+    remarks_collection.bulk_write(ops, ordered=False)
+
+
+@subscribe(AUDIT_LOG)
+def deliver_audit_logs(events: list[tuple[str, dict]]):
+    docs = [{
+        "timestamp": datetime.fromisoformat(payload["timestamp"]),
+        "meta": {
+            "performed_by": payload["performed_by"],
+            "entity_type": payload["entity_type"],
+            "entity_id": payload["entity_id"]
+        },
+        "action": payload["action"],
+        "outbox_key": key
+    } for key, payload in events]
+
+    # Time-series collections have no unique index, so look for an earlier
+    # delivery of these keys within the batch's time range
+    timestamps = [d["timestamp"] for d in docs]
+    delivered = {
+        d["outbox_key"]
+        for d in logs_collection.find(
+            {
+                "timestamp": {"$gte": min(timestamps), "$lte": max(timestamps)},
+                "outbox_key": {"$in": [d["outbox_key"] for d in docs]}
+            },
+            {"outbox_key": 1}
+        )
+    }
+    docs = [d for d in docs if d["outbox_key"] not in delivered]
+    if docs:
+        logs_collection.insert_many(docs, ordered=False)
+
+
+# ---------------------------------------------------------------------------
+# Relay
+# ---------------------------------------------------------------------------
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(2 ** attempts, 300))
+
+
+def relay_batch(batch_size: int = settings.OUTBOX_BATCH_SIZE) -> int:
+    """
+    Deliver one batch of due events.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several relays
+    can run side by side without delivering the same event twice at once.
+    Events whose handler fails are rescheduled; after OUTBOX_MAX_ATTEMPTS they
+    stay in the table, undelivered, for inspection.
+
+    Returns:
+        Number of events claimed
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        events = (
+            db.query(OutboxEvent)
+            .filter(
+                OutboxEvent.delivered_at.is_(None),
+                OutboxEvent.available_at <= now,
+                OutboxEvent.attempts < settings.OUTBOX_MAX_ATTEMPTS
+            )
+            .order_by(OutboxEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not events:
+            db.rollback()
+            return 0
+
+        by_type: dict[str, list[OutboxEvent]] = {}
+        for event in events:
+            by_type.setdefault(event.event_type, []).append(event)
+
+        for event_type, group in by_type.items():
+            batch = [(e.idempotency_key, e.payload) for e in group]
+            try:
+                for handler in SUBSCRIBERS.get(event_type, []):
+                    handler(batch)
+            except Exception as e:
+                logger.warning("Outbox delivery of %d %s events failed: %s", len(group), event_type, e)
+                for event in group:
+                    event.attempts += 1
+                    event.available_at = now + _backoff(event.attempts)
+                    event.last_error = str(e)[:2000]
+                    if event.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                        logger.error("Outbox event %s gave up after %d attempts", event.id, event.attempts)
+                continue
+
+            for event in group:
+                event.delivered_at = now
+
+        db.commit()
+        return len(events)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def purge_delivered(older_than_hours: int = settings.OUTBOX_RETENTION_HOURS) -> int:
+    """Delete delivered events older than the retention window."""
+    db = SessionLocal()
+    try:
+        cutoff = datetime.utcnow() - timedelta(hours=older_than_hours)
+        deleted = (
+            db.query(OutboxEvent)
+            .filter(OutboxEvent.delivered_at.isnot(None), OutboxEvent.delivered_at < cutoff)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+class OutboxRelay:
+    """Background thread that drains the outbox until stopped."""
+
+    PURGE_EVERY_SECONDS = 3600
+
+    def __init__(self, poll_seconds: float = settings.OUTBOX_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="outbox-relay", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run(self):
+        next_purge = 0.0
+        while not self._stop.is_set():
+            try:
+                # keep going while full batches come back, otherwise wait
+                if relay_batch() >= settings.OUTBOX_BATCH_SIZE:
+                    continue
+                if time.monotonic() >= next_purge:
+                    purge_delivered()
+                    next_purge = time.monotonic() + self.PURGE_EVERY_SECONDS
+            except Exception as e:
+                logger.error("Outbox relay error: %s", e)
+            self._stop.wait(self.poll_seconds)
+
+        # deliver what is already due before exiting
+        try:
+            while relay_batch():
+                pass
+        except Exception as e:
+            logger.error("Outbox relay error while draining: %s", e)
+
+
+outbox_relay = OutboxRelay()
@@ -5,20 +5,62 @@
 from bson import ObjectId
 from fastapi import HTTPException
 from datetime import datetime
+import os
+from gridfs.errors import NoFile
+from pymongo import ReturnDocument
 from app.database.mongodb import remarks_collection
 from app.utils.file_upload import save_file, delete_file
+from app.utils.gridfs_reader import open_download
 from app.utils.mongo_serializer import serialize_mongo
 
+# Fields returned by the remark endpoints. commented_by / user_e_id are the
+# author fields of remarks not yet migrated by scripts/normalize_remark_authors.py.
+REMARK_PROJECTION = {
+    "task_id": 1,
+    "comment": 1,
+    "e_id": 1,
+    "commented_by": 1,
+    "user_e_id": 1,
+    "file_id": 1,
+    "file_name": 1,
+    "created_at": 1,
+    "updated_at": 1
+}
+
+
+def _owned_remark_filter(remark_id: str, e_id: int, role: str) -> dict:
+    """Filter matching the remark only if the caller may modify it."""
+    query = {"_id": ObjectId(remark_id)}
+    # 🔐 ownership check
+    if role != "ADMIN":
+        query["e_id"] = e_id
+    return query
+
+
+def _raise_missing_or_forbidden(remark_id: ObjectId, action: str):
+    """Explain why an ownership-filtered write matched nothing."""
+    if remarks_collection.find_one({"_id": remark_id}, {"_id": 1}):
+        raise HTTPException(status_code=403, detail=f"Not allowed to {action} this remark")
+    raise HTTPException(status_code=404, detail="Remark not found")
+
 
 def add_remark(task_id: int, comment: str, e_id: int, file=None):
     file_id = None
     file_name = None
+    # id allocated up front so the attachment can be catalogued against it
+    remark_id = ObjectId()
 
     if file:
-        file_id = save_file(file)
+        file_id = save_file(file, {
+            "type": "remark_attachment",
+            "task_id": task_id,
+            "remark_id": str(remark_id),
+            "employee_id": e_id
+        })
         file_name = file.filename
 
     remark = {
+        "_id": remark_id,
         "task_id": task_id,
         "comment": comment,
         "e_id": e_id,              # ✅ FIXED (was user_id)
@@ -27,17 +69,93 @@ def add_remark(task_id: int, comment: str, e_id: int, file=None):
         "created_at": datetime.utcnow()
     }
 
-    result = remarks_collection.insert_one(remark)
-    remark["_id"] = result.inserted_id
+    remarks_collection.insert_one(remark)
 
     return serialize_mongo(remark)
 
 
 def get_remarks_by_task(task_id: int):
-    remarks = remarks_collection.find({"task_id": task_id})
+    remarks = remarks_collection.find({"task_id": task_id}, REMARK_PROJECTION)
     return [serialize_mongo(r) for r in remarks]
 
 
+def summarize_remarks(task_ids: list[int]) -> list[dict]:
+    """
+    Remark count, latest remark and attachment flag for each task, in one
+    aggregation.
+
+    Sorting on (task_id, created_at) descending walks the task_id/created_at
+    index backwards, so $first in each group is the newest remark. Tasks
+    without remarks are included with a count of 0.
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    pipeline = [
+        {"$match": {"task_id": {"$in": task_ids}}},
+        {"$sort": {"task_id": -1, "created_at": -1}},
+        {"$group": {
+            "_id": "$task_id",
+            "remark_count": {"$sum": 1},
+            "has_attachment": {"$max": {"$gt": ["$file_id", None]}},
+            "latest_remark": {"$first": {
+                "_id": "$_id",
+                "comment": "$comment",
+                "e_id": {"$ifNull": ["$e_id", {"$ifNull": ["$commented_by", "$user_e_id"]}]},
+                "file_name": "$file_name",
+                "created_at": "$created_at"
+            }}
+        }}
+    ]
+    groups = {g["_id"]: g for g in remarks_collection.aggregate(pipeline)}
+
+    summaries = []
+    for task_id in task_ids:
+        group = groups.get(task_id)
+        summaries.append({
+            "task_id": task_id,
+            "remark_count": group["remark_count"] if group else 0,
+            "has_attachment": bool(group and group["has_attachment"]),
+            "latest_remark": serialize_mongo(group["latest_remark"]) if group else None
+        })
+    return summaries
+
+
+def iter_task_attachments(task_id: int):
+    """
+    Yield (archive name, reader) for every distinct file attached to a task.
+
+    Files referenced by several remarks are yielded once, clashing names get a
+    numeric suffix and files missing from GridFS are skipped. Readers are opened
+    lazily, one at a time, as the caller asks for the next file.
+    """
+    attachments = remarks_collection.find(
+        {"task_id": task_id, "file_id": {"$ne": None}},
+        {"_id": 0, "file_id": 1, "file_name": 1}
+    ).sort("created_at", 1)
+
+    seen_ids = set()
+    used_names = set()
+    for attachment in attachments:
+        file_id = str(attachment["file_id"])
+        if file_id in seen_ids:
+            continue
+        seen_ids.add(file_id)
+
+        try:
+            reader = open_download(file_id)
+        except NoFile:
+            continue
+
+        name = os.path.basename(attachment.get("file_name") or reader.filename or "") or file_id
+        stem, ext = os.path.splitext(name)
+        counter = 1
+        while name in used_names:
+            counter += 1
+            name = f"{stem} ({counter}){ext}"
+        used_names.add(name)
+
+        yield name, reader
+
+
 def update_remark(
     remark_id: str,
     comment: str | None,
@@ -45,14 +163,15 @@ def update_remark(
     e_id: int,
     role: str
 ):
-    remark = remarks_collection.find_one({"_id": ObjectId(remark_id)})
-
-    if not remark:
-        raise HTTPException(status_code=404, detail="Remark not found")
+    """
+    Edit a remark's comment and/or replace its attachment.
 
-    # 🔐 ownership check
-    if role != "ADMIN" and remark["e_id"] != e_id:
-        raise HTTPException(status_code=403, detail="Not allowed to update this remark")
+    Ownership is part of the filter, so a comment edit is a single
+    find_one_and_update. Replacing the file needs the remark's task first (for
+    the attachment's metadata), so that path costs one extra read. The extra
+    lookup that tells 404 from 403 only runs when the update matched nothing.
+    """
+    query = _owned_remark_filter(remark_id, e_id, role)
 
     update_data = {}
 
@@ -61,11 +180,16 @@ def update_remark(
 
     # 📎 replace file if uploaded
     if file:
-        if remark.get("file_id"):
-            delete_file(remark["file_id"])
-
-        file_id = save_file(file)
-        update_data["file_id"] = file_id
+        current = remarks_collection.find_one(query, {"task_id": 1})
+        if not current:
+            _raise_missing_or_forbidden(query["_id"], "update")
+
+        update_data["file_id"] = save_file(file, {
+            "type": "remark_attachment",
+            "task_id": current["task_id"],
+            "remark_id": remark_id,
+            "employee_id": e_id
+        })
         update_data["file_name"] = file.filename
 
     if not update_data:
@@ -73,17 +197,29 @@ def update_remark(
 
     update_data["updated_at"] = datetime.utcnow()
 
-    remarks_collection.update_one(
-        {"_id": ObjectId(remark_id)},
-        {"$set": update_data}
+    # The pre-update document tells us which file was actually replaced
+    previous = remarks_collection.find_one_and_update(
+        query,
+        {"$set": update_data},
+        projection=REMARK_PROJECTION,
+        return_document=ReturnDocument.BEFORE
     )
+    if not previous:
+        if file:
+            delete_file(update_data["file_id"])
+        _raise_missing_or_forbidden(query["_id"], "update")
+
+    if file and previous.get("file_id"):
+        delete_file(str(previous["file_id"]))
 
-    updated = remarks_collection.find_one({"_id": ObjectId(remark_id)})
-    return serialize_mongo(updated)
+    return serialize_mongo({**previous, **update_data})
 
 
 def delete_remark_by_id(remark_id: str):
-    remark = remarks_collection.find_one({"_id": ObjectId(remark_id)})
+    remark = remarks_collection.find_one_and_delete(
+        {"_id": ObjectId(remark_id)},
+        projection={"file_id": 1}
+    )
 
     if not remark:
         raise Exception("Remark not found")
@@ -92,12 +228,7 @@ def delete_remark_by_id(remark_id: str):
     if remark.get("file_id"):
         delete_file(str(remark["file_id"]))
 
-    remarks_collection.delete_one({"_id": ObjectId(remark_id)})
-
     return {
         "message": "Remark and file deleted successfully",
         "remark_id": remark_id
     }
-    
-    
-
@@ -0,0 +1,189 @@
+# Bulk Task Operations
+# Create, assign or move many tasks in one request and one transaction.
+# Every referenced employee is validated with a single IN query and every
+# referenced task is read (and locked) with another, then the valid items are
+# written together: one multi-row INSERT, one executemany UPDATE, or one
+# conditional UPDATE per status transition. Invalid items are reported per
+# item instead of failing the request, and the audit entries of the whole
+# batch go to the outbox in a single INSERT.
+
+from datetime import datetime
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.models.task import Task
+from app.core.constants import TaskStatus
+from app.schemas.task_schema import TaskImportRow
+from app.services.employee_service import existing_employee_ids
+from app.services.outbox import enqueue_audits, enqueue_remarks
+from app.services.org_rollup import invalidate_rollups
+from app.services.task_state_machine import find_transition, compile_transition, qualifies, rejection_reason
+
+
+def _result(index: int, t_id: int | None, status_code: int = 200, error: str | None = None) -> dict:
+    return {"index": index, "t_id": t_id, "ok": error is None, "status_code": status_code, "error": error}
+
+
+def _summary(results: list[dict]) -> dict:
+    results.sort(key=lambda r: r["index"])
+    succeeded = sum(r["ok"] for r in results)
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
+
+def _column_error(item) -> str | None:
+    """Why `item` would not fit the tasks columns (e.g. an over-long title), if it would not."""
+    try:
+        TaskImportRow.model_validate(item.model_dump())
+    except ValidationError as e:
+        error = e.errors()[0]
+        return f"{'.'.join(str(p) for p in error['loc'])}: {error['msg']}"
+    return None
+
+
+def _lock_tasks(db: Session, task_ids) -> dict:
+    """t_id -> (t_id, status, assigned_to, reviewer) for the tasks that exist, locked until commit."""
+    rows = db.execute(
+        select(Task.t_id, Task.status, Task.assigned_to, Task.reviewer)
+        .where(Task.t_id.in_(set(task_ids)))
+        .with_for_update()
+    )
+    return {row.t_id: row for row in rows}
+
+
+def _insert_tasks(db: Session, rows: list[dict]) -> list[int]:
+    """Insert all rows in one statement and return their ids in order."""
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        return list(db.scalars(insert(Task).returning(Task.t_id, sort_by_parameter_order=True), rows))
+
+    # MySQL has no RETURNING: a single multi-row INSERT is given consecutive
+    # auto-increment ids by InnoDB, starting at LAST_INSERT_ID(). Replication
+    # setups that step ids (auto_increment_increment > 1, e.g. Galera or
+    # multi-primary Group Replication) break that, so there every row is
+    # inserted on its own and reports its own id.
+    if db.scalar(text("SELECT @@auto_increment_increment")) == 1:
+        first_id = db.execute(insert(Task).values(rows)).lastrowid
+        return list(range(first_id, first_id + len(rows)))
+    return [db.execute(insert(Task).values(row)).lastrowid for row in rows]
+
+
+def create_tasks_bulk(db: Session, items: list, created_by: int) -> dict:
+    referenced = set()
+    for item in items:
+        referenced.update((item.assigned_to, item.reviewer, item.created_by))
+    existing = existing_employee_ids(db, referenced)
+
+    results, rows, positions = [], [], []
+    for index, item in enumerate(items):
+        # checked per item so one bad value is not a DataError for the whole INSERT
+        if error := _column_error(item):
+            results.append(_result(index, None, 422, error))
+        elif item.assigned_to not in existing:
+            results.append(_result(index, None, 404, "Employee not found"))
+        elif item.reviewer not in existing:
+            results.append(_result(index, None, 404, "Reviewer not found"))
+        elif item.created_by is not None and item.created_by not in existing:
+            results.append(_result(index, None, 404, "Creator not found"))
+        else:
+            rows.append({
+                "title": item.title,
+                "description": item.description,
+                "priority": item.priority,
+                "expected_closure": item.expected_closure,
+                "created_by": item.created_by or created_by,
+                "status": TaskStatus.TO_DO,
+                "assigned_to": item.assigned_to,
+                "reviewer": item.reviewer
+            })
+            positions.append(index)
+
+    if rows:
+        task_ids = _insert_tasks(db, rows)
+        results.extend(_result(index, t_id, 201) for index, t_id in zip(positions, task_ids))
+        enqueue_audits(db, "CREATE_TASK", "TASK", task_ids, created_by)
+        db.commit()
+        invalidate_rollups(db, [r["assigned_to"] for r in rows])
+
+    return _summary(results)
+
+
+def assign_tasks_bulk(db: Session, items: list, manager_id: int) -> dict:
+    tasks = _lock_tasks(db, [item.t_id for item in items])
+    existing = existing_employee_ids(db, [i.assigned_to for i in items] + [i.reviewer for i in items])
+
+    now = datetime.utcnow()
+    results, params, seen = [], [], set()
+    for index, item in enumerate(items):
+        task = tasks.get(item.t_id)
+        if item.t_id in seen:
+            results.append(_result(index, item.t_id, 400, "Duplicate task in request"))
+        elif task is None:
+            results.append(_result(index, item.t_id, 404, "Task not found"))
+        elif item.assigned_to not in existing:
+            results.append(_result(index, item.t_id, 404, "Employee not found"))
+        elif item.reviewer and item.reviewer not in existing:
+            results.append(_result(index, item.t_id, 404, "Reviewer not found"))
+        else:
+            results.append(_result(index, item.t_id))
+            # re-assigning to the same people changes nothing
+            if (task.assigned_to, task.reviewer) != (item.assigned_to, item.reviewer):
+                params.append({
+                    "t_id": item.t_id,
+                    "assigned_to": item.assigned_to,
+                    "reviewer": item.reviewer,
+                    "assigned_by": manager_id,
+                    "assigned_at": now
+                })
+        seen.add(item.t_id)
+
+    if params:
+        # ORM bulk UPDATE by primary key: one executemany statement
+        db.execute(update(Task), params)
+        enqueue_audits(db, "ASSIGN_TASK", "TASK", [p["t_id"] for p in params], manager_id)
+        db.commit()
+        invalidate_rollups(db, [tasks[p["t_id"]].assigned_to for p in params] + [p["assigned_to"] for p in params])
+
+    return _summary(results)
+
+
+def update_tasks_status_bulk(db: Session, items: list, user_id: int, role: str) -> dict:
+    """
+    Apply many status transitions under the same rules as update_task_status.
+
+    The tasks are locked while they are checked, and the qualifying ones are
+    moved with one conditional UPDATE per transition.
+    """
+    tasks = _lock_tasks(db, [item.t_id for item in items])
+
+    results, seen = [], set()
+    groups: dict = {}
+    remarks = []
+    for index, item in enumerate(items):
+        new_status = item.status.value if hasattr(item.status, "value") else item.status
+        transition = find_transition(role, new_status)
+        row = tasks.get(item.t_id)
+
+        if item.t_id in seen:
+            results.append(_result(index, item.t_id, 400, "Duplicate task in request"))
+        elif transition and transition.requires_remark and not item.remark:
+            results.append(_result(index, item.t_id, 400, "Remark required"))
+        elif transition is None or not qualifies(transition, row, user_id):
+            status_code, detail = rejection_reason(row, role, user_id)
+            results.append(_result(index, item.t_id, status_code, detail))
+        else:
+            results.append(_result(index, item.t_id))
+            groups.setdefault(transition, []).append(item.t_id)
+            if transition.requires_remark:
+                remarks.append((item.t_id, item.remark, user_id))
+        seen.add(item.t_id)
+
+    if groups:
+        for transition, task_ids in groups.items():
+            db.execute(compile_transition(transition, task_ids, user_id))
+        enqueue_remarks(db, remarks)
+        enqueue_audits(db, "UPDATE_TASK_STATUS", "TASK", [t for ids in groups.values() for t in ids], user_id)
+        db.commit()
+        invalidate_rollups(db, [tasks[t].assigned_to for ids in groups.values() for t in ids])
+
+    return _summary(results)
@@ -2,11 +2,14 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from datetime import datetime
 from app.models.task import Task, TaskStatus
-from app.models.employee import Employee
 from app.models.user import User, UserStatus
 from app.services.remark_service import add_remark
 from sqlalchemy import and_
-from app.database.mongodb import remarks_collection
+from app.services.outbox import enqueue_audit, enqueue_remark
+from app.services.task_state_machine import find_transition, apply_transition, raise_rejected
+from app.services.employee_service import existing_employee_ids
+from app.services.org_rollup import invalidate_rollups
+from app.utils.model_updates import apply_changes
 from app.core.constants import Role, TaskStatus, Priority
 
 def create_task(db: Session, data, created_by: int):
@@ -22,8 +25,11 @@ def create_task(db: Session, data, created_by: int):
         reviewer=data.reviewer
     )
     db.add(task)
+    # the id is needed for the audit entry committed with the task
+    db.flush()
+    enqueue_audit(db, "CREATE_TASK", "TASK", task.t_id, created_by)
     db.commit()
-    db.refresh(task)
+    invalidate_rollups(db, [task.assigned_to])
     return task
 
 def assign_task(db: Session, task_id: int, data, manager_id: int):
@@ -31,87 +37,53 @@ def assign_task(db: Session, task_id: int, data, manager_id: int):
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    employee = db.query(Employee).filter(Employee.e_id == data.assigned_to).first()
-    if not employee:
+    existing = existing_employee_ids(db, [data.assigned_to, data.reviewer])
+    if data.assigned_to not in existing:
         raise HTTPException(status_code=404, detail="Employee not found")
+    if data.reviewer and data.reviewer not in existing:
+        raise HTTPException(status_code=404, detail="Reviewer not found")
 
-    if data.reviewer:
-        reviewer = db.query(Employee).filter(Employee.e_id == data.reviewer).first()
-        if not reviewer:
-            raise HTTPException(status_code=404, detail="Reviewer not found")
+    # re-assigning to the same people changes nothing
+    previous_assignee = task.assigned_to
+    if not apply_changes(task, {"assigned_to": data.assigned_to, "reviewer": data.reviewer}):
+        return task
 
-    task.assigned_to = data.assigned_to
     task.assigned_by = manager_id
     task.assigned_at = datetime.utcnow()
-    task.reviewer = data.reviewer
 
     db.commit()
-    db.refresh(task)
+    invalidate_rollups(db, [previous_assignee, task.assigned_to])
     return task
 
 
 def update_task_status(db: Session, task_id: int, data, user_id: int, role: str):
-    task = db.query(Task).filter(Task.t_id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    """
+    Move a task to `data.status` if the TRANSITIONS table allows it for this
+    role and user.
 
-
-    current_status = task.status.value if hasattr(task.status, "value") else task.status
+    The check and the write are one conditional UPDATE (see
+    task_state_machine), so concurrent transitions cannot overwrite each other.
+    """
     new_status = data.status.value if hasattr(data.status, "value") else data.status
+    transition = find_transition(role, new_status)
+
+    if transition and transition.requires_remark and not data.remark:
+        raise HTTPException(status_code=400, detail="Remark required")
 
-    # -------------------------
-    # DEVELOPER RULES
-    # -------------------------
-    if role == "DEVELOPER":
-        if task.assigned_to != user_id:
-            raise HTTPException(status_code=403, detail="Not your task")
-
-        allowed_transitions = {
-            "TO_DO": "IN_PROGRESS",
-            "IN_PROGRESS": "REVIEW"
-        }
-
-        if current_status not in allowed_transitions:
-            raise HTTPException(status_code=400, detail="Invalid status transition")
-
-        if allowed_transitions[current_status] != new_status:
-            raise HTTPException(status_code=400, detail="Invalid status transition")
-
-    # -------------------------
-    # REVIEWER (MANAGER) RULES
-    # -------------------------
-    elif role == "MANAGER":
-        if task.reviewer != user_id:
-            raise HTTPException(status_code=403, detail="Not reviewer")
-
-        if current_status == "REVIEW" and new_status == "DONE":
-            task.actual_closure = datetime.utcnow()
-
-        elif current_status == "REVIEW" and new_status == "IN_PROGRESS":
-            if not data.remark:
-                raise HTTPException(status_code=400, detail="Remark required")
-
-            remarks_collection.insert_one({
-                "task_id": task.t_id,
-                "comment": data.remark,
-                "commented_by": user_id,
-                "created_at": datetime.utcnow()
-            })
-        else:
-            raise HTTPException(status_code=400, detail="Invalid status transition")
-
-    else:
-        raise HTTPException(status_code=403, detail="Unauthorized role")
-
-    # -------------------------
-    # COMMON UPDATE
-    # -------------------------
-    task.status = new_status
-    task.updated_by = user_id
-    task.updated_at = datetime.utcnow()
+    task = apply_transition(db, transition, task_id, user_id) if transition else None
+    if task is None:
+        db.rollback()
+        raise_rejected(db, role, task_id, user_id)
 
+    if transition.requires_remark:
+        # delivered to Mongo by the outbox relay once this commit succeeds
+        enqueue_remark(db, task_id, data.remark, user_id)
+    enqueue_audit(db, "UPDATE_TASK_STATUS", "TASK", task_id, user_id)
+
+    # keep the row just read instead of reloading it after the commit
+    db.expunge(task)
     db.commit()
-    db.refresh(task)
+    invalidate_rollups(db, [task.assigned_to])
     return task
 
 # def get_tasks_by_status_service(status: TaskStatus, db: Session):
@@ -120,14 +92,21 @@ def update_task_status(db: Session, task_id: int, data, user_id: int, role: str)
 #     """
 #     return db.query(Task).filter(Task.status == status).all()
 
-def get_tasks_for_user(db: Session, role: str, user_id: int):
+def task_scope(role: str, user_id: int):
+    """Filter limiting tasks to those a user may see (None = all tasks)."""
     if role == "ADMIN":
-        return db.query(Task).all()
+        return None
     if role == "MANAGER":
-        return db.query(Task).filter(
-            (Task.created_by == user_id) | (Task.reviewer == user_id)
-        ).all()
-    return db.query(Task).filter(Task.assigned_to == user_id).all()
+        return (Task.created_by == user_id) | (Task.reviewer == user_id)
+    return Task.assigned_to == user_id
+
+
+def get_tasks_for_user(db: Session, role: str, user_id: int):
+    query = db.query(Task)
+    scope = task_scope(role, user_id)
+    if scope is not None:
+        query = query.filter(scope)
+    return query.all()
 
 
 def delete_task_by_id(db: Session, task_id: int):
@@ -138,6 +117,7 @@ def delete_task_by_id(db: Session, task_id: int):
 
     db.delete(task)
     db.commit()
+    invalidate_rollups(db, [task.assigned_to])
 
     return {
         "message": "Task deleted successfully",
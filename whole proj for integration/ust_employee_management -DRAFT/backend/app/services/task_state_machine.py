@@ -0,0 +1,154 @@
+# Task State Machine
+# Allowed status transitions, per role, as data. Each rule compiles into one
+# conditional UPDATE:
+#
+#   UPDATE tasks SET status = :target, ...
+#   WHERE t_id = :task_id AND status IN (:sources) AND <actor column> = :user_id
+#
+# so checking and applying a transition is a single atomic statement. Two
+# people acting on the same task at once cannot both succeed from the same
+# source status; the loser matches zero rows.
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.constants import Role, TaskStatus
+from app.models.task import Task
+
+
+@dataclass(frozen=True)
+class Transition:
+    sources: tuple[TaskStatus, ...]
+    target: TaskStatus
+    # Task column that must hold the acting user's e_id
+    actor_column: str
+    requires_remark: bool = False
+    closes_task: bool = False
+
+
+TRANSITIONS: dict[tuple[Role, TaskStatus], Transition] = {
+    # developer works the task through to review
+    (Role.DEVELOPER, TaskStatus.IN_PROGRESS): Transition((TaskStatus.TO_DO,), TaskStatus.IN_PROGRESS, "assigned_to"),
+    (Role.DEVELOPER, TaskStatus.REVIEW): Transition((TaskStatus.IN_PROGRESS,), TaskStatus.REVIEW, "assigned_to"),
+    # reviewer accepts, or sends it back with a remark
+    (Role.MANAGER, TaskStatus.DONE): Transition((TaskStatus.REVIEW,), TaskStatus.DONE, "reviewer", closes_task=True),
+    (Role.MANAGER, TaskStatus.IN_PROGRESS): Transition(
+        (TaskStatus.REVIEW,), TaskStatus.IN_PROGRESS, "reviewer", requires_remark=True
+    ),
+}
+
+# Which column identifies a role's tasks, for error messages
+ROLE_ACTOR = {
+    Role.DEVELOPER: ("assigned_to", "Not your task"),
+    Role.MANAGER: ("reviewer", "Not reviewer"),
+}
+
+
+def find_transition(role: str, target: str) -> Transition | None:
+    try:
+        return TRANSITIONS.get((Role(role), TaskStatus(target)))
+    except ValueError:
+        return None
+
+
+def _transition_values(transition: Transition, user_id: int) -> dict:
+    now = datetime.utcnow()
+    values = {
+        "status": transition.target.value,
+        "updated_by": user_id,
+        "updated_at": now,
+    }
+    if transition.closes_task:
+        values["actual_closure"] = now
+    return values
+
+
+def compile_transition(transition: Transition, task_id: int | list[int], user_id: int):
+    """
+    Conditional UPDATE applying `transition` only if the task still qualifies.
+    A list of ids moves every qualifying task of a bulk request at once.
+    """
+    id_filter = Task.t_id.in_(task_id) if isinstance(task_id, list) else Task.t_id == task_id
+    return (
+        update(Task)
+        .where(
+            id_filter,
+            Task.status.in_([s.value for s in transition.sources]),
+            getattr(Task, transition.actor_column) == user_id
+        )
+        .values(**_transition_values(transition, user_id))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def apply_transition(db: Session, transition: Transition, task_id: int, user_id: int) -> Task | None:
+    """
+    Run the transition's UPDATE in the session's transaction.
+
+    Uses UPDATE ... RETURNING where the dialect supports it (one statement);
+    MySQL has no RETURNING, so the new row is read back by primary key after
+    the UPDATE has matched.
+
+    Returns:
+        The updated task, or None when the task did not qualify
+    """
+    stmt = compile_transition(transition, task_id, user_id)
+
+    if db.get_bind().dialect.update_returning:
+        # a task already in the session would come back unchanged (DML
+        # RETURNING ignores populate_existing), so expire it and let the
+        # returned row refill it
+        cached = db.identity_map.get(db.identity_key(Task, task_id))
+        if cached is not None:
+            db.expire(cached)
+        return db.scalars(stmt.returning(Task)).first()
+
+    if db.execute(stmt).rowcount != 1:
+        return None
+    return db.scalars(
+        select(Task).where(Task.t_id == task_id).execution_options(populate_existing=True)
+    ).one()
+
+
+def rejection_reason(row, role: str, user_id: int) -> tuple[int, str]:
+    """
+    Status code and message for a transition that did not apply to `row`
+    (a task's status, assigned_to and reviewer; None if it does not exist).
+    """
+    if row is None:
+        return 404, "Task not found"
+
+    try:
+        actor = ROLE_ACTOR.get(Role(role))
+    except ValueError:
+        actor = None
+    if actor is None:
+        return 403, "Unauthorized role"
+
+    column, message = actor
+    if getattr(row, column) != user_id:
+        return 403, message
+
+    return 400, "Invalid status transition"
+
+
+def qualifies(transition: Transition, row, user_id: int) -> bool:
+    """Whether `row` can take `transition` right now (the UPDATE's WHERE, in Python)."""
+    return (
+        row is not None
+        and getattr(row.status, "value", row.status) in [s.value for s in transition.sources]
+        and getattr(row, transition.actor_column) == user_id
+    )
+
+
+def raise_rejected(db: Session, role: str, task_id: int, user_id: int):
+    """Explain why a transition matched no row (only runs on the failure path)."""
+    row = db.execute(
+        select(Task.status, Task.assigned_to, Task.reviewer).where(Task.t_id == task_id)
+    ).first()
+    status_code, detail = rejection_reason(row, role, user_id)
+    raise HTTPException(status_code=status_code, detail=detail)
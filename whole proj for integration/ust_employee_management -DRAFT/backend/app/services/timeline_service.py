@@ -0,0 +1,87 @@
+import heapq
+from itertools import islice
+
+from app.database.mongodb import remarks_collection, logs_collection
+from app.middleware.logger import READ_ACTION_PREFIXES
+from app.utils.pagination import encode_time_cursor, time_cursor_filter
+
+# Audit actions already represented by the remark itself
+REMARK_ACTIONS = ["CREATE_REMARK", "CREATE_REMARK_WITH_FILE"]
+
+
+def _remark_entry(doc: dict) -> dict:
+    # remarks not yet migrated by scripts/normalize_remark_authors.py use `commented_by` / `user_e_id`
+    actor = doc.get("e_id", doc.get("commented_by", doc.get("user_e_id")))
+    return {
+        "id": str(doc["_id"]),
+        "type": "remark",
+        "timestamp": doc["created_at"],
+        "actor": actor,
+        "action": "REMARK",
+        "comment": doc.get("comment"),
+        "file_id": doc.get("file_id"),
+        "file_name": doc.get("file_name"),
+        "_key": (doc["created_at"], doc["_id"])
+    }
+
+
+def _event_entry(doc: dict) -> dict:
+    return {
+        "id": str(doc["_id"]),
+        "type": "event",
+        "timestamp": doc["timestamp"],
+        "actor": doc["meta"].get("performed_by"),
+        "action": doc["action"],
+        "comment": None,
+        "file_id": None,
+        "file_name": None,
+        "_key": (doc["timestamp"], doc["_id"])
+    }
+
+
+def get_task_timeline(task_id: int, cursor: str | None, limit: int) -> dict:
+    """
+    Remarks and audit events of a task merged into one history, newest first.
+
+    Each source is read with its own cursor over its task index, limited to one
+    page, and the two streams are merged lazily by (timestamp, _id). Read-only
+    audit events are left out, as are the audit entries that duplicate a remark.
+
+    Returns:
+        {"items": [...], "next_cursor": str | None}
+    """
+    remarks = remarks_collection.find(
+        {"task_id": task_id, **time_cursor_filter(cursor, "created_at")},
+        {"task_id": 0}
+    ).sort([("created_at", -1), ("_id", -1)]).limit(limit + 1)
+
+    events = logs_collection.find(
+        {
+            "meta.entity_type": "TASK",
+            "meta.entity_id": task_id,
+            "action": {
+                "$nin": REMARK_ACTIONS,
+                "$not": {"$regex": f"^({'|'.join(READ_ACTION_PREFIXES)})"}
+            },
+            **time_cursor_filter(cursor, "timestamp")
+        },
+        {"timestamp": 1, "meta.performed_by": 1, "action": 1}
+    ).sort([("timestamp", -1), ("_id", -1)]).limit(limit + 1)
+
+    merged = heapq.merge(
+        map(_remark_entry, remarks),
+        map(_event_entry, events),
+        key=lambda entry: entry["_key"],
+        reverse=True
+    )
+    entries = list(islice(merged, limit + 1))
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    next_cursor = None
+    if has_more and entries:
+        next_cursor = encode_time_cursor(*entries[-1]["_key"])
+    for entry in entries:
+        del entry["_key"]
+
+    return {"items": entries, "next_cursor": next_cursor}
@@ -16,7 +16,11 @@ from passlib.context import CryptContext
 import logging
 
 # Use centralized password helpers (hash/verify) from utils so behavior is consistent
-from app.utils.password import hash_password, verify_password
+from app.utils.password import hash_password, hash_passwords, verify_password
+from app.utils.model_updates import apply_changes
+from app.services.outbox import enqueue_audits
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +37,7 @@ def create_user(db: Session, data):
         raise HTTPException(status_code=400, detail="User already exists")
 
     # Hash the password
-    hashed_password = hash_password(data.password)
+    hashed_password = hash_password(data.password or settings.DEFAULT_USER_PASSWORD)
 
     user = User(
         e_id=data.e_id,
@@ -45,9 +49,58 @@ def create_user(db: Session, data):
     db.add(user)
     db.commit()
     db.refresh(user)
-    logger.info(f"User created for employee ID: {data.e_id}")
+    logger.info("User created for employee ID: %s", data.e_id)
     return user
 
+def create_users_bulk(db: Session, items: list, created_by: int) -> dict:
+    """
+    Provision many accounts at once.
+
+    Employee and existing-account checks for the whole batch are one query,
+    passwords are hashed in parallel (see hash_passwords) and the accounts
+    are inserted together in one transaction. Invalid items are reported per
+    item; if the insert itself fails nothing is created.
+    """
+    e_ids = {item.e_id for item in items}
+    # one row per existing employee, with its account if there is one
+    found = dict(db.execute(
+        select(Employee.e_id, User.e_id)
+        .outerjoin(User, User.e_id == Employee.e_id)
+        .where(Employee.e_id.in_(e_ids))
+    ).all())
+
+    results, accepted, seen = [], [], set()
+    for index, item in enumerate(items):
+        result = {"index": index, "e_id": item.e_id, "ok": False, "status_code": 400, "error": None}
+        if item.e_id in seen:
+            result["error"] = "Duplicate employee in request"
+        elif item.e_id not in found:
+            result.update(status_code=404, error="Employee not found")
+        elif found[item.e_id] is not None:
+            result["error"] = "User already exists"
+        else:
+            result.update(ok=True, status_code=201)
+            accepted.append(item)
+        seen.add(item.e_id)
+        results.append(result)
+
+    if accepted:
+        hashed = hash_passwords([item.password or settings.DEFAULT_USER_PASSWORD for item in accepted])
+        try:
+            db.execute(insert(User), [
+                {"e_id": item.e_id, "password": password, "role": item.role, "status": UserStatus.ACTIVE}
+                for item, password in zip(accepted, hashed)
+            ])
+            enqueue_audits(db, "CREATE_USER", "USER", [item.e_id for item in accepted], created_by)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Accounts changed during provisioning; retry the request")
+        logger.info("Provisioned %d users", len(accepted))
+
+    succeeded = len(accepted)
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
 def get_all_users(db: Session):
     return db.query(User).all()
 
@@ -68,22 +121,25 @@ def get_user(db: Session, e_id: int):
 
 
 def update_user(db: Session, e_id: int, payload: UserUpdate):
+    """Returns (user, {field: new value} for what changed)."""
     user = db.query(User).filter(User.e_id == e_id).first()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    changes = {}
     if payload.role is not None:
-        user.role = payload.role.value   # ✅ ENUM → STRING
+        changes["role"] = payload.role.value   # ✅ ENUM → STRING
 
     if payload.status is not None:
-        user.status = payload.status.value  # ✅ ENUM → STRING
-
-    user.updated_at = datetime.now(timezone.utc)
+        changes["status"] = payload.status.value  # ✅ ENUM → STRING
 
-    db.commit()
-    db.refresh(user)
-    return user
+    # skip the write entirely when nothing differs
+    changed = apply_changes(user, changes)
+    if changed:
+        user.updated_at = datetime.now(timezone.utc)
+        db.commit()
+    return user, changed
 
 def delete_user(db: Session, e_id: int):
     user = get_user(db, e_id)
@@ -124,7 +180,7 @@ def change_password(db: Session, e_id: int, request: ChangePasswordRequest):
 
     db.commit()
     db.refresh(user)
-    logger.info(f"Password changed for user ID: {e_id}")
+    logger.info("Password changed for user ID: %s", e_id)
     return {"message": "Password changed successfully"}
 
 def request_password_reset(db: Session, request: ResetPasswordRequest):
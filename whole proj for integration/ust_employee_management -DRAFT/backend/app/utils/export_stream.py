@@ -0,0 +1,77 @@
+# Streaming Row Encoder
+# Turns an iterator of rows into CSV or NDJSON bytes a block at a time, with
+# optional gzip, so an export is sent while it is still being read and its
+# memory use does not grow with the number of rows.
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from typing import Iterable, Iterator, Sequence
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# encoded bytes collected before a block is yielded
+BLOCK_SIZE = 64 * 1024
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_lines(columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(["" if v is None else _plain(v) for v in row])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # header only, for an empty export
+    yield buffer.getvalue()
+
+
+def _ndjson_lines(columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps({c: _plain(v) for c, v in zip(columns, row)}, ensure_ascii=False) + "\n"
+
+
+def stream_rows(columns: Sequence[str], rows: Iterable[Sequence], fmt: str = "csv",
+                compress: bool = False) -> Iterator[bytes]:
+    """
+    Yield `rows` (sequences in `columns` order) encoded as `fmt`.
+
+    Output is grouped into blocks of about BLOCK_SIZE bytes; with `compress`
+    each block is fed through one incremental gzip stream.
+    """
+    lines = _csv_lines(columns, rows) if fmt == "csv" else _ndjson_lines(columns, rows)
+    gzip = zlib.compressobj(wbits=31) if compress else None
+
+    block, size = [], 0
+    for line in lines:
+        data = line.encode("utf-8")
+        block.append(data)
+        size += len(data)
+        if size >= BLOCK_SIZE:
+            data = b"".join(block)
+            block, size = [], 0
+            if gzip:
+                data = gzip.compress(data)
+            if data:
+                yield data
+
+    data = b"".join(block)
+    if gzip:
+        data = gzip.compress(data) + gzip.flush()
+    if data:
+        yield data
@@ -1,26 +1,75 @@
+import hashlib
+from datetime import datetime
 from gridfs import GridFS
-from app.database.mongodb import mongo_db
+from app.database.mongodb import mongo_db, attachments_collection
 
 from bson import ObjectId
 from app.database.mongodb import fs
+from app.utils.gridfs_cache import file_cache
 
 fs = GridFS(mongo_db)
 
 
-def save_file(file):
+def catalog_entry(file_id, metadata: dict, filename, content_type, size: int, uploaded_at) -> dict:
+    """Shape of an attachment catalog document (keyed by the GridFS file id)."""
+    return {
+        "_id": ObjectId(file_id),
+        "type": metadata.get("type"),
+        "task_id": metadata.get("task_id"),
+        "remark_id": metadata.get("remark_id"),
+        "employee_id": metadata.get("employee_id"),
+        "filename": filename,
+        "content_type": content_type,
+        "size": size,
+        "sha256": metadata.get("sha256"),
+        "uploaded_at": uploaded_at
+    }
+
+
+def save_file(file, metadata: dict | None = None):
+    """
+    Store an upload in GridFS and record it in the attachment catalog.
+
+    `metadata` may carry type, task_id, remark_id and employee_id; the SHA-256
+    of the content is added automatically.
+    """
     content = file.file.read()
+    metadata = {**(metadata or {}), "sha256": hashlib.sha256(content).hexdigest()}
     file_id = fs.put(
         content,
         filename=file.filename,
-        content_type=file.content_type
+        content_type=file.content_type,
+        metadata=metadata
     )
+    attachments_collection.insert_one(catalog_entry(
+        file_id, metadata, file.filename, file.content_type, len(content), datetime.utcnow()
+    ))
     return str(file_id)
 
 
 
 
 def delete_file(file_id: str):
+    file_cache.invalidate(str(file_id))
     try:
         fs.delete(ObjectId(file_id))
+        attachments_collection.delete_one({"_id": ObjectId(file_id)})
     except Exception:
         pass  # safe delete (file may already be gone)
+
+
+def delete_files(file_ids) -> int:
+    """
+    Delete many GridFS files and their catalog entries with one call per
+    collection. Returns the number of files removed.
+    """
+    object_ids = [ObjectId(f) for f in file_ids]
+    if not object_ids:
+        return 0
+    for file_id in object_ids:
+        file_cache.invalidate(str(file_id))
+
+    result = mongo_db["fs.files"].delete_many({"_id": {"$in": object_ids}})
+    mongo_db["fs.chunks"].delete_many({"files_id": {"$in": object_ids}})
+    attachments_collection.delete_many({"_id": {"$in": object_ids}})
+    return result.deleted_count
@@ -0,0 +1,143 @@
+# GridFS Object Cache
+# Read-through LRU cache for small GridFS files (avatars, small attachments).
+# The cache is bounded by the total bytes it holds rather than by entry count,
+# and files above a size threshold bypass it and are streamed from Mongo.
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from gridfs.errors import NoFile
+
+from app.core.config import settings
+from app.utils.gridfs_reader import GridFSPrefetchReader, open_download
+
+
+@dataclass(frozen=True)
+class CachedFile:
+    data: bytes
+    filename: str | None
+    content_type: str | None
+
+    @property
+    def length(self) -> int:
+        return len(self.data)
+
+
+class GridFSCache:
+    """
+    Thread-safe LRU cache of GridFS file contents keyed by file id.
+
+    Args:
+        max_bytes (int): Upper bound on the summed size of cached files
+        max_object_bytes (int): Files larger than this are never cached
+    """
+
+    def __init__(self, max_bytes: int, max_object_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_object_bytes = min(max_object_bytes, max_bytes)
+        self._entries: OrderedDict[str, CachedFile] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def accepts(self, length: int) -> bool:
+        return length <= self.max_object_bytes
+
+    def record_bypass(self):
+        with self._lock:
+            self.bypasses += 1
+
+    def get(self, file_id: str) -> CachedFile | None:
+        with self._lock:
+            entry = self._entries.get(file_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(file_id)
+            self.hits += 1
+            return entry
+
+    def put(self, file_id: str, entry: CachedFile) -> CachedFile:
+        if not self.accepts(entry.length):
+            return entry
+
+        with self._lock:
+            previous = self._entries.pop(file_id, None)
+            if previous is not None:
+                self._bytes -= previous.length
+
+            self._entries[file_id] = entry
+            self._bytes += entry.length
+
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.length
+                self.evictions += 1
+        return entry
+
+    def invalidate(self, file_id: str):
+        with self._lock:
+            entry = self._entries.pop(file_id, None)
+            if entry is not None:
+                self._bytes -= entry.length
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_object_bytes": self.max_object_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "bypasses": self.bypasses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+file_cache = GridFSCache(
+    max_bytes=settings.GRIDFS_CACHE_MAX_BYTES,
+    max_object_bytes=settings.GRIDFS_CACHE_MAX_OBJECT_BYTES
+)
+
+
+def fetch_file(file_id: str) -> CachedFile | GridFSPrefetchReader:
+    """
+    Read a GridFS file through the cache.
+
+    Small files come back as a CachedFile served from (and stored in) RAM;
+    files above the size threshold come back as a streaming reader.
+
+    Raises:
+        NoFile: If the id is malformed or the file does not exist
+    """
+    # canonical form, the same key delete_file invalidates
+    try:
+        file_id = str(ObjectId(file_id))
+    except (InvalidId, TypeError):
+        raise NoFile(f"Invalid file id: {file_id}")
+
+    cached = file_cache.get(file_id)
+    if cached is not None:
+        return cached
+
+    reader = open_download(file_id)
+    if not file_cache.accepts(reader.length):
+        file_cache.record_bypass()
+        return reader
+
+    return file_cache.put(
+        file_id,
+        CachedFile(reader.read(), reader.filename, reader.content_type)
+    )
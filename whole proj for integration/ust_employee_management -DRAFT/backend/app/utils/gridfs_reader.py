@@ -0,0 +1,165 @@
+# GridFS Prefetching Reader
+# Streams a GridFS file by reading fs.chunks through a single cursor instead of
+# iterating GridOut (which issues one Mongo fetch per 255 KB chunk). Chunks are
+# fetched in batches by a background thread, coalesced into larger buffers and
+# handed to the response through a bounded queue, so Mongo reads overlap with
+# network writes while memory per download stays capped.
+
+import queue
+import threading
+
+from bson import ObjectId
+from gridfs.errors import CorruptGridFile, NoFile
+
+from app.core.config import settings
+from app.database.mongodb import mongo_db
+
+files_collection = mongo_db["fs.files"]
+chunks_collection = mongo_db["fs.chunks"]
+
+_DONE = object()
+
+
+class GridFSPrefetchReader:
+    """
+    Iterable over the content of one GridFS file.
+
+    Memory held per download is bounded by roughly
+    (prefetch_depth + 1) * buffer_bytes + prefetch_chunks * chunk_size.
+
+    Args:
+        file_doc (dict): The fs.files document of the file to stream
+        prefetch_chunks (int): Chunks requested from Mongo per cursor batch
+        buffer_bytes (int): Target size of each buffer yielded to the caller
+        prefetch_depth (int): Buffers that may be queued ahead of the consumer
+    """
+
+    def __init__(
+        self,
+        file_doc: dict,
+        prefetch_chunks: int = settings.GRIDFS_PREFETCH_CHUNKS,
+        buffer_bytes: int = settings.GRIDFS_STREAM_BUFFER_BYTES,
+        prefetch_depth: int = settings.GRIDFS_PREFETCH_DEPTH
+    ):
+        self.file_id = file_doc["_id"]
+        self.filename = file_doc.get("filename")
+        self.content_type = file_doc.get("contentType") or file_doc.get("content_type")
+        self.length = file_doc.get("length", 0)
+        self.chunk_size = file_doc.get("chunkSize")
+        self.upload_date = file_doc.get("uploadDate")
+        self.prefetch_chunks = max(1, prefetch_chunks)
+        self.buffer_bytes = max(1, buffer_bytes)
+        self.prefetch_depth = max(1, prefetch_depth)
+
+    def _put(self, buffers: queue.Queue, item, stop: threading.Event) -> bool:
+        # Block while the consumer is behind, but give up once it has gone away
+        while not stop.is_set():
+            try:
+                buffers.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _iter_chunks(self):
+        # Yields chunk payloads in order through one batched cursor,
+        # checking that none are missing
+        cursor = chunks_collection.find(
+            {"files_id": self.file_id},
+            {"_id": 0, "n": 1, "data": 1},
+            sort=[("n", 1)],
+            batch_size=self.prefetch_chunks
+        )
+        try:
+            expected_n = 0
+            received = 0
+            for chunk in cursor:
+                if chunk["n"] != expected_n:
+                    raise CorruptGridFile(
+                        f"Missing chunk {expected_n} of file {self.file_id}"
+                    )
+                expected_n += 1
+                received += len(chunk["data"])
+                yield chunk["data"]
+
+            if received != self.length:
+                raise CorruptGridFile(
+                    f"File {self.file_id} is truncated ({received} of {self.length} bytes)"
+                )
+        finally:
+            cursor.close()
+
+    def _produce(self, buffers: queue.Queue, stop: threading.Event):
+        chunks = self._iter_chunks()
+        try:
+            pending = bytearray()
+            for data in chunks:
+                if stop.is_set():
+                    return
+                pending += data
+
+                if len(pending) >= self.buffer_bytes:
+                    if not self._put(buffers, bytes(pending), stop):
+                        return
+                    pending = bytearray()
+
+            if pending and not self._put(buffers, bytes(pending), stop):
+                return
+            self._put(buffers, _DONE, stop)
+
+        except Exception as e:
+            # Surface reader errors to the consumer thread
+            self._put(buffers, e, stop)
+        finally:
+            chunks.close()
+
+    def read(self) -> bytes:
+        """Read the whole file on the calling thread (meant for small files)."""
+        if not self.length:
+            return b""
+        return b"".join(self._iter_chunks())
+
+    def __iter__(self):
+        if not self.length:
+            return
+
+        buffers: queue.Queue = queue.Queue(maxsize=self.prefetch_depth)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce,
+            args=(buffers, stop),
+            name=f"gridfs-prefetch-{self.file_id}",
+            daemon=True
+        )
+        producer.start()
+
+        try:
+            while True:
+                item = buffers.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Also runs when the client disconnects and the response closes us
+            stop.set()
+
+
+def open_download(file_id: str) -> GridFSPrefetchReader:
+    """
+    Look up a GridFS file and return a prefetching reader for it.
+
+    Raises:
+        NoFile: If the id is malformed or no such file exists
+    """
+    try:
+        oid = ObjectId(file_id)
+    except Exception:
+        raise NoFile(f"Invalid file id: {file_id}")
+
+    file_doc = files_collection.find_one({"_id": oid})
+    if not file_doc:
+        raise NoFile(f"No file with id {file_id}")
+
+    return GridFSPrefetchReader(file_doc)
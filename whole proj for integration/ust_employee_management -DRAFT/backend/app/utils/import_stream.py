@@ -0,0 +1,60 @@
+# Streaming Row Decoder
+# Reads CSV (with a header row) or JSON lines from a binary file object one
+# record at a time, the counterpart of export_stream. Records are numbered
+# from 1 in file order so errors can be reported against the input row.
+
+import csv
+import io
+import json
+from typing import BinaryIO, Iterator
+
+from fastapi import HTTPException
+
+FORMATS = ("csv", "ndjson")
+SUFFIXES = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+def resolve_format(filename: str | None, fmt: str | None = None) -> str:
+    """The explicit `fmt`, else the one implied by the file name."""
+    if fmt:
+        return fmt
+    for suffix, implied in SUFFIXES.items():
+        if filename and filename.lower().endswith(suffix):
+            return implied
+    raise HTTPException(status_code=400, detail="Cannot tell the file format; pass format=csv or format=ndjson")
+
+
+def iter_records(stream: BinaryIO, fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """
+    Yield (row number, record, error) for each record in `stream`.
+
+    A record that cannot be decoded comes back as (row, None, error) so the
+    caller can report it and carry on. Empty CSV cells become None.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            for row, record in enumerate(csv.DictReader(text), start=1):
+                if None in record:
+                    yield row, None, "More values than header columns"
+                    continue
+                yield row, {k: (v if v != "" else None) for k, v in record.items()}, None
+            return
+
+        row = 0
+        for line in text:
+            if not line.strip():
+                continue
+            row += 1
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield row, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield row, None, "Each line must be a JSON object"
+                continue
+            yield row, record, None
+    finally:
+        # leave the underlying upload open for its owner
+        text.detach()
@@ -0,0 +1,23 @@
+from enum import Enum
+
+
+def _plain(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def apply_changes(instance, values: dict) -> dict:
+    """
+    Set only the attributes whose value actually differs.
+
+    Enum members and their raw values compare equal, so "ACTIVE" does not
+    count as a change of UserStatus.ACTIVE.
+
+    Returns:
+        {attribute: new value} for the attributes that changed (empty for a no-op)
+    """
+    changed = {}
+    for key, value in values.items():
+        if _plain(getattr(instance, key)) != _plain(value):
+            setattr(instance, key, value)
+            changed[key] = value
+    return changed
@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+from app.utils.mongo_serializer import serialize_mongo
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def parse_cursor(cursor: str | None) -> ObjectId | None:
+    if not cursor:
+        return None
+    try:
+        return ObjectId(cursor)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate_by_id(collection, query: dict, cursor: str | None, limit: int, projection: dict | None = None) -> dict:
+    """
+    Keyset pagination over a Mongo collection, newest `_id` first.
+
+    The cursor is the `_id` of the last item on the previous page, so every page
+    is an index range scan instead of a growing skip.
+
+    Returns:
+        {"items": [...], "next_cursor": str | None}
+    """
+    after = parse_cursor(cursor)
+    if after is not None:
+        query = {**query, "_id": {"$lt": after}}
+
+    docs = list(collection.find(query, projection).sort("_id", -1).limit(limit + 1))
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+
+    return {
+        "items": [serialize_mongo(d) for d in docs],
+        "next_cursor": str(docs[-1]["_id"]) if has_more and docs else None
+    }
+
+
+def encode_time_cursor(timestamp: datetime, _id) -> str:
+    """Cursor for keyset pagination over (timestamp, _id), newest first."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return f"{int(timestamp.timestamp() * 1000)}_{_id}"
+
+
+def decode_time_cursor(cursor: str | None) -> tuple[datetime, ObjectId] | None:
+    if not cursor:
+        return None
+    try:
+        millis, _id = cursor.split("_", 1)
+        return datetime.fromtimestamp(int(millis) / 1000, tz=timezone.utc), ObjectId(_id)
+    except (ValueError, InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def time_cursor_filter(cursor: str | None, field: str = "timestamp") -> dict:
+    """Mongo filter selecting documents strictly after `cursor` in newest-first order."""
+    after = decode_time_cursor(cursor)
+    if after is None:
+        return {}
+    timestamp, _id = after
+    return {"$or": [
+        {field: {"$lt": timestamp}},
+        {field: timestamp, "_id": {"$lt": _id}}
+    ]}
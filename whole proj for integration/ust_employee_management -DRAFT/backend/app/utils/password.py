@@ -1,5 +1,12 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
 from passlib.context import CryptContext
 
+from app.core.config import settings
+
 # Support both bcrypt (preferred) and pbkdf2_sha256 (used for seeding fallback)
 # This lets verify() accept hashes produced by either scheme. In production
 # prefer only bcrypt (or argon2) and re-hash legacy pbkdf2 hashes on login.
@@ -14,3 +21,37 @@ def verify_password(plain: str, hashed: str) -> bool:
     except Exception:
         # If verification fails due to unknown hash format, return False
         return False
+
+
+# bcrypt is deliberately slow and CPU bound, so bulk hashing is spread over
+# worker processes. The pool is started on first use; "spawn" keeps the
+# workers from inheriting the API process's threads and connections.
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_pool_lock = threading.Lock()
+
+
+def _hash_workers() -> int:
+    return settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """Hash many passwords in parallel; results are in input order."""
+    global _hash_pool
+    workers = _hash_workers()
+    if len(passwords) < 2 or workers == 1:
+        return [hash_password(p) for p in passwords]
+
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    # a few chunks per worker keeps every core busy to the end
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(_hash_pool.map(hash_password, passwords, chunksize=chunksize))
+
+
+def shutdown_hash_pool():
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown()
+            _hash_pool = None
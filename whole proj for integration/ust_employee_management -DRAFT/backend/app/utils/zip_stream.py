@@ -0,0 +1,69 @@
+# Streaming ZIP Writer
+# Builds a ZIP archive on the fly from GridFS readers. Members are written in
+# stored mode (no compression) with data descriptors, so nothing is buffered
+# beyond the current block and the first bytes go out as soon as the first
+# member starts.
+
+import zipfile
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from app.utils.gridfs_reader import GridFSPrefetchReader
+
+
+class _ZipPipe:
+    """Write-only sink that hands everything written so far to the caller."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _zip_date(value: datetime | None) -> tuple:
+    value = value or datetime.utcnow()
+    # ZIP timestamps cannot represent dates before 1980
+    if value.year < 1980:
+        value = datetime(1980, 1, 1)
+    return value.timetuple()[:6]
+
+
+def stream_zip(entries: Iterable[tuple[str, GridFSPrefetchReader]]) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive containing each (archive name, reader) pair.
+
+    Readers are consumed one at a time and only pulled from `entries` when the
+    previous member is complete, so `entries` may open files lazily.
+    """
+    pipe = _ZipPipe()
+    with zipfile.ZipFile(pipe, mode="w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for arcname, reader in entries:
+            info = zipfile.ZipInfo(arcname, date_time=_zip_date(reader.upload_date))
+            info.compress_type = zipfile.ZIP_STORED
+            info.file_size = reader.length  # decides up front whether zip64 is needed
+
+            with zf.open(info, mode="w") as member:
+                for block in reader:
+                    member.write(block)
+                    data = pipe.drain()
+                    if data:
+                        yield data
+
+            data = pipe.drain()
+            if data:
+                yield data
+
+    # central directory
+    data = pipe.drain()
+    if data:
+        yield data
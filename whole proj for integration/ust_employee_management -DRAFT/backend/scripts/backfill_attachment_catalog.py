@@ -0,0 +1,99 @@
+"""
+Backfill the attachment catalog from existing GridFS files.
+
+Walks fs.files in `_id` order in batches, resolves task/remark/uploader for
+remark attachments from the remarks collection and upserts one catalog entry
+per file. Files uploaded before hashing was added are read once to compute
+their SHA-256 (skip with --skip-hash). Safe to re-run; pass --after to resume
+from the last file id printed.
+
+Run from the backend folder:
+  python -m scripts.backfill_attachment_catalog [--batch-size 500] [--after <file_id>]
+"""
+import argparse
+import hashlib
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.database.mongodb import mongo_db, remarks_collection, attachments_collection
+from app.database.mongo_indexes import apply_indexes
+from app.utils.file_upload import catalog_entry
+from app.utils.gridfs_reader import GridFSPrefetchReader
+
+files_collection = mongo_db["fs.files"]
+
+# Derived files that are not attachments in their own right
+SKIPPED_TYPES = {"avatar_thumbnail"}
+
+
+def _sha256(file_doc: dict) -> str:
+    digest = hashlib.sha256()
+    for block in GridFSPrefetchReader(file_doc):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+def backfill(batch_size: int = 500, after: str | None = None, skip_hash: bool = False):
+    apply_indexes(["attachments"])
+
+    query = {"_id": {"$gt": ObjectId(after)}} if after else {}
+    total = 0
+
+    while True:
+        batch = list(files_collection.find(query).sort("_id", 1).limit(batch_size))
+        if not batch:
+            break
+
+        # Remarks store file ids as strings
+        owners = {
+            r["file_id"]: r
+            for r in remarks_collection.find(
+                {"file_id": {"$in": [str(f["_id"]) for f in batch]}},
+                {"task_id": 1, "e_id": 1, "commented_by": 1, "user_e_id": 1, "file_id": 1}
+            )
+        }
+
+        ops = []
+        for f in batch:
+            metadata = dict(f.get("metadata") or {})
+            if metadata.get("type") in SKIPPED_TYPES:
+                continue
+
+            remark = owners.get(str(f["_id"]))
+            if remark:
+                metadata.setdefault("type", "remark_attachment")
+                metadata.setdefault("task_id", remark.get("task_id"))
+                metadata.setdefault("remark_id", str(remark["_id"]))
+                metadata.setdefault(
+                    "employee_id",
+                    remark.get("e_id", remark.get("commented_by", remark.get("user_e_id")))
+                )
+            if not metadata.get("sha256") and not skip_hash:
+                metadata["sha256"] = _sha256(f)
+
+            entry = catalog_entry(
+                f["_id"], metadata, f.get("filename"), f.get("contentType"),
+                f.get("length", 0), f.get("uploadDate")
+            )
+            entry.pop("_id")
+            ops.append(UpdateOne({"_id": f["_id"]}, {"$set": entry}, upsert=True))
+
+        if ops:
+            attachments_collection.bulk_write(ops, ordered=False)
+
+        total += len(ops)
+        last_id = batch[-1]["_id"]
+        query = {"_id": {"$gt": last_id}}
+        print(f"Catalogued {total} files (last file id {last_id})")
+
+    print(f"✅ Attachment catalog backfilled ({total} files)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--after", help="resume after this GridFS file id")
+    parser.add_argument("--skip-hash", action="store_true", help="do not hash files lacking a stored SHA-256")
+    args = parser.parse_args()
+    backfill(args.batch_size, args.after, args.skip_hash)
@@ -0,0 +1,118 @@
+"""
+Count MongoDB round trips per remark operation.
+
+Runs each remark service operation against the configured database on a
+throwaway remark (task id -1) and prints how many commands it sent to the
+remarks collection and in total, plus the average latency over --repeat runs.
+
+Run from the backend folder:
+  python -m scripts.benchmark_remark_round_trips [--repeat 20]
+"""
+import argparse
+import io
+import time
+
+from pymongo import monitoring
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent by the client, per target collection."""
+
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+
+    def reset(self):
+        self.counts = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        name = target if isinstance(target, str) else event.command_name
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+counter = CommandCounter()
+# must be registered before the app creates its MongoClient
+monitoring.register(counter)
+
+from fastapi import HTTPException  # noqa: E402
+from starlette.datastructures import UploadFile  # noqa: E402
+
+from app.services.remark_service import (  # noqa: E402
+    add_remark,
+    delete_remark_by_id,
+    get_remarks_by_task,
+    update_remark,
+)
+
+TASK_ID = -1
+AUTHOR = -1
+
+
+def _upload(name: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(b"benchmark attachment"), filename=name)
+
+
+def _measure(label: str, operation, repeat: int):
+    calls, remark_calls, elapsed = 0, 0, 0.0
+    for _ in range(repeat):
+        setup = operation()
+        counter.reset()
+        started = time.perf_counter()
+        try:
+            setup()
+        except HTTPException:
+            pass
+        elapsed += time.perf_counter() - started
+        calls += sum(counter.counts.values())
+        remark_calls += counter.counts.get("remarks", 0)
+    print(f"{label:<32}{remark_calls / repeat:>10.1f}{calls / repeat:>10.1f}{1000 * elapsed / repeat:>12.2f}")
+
+
+def _new_remark(with_file: bool = False) -> str:
+    file = _upload("before.txt") if with_file else None
+    return add_remark(TASK_ID, "benchmark", AUTHOR, file)["_id"]
+
+
+def run(repeat: int):
+    print(f"{'operation':<32}{'remarks':>10}{'total':>10}{'ms':>12}")
+
+    _measure("add remark", lambda: lambda: add_remark(TASK_ID, "benchmark", AUTHOR), repeat)
+    _measure("list remarks", lambda: lambda: get_remarks_by_task(TASK_ID), repeat)
+
+    def edit_comment():
+        remark_id = _new_remark()
+        return lambda: update_remark(remark_id, "edited", None, AUTHOR, "DEVELOPER")
+    _measure("edit comment (owner)", edit_comment, repeat)
+
+    def edit_forbidden():
+        remark_id = _new_remark()
+        return lambda: update_remark(remark_id, "edited", None, AUTHOR - 1, "DEVELOPER")
+    _measure("edit comment (not owner)", edit_forbidden, repeat)
+
+    def replace_file():
+        remark_id = _new_remark(with_file=True)
+        return lambda: update_remark(remark_id, None, _upload("after.txt"), AUTHOR, "DEVELOPER")
+    _measure("replace attachment", replace_file, repeat)
+
+    def delete():
+        remark_id = _new_remark(with_file=True)
+        return lambda: delete_remark_by_id(remark_id)
+    _measure("delete remark with file", delete, repeat)
+
+    # clean up what the benchmark created
+    for remark in get_remarks_by_task(TASK_ID):
+        delete_remark_by_id(remark["_id"])
+    print("✅ Benchmark finished")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.repeat)
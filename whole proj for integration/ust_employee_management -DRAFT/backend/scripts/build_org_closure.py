@@ -0,0 +1,31 @@
+"""
+Create the MySQL `employee_closure` table and fill it from employees.mgr_id
+(see app/services/org_hierarchy.py). Safe to re-run: the table is rebuilt
+from scratch in one transaction. Fails without changes if mgr_id contains a
+reporting cycle, listing the employees involved.
+
+Run from the backend folder:
+  python -m scripts.build_org_closure
+"""
+import argparse
+
+from app.database.mysql import engine, SessionLocal
+from app.models.employee_closure import EmployeeClosure
+from app.services.org_hierarchy import rebuild_closure
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+
+    EmployeeClosure.__table__.create(engine, checkfirst=True)
+    db = SessionLocal()
+    try:
+        rows = rebuild_closure(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print(f"✅ employee_closure rebuilt ({rows} rows)")
@@ -0,0 +1,50 @@
+"""
+Import employees or tasks from a CSV (with header row) or JSON lines file,
+the same way as POST /api/employees/import and POST /api/tasks/import (see
+app/services/import_service.py). Prints the import report as JSON.
+
+Run from the backend folder:
+  python -m scripts.import_data employees people.csv [--chunk-size 1000]
+  python -m scripts.import_data tasks sprint.ndjson --created-by 1
+"""
+import argparse
+import json
+
+from app.core.config import settings
+from app.database.mysql import SessionLocal
+from app.services.import_service import import_employees, import_tasks
+from app.utils.import_stream import FORMATS, iter_records, resolve_format
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("entity", choices=["employees", "tasks"])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE)
+    parser.add_argument("--created-by", type=int, help="creator of imported tasks without created_by")
+    parser.add_argument("--report", help="also write the report to this file")
+    args = parser.parse_args()
+
+    if args.entity == "tasks" and args.created_by is None:
+        parser.error("--created-by is required for tasks")
+
+    fmt = resolve_format(args.path, args.format)
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as f:
+            records = iter_records(f, fmt)
+            if args.entity == "employees":
+                report = import_employees(db, records, args.chunk_size)
+            else:
+                report = import_tasks(db, records, args.created_by, args.chunk_size)
+    finally:
+        db.close()
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(output)
+
+    print(f"✅ Imported {report['imported']} of {report['total']} {args.entity} ({report['failed']} failed)")
@@ -0,0 +1,68 @@
+"""
+Copy audit entries from the legacy `logs` collection into the audit
+time-series collection (settings.AUDIT_COLLECTION).
+
+Documents are read in `_id` order and inserted in ordered batches with their
+original `_id`, so the newest copied `_id` is a true high-water mark and
+re-running after an interruption or a write error resumes right after it.
+The legacy collection is left in place; drop it once the copy is verified.
+
+Run from the backend folder:
+  python -m scripts.migrate_logs_to_timeseries [--batch-size 1000]
+"""
+import argparse
+
+from pymongo.errors import BulkWriteError
+
+from app.database.mongodb import mongo_db, logs_collection
+from app.database.mongo_indexes import ensure_audit_collection
+
+legacy_logs = mongo_db["logs"]
+
+
+def migrate(batch_size: int = 1000):
+    ensure_audit_collection()
+
+    # Resume after the newest legacy id already copied
+    last = logs_collection.find_one({"legacy": True}, sort=[("_id", -1)])
+    query = {"_id": {"$gt": last["_id"]}} if last else {}
+    total = 0
+
+    while True:
+        batch = list(legacy_logs.find(query).sort("_id", 1).limit(batch_size))
+        if not batch:
+            break
+
+        docs = [{
+            "_id": log["_id"],
+            "timestamp": log.get("timestamp") or log["_id"].generation_time,
+            "meta": {
+                "performed_by": log.get("performed_by"),
+                "entity_type": log.get("entity_type") or ("TASK" if "task_id" in log else None),
+                "entity_id": log.get("entity_id", log.get("task_id"))
+            },
+            "action": log.get("action"),
+            "legacy": True
+        } for log in batch]
+
+        try:
+            # ordered: a failure stops at the failing document, so nothing
+            # after it is stored and skipped on the next run
+            logs_collection.insert_many(docs, ordered=True)
+        except BulkWriteError as e:
+            total += e.details.get("nInserted", 0)
+            print(f"Stopped after {total} log entries: {e.details['writeErrors'][0]['errmsg']}")
+            raise
+
+        total += len(docs)
+        query = {"_id": {"$gt": batch[-1]["_id"]}}
+        print(f"Copied {total} log entries")
+
+    print(f"✅ Legacy logs migrated ({total} entries)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    migrate(args.batch_size)
@@ -0,0 +1,123 @@
+"""
+Normalize the author field of remarks to `e_id`.
+
+Older remarks store the author as `commented_by` (status-change remarks, init
+data) or `user_e_id` (seed data). This job walks the remarks collection in
+`_id` order, sets `e_id` from whichever field is present and removes the
+legacy ones, one bulk_write per batch. When it finishes, the
+(e_id, created_at) index is built.
+
+Progress is checkpointed in the `migrations` collection after every batch, so
+an interrupted run resumes where it stopped (--restart starts over). Use
+--max-docs-per-second and --pause to limit the load on a busy primary.
+
+Run from the backend folder:
+  python -m scripts.normalize_remark_authors [--batch-size 500] [--max-docs-per-second 2000]
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
+from app.database.mongodb import mongo_db, remarks_collection
+from app.database.mongo_indexes import apply_indexes
+
+MIGRATION_ID = "normalize_remark_authors"
+LEGACY_AUTHOR_FIELDS = ("commented_by", "user_e_id")
+
+migrations_collection = mongo_db["migrations"]
+
+# Remarks still carrying a legacy author field, or no author at all
+NEEDS_UPDATE = {"$or": [
+    {"e_id": {"$exists": False}},
+    *({field: {"$exists": True}} for field in LEGACY_AUTHOR_FIELDS)
+]}
+
+
+def _load_checkpoint(restart: bool) -> dict:
+    if restart:
+        migrations_collection.delete_one({"_id": MIGRATION_ID})
+    return migrations_collection.find_one({"_id": MIGRATION_ID}) or {"last_id": None, "updated": 0}
+
+
+def _save_checkpoint(last_id, updated: int, finished: bool = False):
+    migrations_collection.update_one(
+        {"_id": MIGRATION_ID},
+        {"$set": {
+            "last_id": last_id,
+            "updated": updated,
+            "finished": finished,
+            "checkpointed_at": datetime.now(timezone.utc)
+        }},
+        upsert=True
+    )
+
+
+def _author(remark: dict):
+    if remark.get("e_id") is not None:
+        return remark["e_id"]
+    for field in LEGACY_AUTHOR_FIELDS:
+        if remark.get(field) is not None:
+            return remark[field]
+    return None
+
+
+def normalize(batch_size: int = 500, max_docs_per_second: float = 0, pause: float = 0, restart: bool = False):
+    checkpoint = _load_checkpoint(restart)
+    last_id, updated = checkpoint["last_id"], checkpoint["updated"]
+    if last_id:
+        print(f"Resuming after remark {last_id} ({updated} already updated)")
+
+    projection = {"e_id": 1, **{field: 1 for field in LEGACY_AUTHOR_FIELDS}}
+
+    while True:
+        query = {**NEEDS_UPDATE, "_id": {"$gt": last_id}} if last_id else NEEDS_UPDATE
+        started = time.monotonic()
+
+        batch = list(remarks_collection.find(query, projection).sort("_id", 1).limit(batch_size))
+        if not batch:
+            break
+
+        ops = [
+            UpdateOne(
+                {"_id": remark["_id"]},
+                {
+                    "$set": {"e_id": _author(remark)},
+                    "$unset": {field: "" for field in LEGACY_AUTHOR_FIELDS}
+                }
+            )
+            for remark in batch
+        ]
+        result = remarks_collection.bulk_write(ops, ordered=False)
+
+        updated += result.modified_count
+        last_id = batch[-1]["_id"]
+        _save_checkpoint(last_id, updated)
+        print(f"Normalized {updated} remarks (last remark id {last_id})")
+
+        # Throttle: keep under the requested rate, plus an optional fixed pause
+        if max_docs_per_second:
+            remaining = len(batch) / max_docs_per_second - (time.monotonic() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+        if pause:
+            time.sleep(pause)
+
+    _save_checkpoint(last_id, updated, finished=True)
+
+    report = apply_indexes(["remarks"])
+    if report["failed"]:
+        print(f"Index creation failed: {report['failed']}")
+
+    print(f"✅ Remark authors normalized ({updated} remarks)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--max-docs-per-second", type=float, default=0, help="0 = unthrottled")
+    parser.add_argument("--pause", type=float, default=0, help="extra seconds to sleep between batches")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start over")
+    args = parser.parse_args()
+    normalize(args.batch_size, args.max_docs_per_second, args.pause, args.restart)
@@ -0,0 +1,44 @@
+"""
+Create the MySQL `outbox_events` table and/or run the outbox relay on its own.
+
+The API process runs a relay thread by default (OUTBOX_RELAY_ENABLED). Use
+this script to run the relay as a separate worker instead, or to deliver the
+backlog once (--once). Relays may run side by side; rows are claimed with
+SKIP LOCKED.
+
+Run from the backend folder:
+  python -m scripts.outbox_relay --create-table
+  python -m scripts.outbox_relay [--once]
+"""
+import argparse
+
+from app.core.logging_config import configure_logging
+from app.database.mysql import engine
+from app.models.outbox import OutboxEvent
+from app.services.outbox import OutboxRelay, relay_batch
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--create-table", action="store_true", help="create outbox_events if missing and exit")
+    parser.add_argument("--once", action="store_true", help="deliver everything that is due, then exit")
+    args = parser.parse_args()
+    configure_logging()
+
+    if args.create_table:
+        OutboxEvent.__table__.create(engine, checkfirst=True)
+        print("✅ outbox_events table in place")
+    elif args.once:
+        total = 0
+        while True:
+            delivered = relay_batch()
+            if not delivered:
+                break
+            total += delivered
+        print(f"✅ Outbox drained ({total} events processed)")
+    else:
+        relay = OutboxRelay()
+        try:
+            relay.run()
+        except KeyboardInterrupt:
+            relay.stop()
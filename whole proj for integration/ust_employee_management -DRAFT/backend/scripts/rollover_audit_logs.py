@@ -0,0 +1,23 @@
+"""
+Move audit events older than N days out of MongoDB into daily gzip NDJSON
+segment files (settings.AUDIT_ARCHIVE_DIR), each with a sidecar index.
+
+Meant to run daily from cron. Safe to re-run: a day that was only partially
+moved is merged with its existing segment.
+
+Run from the backend folder:
+  python -m scripts.rollover_audit_logs [--older-than-days 30]
+"""
+import argparse
+
+from app.core.config import settings
+from app.services.audit_archive import rollover
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--older-than-days", type=int, default=settings.AUDIT_HOT_DAYS)
+    args = parser.parse_args()
+
+    moved = rollover(args.older_than_days)
+    print(f"✅ Audit rollover complete ({sum(moved.values())} events, {len(moved)} days)")
@@ -8,7 +8,7 @@ def seed_remarks():
         {
             "task_id": 1,
             "comment": "Initial task analysis completed",
-            "user_e_id": 4,
+            "e_id": 4,
             "file_id": None,
             "file_name": None,
             "created_at": datetime.utcnow()
@@ -16,7 +16,7 @@ def seed_remarks():
         {
             "task_id": 1,
             "comment": "Waiting for manager review",
-            "user_e_id": 2,
+            "e_id": 2,
             "file_id": None,
             "file_name": None,
             "created_at": datetime.utcnow()
@@ -24,7 +24,7 @@ def seed_remarks():
         {
             "task_id": 2,
             "comment": "API implementation done",
-            "user_e_id": 5,
+            "e_id": 5,
             "file_id": None,
             "file_name": None,
             "created_at": datetime.utcnow()
@@ -32,7 +32,7 @@ def seed_remarks():
         {
             "task_id": 3,
             "comment": "Bug found in validation logic",
-            "user_e_id": 6,
+            "e_id": 6,
             "file_id": None,
             "file_name": None,
             "created_at": datetime.utcnow()
@@ -40,7 +40,7 @@ def seed_remarks():
         {
             "task_id": 3,
             "comment": "Bug fixed and pushed",
-            "user_e_id": 6,
+            "e_id": 6,
             "file_id": None,
             "file_name": None,
             "created_at": datetime.utcnow()
@@ -48,7 +48,7 @@ def seed_remarks():
         {
             "task_id": 4,
             "comment": "Needs optimization",
-            "user_e_id": 3,
+            "e_id": 3,
             "file_id": None,
             "file_name": None,
             "created_at": datetime.utcnow()
@@ -56,7 +56,7 @@ def seed_remarks():
         {
             "task_id": 5,
             "comment": "Reviewed and approved",
-            "user_e_id": 1,
+            "e_id": 1,
             "file_id": None,
             "file_name": None,
             "created_at": datetime.utcnow()
@@ -64,7 +64,7 @@ def seed_remarks():
         {
             "task_id": 6,
             "comment": "UI integration pending",
-            "user_e_id": 7,
+            "e_id": 7,
             "file_id": None,
             "file_name": None,
             "created_at": datetime.utcnow()
@@ -72,7 +72,7 @@ def seed_remarks():
         {
             "task_id": 7,
             "comment": "Unit tests added",
-            "user_e_id": 8,
+            "e_id": 8,
             "file_id": None,
             "file_name": None,
             "created_at": datetime.utcnow()
@@ -80,7 +80,7 @@ def seed_remarks():
         {
             "task_id": 8,
             "comment": "Ready for deployment",
-            "user_e_id": 2,
+            "e_id": 2,
             "file_id": None,
             "file_name": None,
             "created_at": datetime.utcnow()
@@ -0,0 +1,45 @@
+"""
+Find and delete data whose owner is gone: remarks of deleted tasks, avatars of
+deleted employees, GridFS files nothing refers to and catalog entries without
+a file (see app/services/orphan_gc.py).
+
+Runs as a dry run by default and prints what it would delete; pass --apply to
+delete. Remarks whose task_id is not a task id (a string, or the placeholder
+0 written by init_mongo) are only reported; add --delete-invalid-task-ids to
+delete those too. Meant to run periodically from cron, e.g. nightly.
+
+Run from the backend folder:
+  python -m scripts.sweep_orphans [--apply] [--batch-size 500] [--max-deletes-per-second 200]
+"""
+import argparse
+import json
+
+from app.core.config import settings
+from app.services.orphan_gc import OrphanSweeper
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apply", action="store_true", help="delete the orphans instead of only reporting them")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--max-deletes-per-second", type=float, default=200, help="0 = unthrottled")
+    parser.add_argument("--grace-hours", type=int, default=settings.ORPHAN_GRACE_HOURS)
+    parser.add_argument("--delete-invalid-task-ids", action="store_true",
+                        help="also delete remarks whose task_id is not a positive integer")
+    args = parser.parse_args()
+
+    sweeper = OrphanSweeper(
+        dry_run=not args.apply,
+        batch_size=args.batch_size,
+        max_deletes_per_second=args.max_deletes_per_second,
+        grace_hours=args.grace_hours,
+        delete_invalid_task_ids=args.delete_invalid_task_ids
+    )
+    report = sweeper.run()
+    print(json.dumps(report, indent=2))
+
+    total = sum(entry["count"] for category, entry in report.items() if category not in sweeper.report_only)
+    if args.apply:
+        print(f"✅ Orphan sweep complete ({total} items deleted)")
+    else:
+        print(f"✅ Dry run complete ({total} items would be deleted; re-run with --apply)")